@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the MCP server using stubbed and in-process backends
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+
+import main
+from dispatch import MemoryDispatcher
+from embeddings import BatchingEmbedder, CachingEmbedder, EmbeddingCache
+from fakes import (FakeEmbedder, FakeGraph, FakeLLM, InMemoryVectorStore, SlowEmbedder, SlowVectorStore, StubMemory,
+                   build_fake_async_memory, build_fake_memory)
+from pagination import iter_memories
+from formatting import format_response, memory_lines
+from local_store import LocalVectorStore
+from pooling import ConnectionPools, PoolSettings
+from metrics import instrument_tool, timed_stage
+from dedup import DedupIndex
+from chunking import ChunkSettings
+from entity_index import EntityIndex
+from stages import StageTimeouts
+from lexical import LexicalIndex, install_lexical_index
+from rerank import OverlapScorer, Reranker
+
+async def run_concurrent_searches(pool_size: int, requests: int, latency: float) -> dict:
+    """Fire requests concurrent searches through a dispatcher with the given pool size"""
+    memory = StubMemory(search_latency=latency)
+    memory.add("Seed memory for the search benchmark", user_id="bench")
+    dispatcher = MemoryDispatcher(pool_size, {"search": pool_size})
+
+    async def one_search(i):
+        started = time.perf_counter()
+        await dispatcher.run("search", memory.search, f"query {i}", user_id="bench", limit=3)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(one_search(i) for i in range(requests))))
+    elapsed = time.perf_counter() - started
+    snapshot = dispatcher.snapshot()
+    dispatcher.shutdown()
+
+    return {
+        "pool_size": pool_size,
+        "throughput": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_waiting": snapshot["operations"]["search"]["max_waiting"],
+    }
+
+async def benchmark_dispatch(requests: int = 200, latency: float = 0.02):
+    """Show concurrent search throughput scaling with the worker pool size"""
+    print(f"⏱️  Concurrent search throughput ({requests} requests, {latency * 1000:.0f}ms simulated backend latency)\n")
+    print(f"   {'pool':>5} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'max waiting':>12}")
+    for pool_size in (1, 2, 4, 8, 16, 32):
+        result = await run_concurrent_searches(pool_size, requests, latency)
+        print(f"   {result['pool_size']:>5} {result['throughput']:>10.1f} {result['p50_ms']:>10.1f} "
+              f"{result['p95_ms']:>10.1f} {result['max_waiting']:>12}")
+
+async def benchmark_embedding_batching(requests: int = 200, pool_size: int = 32, latency: float = 0.02):
+    """Compare provider round trips for concurrent embeds with and without micro-batching"""
+    print(f"\n⏱️  Concurrent embeddings ({requests} requests, {pool_size} workers, {latency * 1000:.0f}ms per provider call)\n")
+    print(f"   {'mode':>10} {'round trips':>12} {'req/s':>10}")
+    for mode in ("direct", "batched"):
+        embedder = SlowEmbedder(latency=latency)
+        wrapped = BatchingEmbedder(embedder, window=0.002, max_batch=64) if mode == "batched" else embedder
+        dispatcher = MemoryDispatcher(pool_size, {"embed": pool_size})
+        started = time.perf_counter()
+        await asyncio.gather(*(dispatcher.run("embed", wrapped.embed, f"query {i}", "search") for i in range(requests)))
+        elapsed = time.perf_counter() - started
+        dispatcher.shutdown()
+        print(f"   {mode:>10} {embedder.round_trips:>12} {requests / elapsed:>10.1f}")
+
+def make_batch_context(latency: float):
+    """Tool context around a fake Memory whose embedder and vector store each cost `latency` per round trip"""
+    embedder = SlowEmbedder(latency=latency)
+    cache = EmbeddingCache(":memory:", max_entries=10000, model="fake-embedder", dims=embedder.dims)
+    vector_store = SlowVectorStore(latency=latency)
+    memory = build_fake_memory(embedder=CachingEmbedder(BatchingEmbedder(embedder, 0.002, 64), cache),
+                               vector_store=vector_store)
+    lifespan_context = main.Mem0Context(mem0_client=memory, dispatcher=MemoryDispatcher(16))
+    return SimpleNamespace(request_context=SimpleNamespace(lifespan_context=lifespan_context)), embedder, vector_store
+
+async def benchmark_batch_tools(items: int = 50, latency: float = 0.005):
+    """Compare N single tool calls, issued one after another like an agent would, with one batch tool call"""
+    print(f"\n⏱️  Batch tools vs {items} single calls ({latency * 1000:.0f}ms per embedder or vector store round trip)\n")
+    print(f"   {'operation':>10} {'mode':>7} {'ms':>9} {'embed trips':>12} {'store trips':>12}")
+    texts = [f"Fact {i} about project {i % 7}." for i in range(items)]
+    queries = [f"What about project {i}" for i in range(items)]
+
+    for mode in ("single", "batch"):
+        ctx, embedder, vector_store = make_batch_context(latency)
+
+        async def measure(operation, single_tool, batch_tool, items):
+            started, embeds, trips = time.perf_counter(), embedder.round_trips, vector_store.round_trips
+            if mode == "single":
+                for item in items:
+                    await single_tool(ctx, item)
+            else:
+                await batch_tool(ctx, items)
+            print(f"   {operation:>10} {mode:>7} {(time.perf_counter() - started) * 1000:>9.1f} "
+                  f"{embedder.round_trips - embeds:>12} {vector_store.round_trips - trips:>12}")
+
+        await measure("save", main.save_memory, main.save_memories, texts)
+        await measure("search", main.search_memories, main.search_memories_batch, queries)
+        await measure("delete", main.delete_memory, main.delete_memories, list(vector_store.records))
+        ctx.request_context.lifespan_context.dispatcher.shutdown()
+
+async def peak_memory_kib(coroutine_fn) -> float:
+    """Peak Python heap allocated while the coroutine runs, in KiB"""
+    tracemalloc.start()
+    await coroutine_fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+async def benchmark_get_all_memory(sizes=(1000, 10000, 50000), page_size: int = 100):
+    """Compare peak memory of loading every memory at once with streaming them page by page"""
+    print(f"\n⏱️  Reading every memory: one get_all call vs pages of {page_size} (peak traced heap)\n")
+    print(f"   {'memories':>9} {'get_all KiB':>12} {'paged KiB':>10}")
+    for size in sizes:
+        vector_store = InMemoryVectorStore()
+        vector_store.insert(
+            vectors=[[0.0]] * size,
+            ids=[f"memory-{i}" for i in range(size)],
+            payloads=[{"data": f"Fact number {i} about something worth remembering", "user_id": "bench",
+                       "hash": "0" * 32, "created_at": "2025-01-01T00:00:00-08:00"} for i in range(size)],
+        )
+        memory = build_fake_memory(vector_store=vector_store)
+        dispatcher = MemoryDispatcher(4)
+
+        async def load_everything():
+            memories = await dispatcher.run("get_all", memory.get_all, user_id="bench", limit=size)
+            json.dumps(memories["results"], indent=2)
+
+        async def stream_pages():
+            async for item in iter_memories(memory, dispatcher, {"user_id": "bench"}, page_size):
+                json.dumps(item)
+
+        everything = await peak_memory_kib(load_everything)
+        paged = await peak_memory_kib(stream_pages)
+        dispatcher.shutdown()
+        print(f"   {size:>9} {everything:>12.0f} {paged:>10.0f}")
+
+async def benchmark_tenants(tenants: int = 1000):
+    """Load test: many tenants saving, searching and listing at once through one server process"""
+    print(f"\n⏱️  {tenants} tenants in one process (save, search and list per tenant, all concurrent, heap traced)\n")
+    app = main.Mem0Context(mem0_client=build_fake_async_memory(), dispatcher=MemoryDispatcher(16))
+    contexts = [
+        SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": f"tenant-{i}"}), session=None
+        ))
+        for i in range(tenants)
+    ]
+    latencies, leaks = [], 0
+
+    async def one_tenant(i, ctx):
+        nonlocal leaks
+        for call in (lambda: main.save_memory(ctx, f"Tenant {i} prefers color number {i}"),
+                     lambda: main.search_memories(ctx, "preferred color", limit=5),
+                     lambda: main.get_all_memories(ctx)):
+            started = time.perf_counter()
+            output = await call()
+            latencies.append(time.perf_counter() - started)
+        # Every memory a tenant can read must be its own
+        leaks += sum(memory["memory"] != f"Tenant {i} prefers color number {i}"
+                     for memory in json.loads(output)["memories"])
+
+    async def run_all():
+        await asyncio.gather(*(one_tenant(i, ctx) for i, ctx in enumerate(contexts)))
+
+    started = time.perf_counter()
+    peak = await peak_memory_kib(run_all)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    app.dispatcher.shutdown()
+    print(f"   calls: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f}/s)")
+    print(f"   latency p50 {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+    print(f"   peak traced heap {peak / 1024:.1f} MiB ({peak / tenants:.1f} KiB per tenant), "
+          f"cross-tenant reads: {leaks}, per-tenant slots left: {app.tenants.snapshot()['tenants_active']}")
+
+def benchmark_response_formats(results: int = 100, repeats: int = 2000):
+    """Compare encode time and response size of the previous indent=2 output with each response format"""
+    print(f"\n⏱️  Encoding a {results}-result search response ({repeats} times)\n")
+    print(f"   {'format':>14} {'bytes':>8} {'µs/response':>12}")
+    memories = [f"Fact number {i}: the user prefers dark mode in every editor they use" for i in range(results)]
+    encoders = {
+        "json indent=2": lambda: json.dumps(memories, indent=2),
+        "compact": lambda: format_response(memories, lines=memory_lines),
+        "pretty": lambda: format_response(memories, lines=memory_lines),
+        "lines": lambda: format_response(memories, lines=memory_lines),
+    }
+    previous = os.environ.get("MEM0_RESPONSE_FORMAT")
+    for name, encode in encoders.items():
+        os.environ["MEM0_RESPONSE_FORMAT"] = name
+        started = time.perf_counter()
+        for _ in range(repeats):
+            output = encode()
+        elapsed = time.perf_counter() - started
+        print(f"   {name:>14} {len(output.encode()):>8} {elapsed / repeats * 1e6:>12.1f}")
+    if previous is None:
+        os.environ.pop("MEM0_RESPONSE_FORMAT")
+    else:
+        os.environ["MEM0_RESPONSE_FORMAT"] = previous
+
+def benchmark_local_store(sizes=(10000, 50000), dims: int = 384, queries: int = 200):
+    """Search latency and recall of the local vector store with an exact scan and with the IVF index"""
+    print(f"\n⏱️  Local vector store search ({dims} dims, {queries} queries, top 10)\n")
+    print(f"   {'memories':>9} {'index':>6} {'ms/search':>10} {'recall@10':>10}")
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        # Real embeddings cluster by topic, so the synthetic corpus is drawn around topic centers
+        topics = rng.normal(size=(size // 100, dims)).astype(np.float32)
+        vectors = topics[rng.integers(0, len(topics), size)] + rng.normal(scale=0.6, size=(size, dims)).astype(np.float32)
+        probes = vectors[:queries] + rng.normal(scale=0.3, size=(queries, dims)).astype(np.float32)
+        exact = None
+        for index in ("flat", "ivf"):
+            store = LocalVectorStore(tempfile.mkdtemp(), "bench", dims, index=index)
+            for start in range(0, size, 10000):
+                store.insert(vectors[start:start + 10000], [{"user_id": "bench"}] * len(vectors[start:start + 10000]),
+                             [str(i) for i in range(start, min(start + 10000, size))])
+            store.wait_for_index()
+            started = time.perf_counter()
+            results = [[hit.id for hit in store.search("q", probe, 10, {"user_id": "bench"})] for probe in probes]
+            elapsed = time.perf_counter() - started
+            exact = exact or results
+            recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(results, exact)])
+            print(f"   {size:>9} {index:>6} {elapsed / queries * 1000:>10.2f} {recall:>10.3f}")
+
+def benchmark_quantization(size: int = 50000, dims: int = 768, queries: int = 200):
+    """Recall against in-RAM index size for each quantization mode of the local vector store"""
+    print(f"\n⏱️  Local store quantization ({size} memories, {dims} dims, {queries} queries, top 10, re-rank x10)\n")
+    print(f"   {'mode':>7} {'bytes/memory':>13} {'smaller':>8} {'ms/search':>10} {'recall@10':>10}")
+    rng = np.random.default_rng(0)
+    topics = rng.normal(size=(size // 100, dims)).astype(np.float32)
+    vectors = topics[rng.integers(0, len(topics), size)] + rng.normal(scale=0.6, size=(size, dims)).astype(np.float32)
+    probes = vectors[:queries] + rng.normal(scale=0.3, size=(queries, dims)).astype(np.float32)
+    exact = None
+    for mode in ("none", "int8", "binary", "pq"):
+        store = LocalVectorStore(tempfile.mkdtemp(), "bench", dims, index="flat", quantization=mode)
+        store.insert(vectors, [{"user_id": "bench"}] * size, [str(i) for i in range(size)])
+        store.wait_for_index()
+        started = time.perf_counter()
+        results = [[hit.id for hit in store.search("q", probe, 10, {"user_id": "bench"})] for probe in probes]
+        elapsed = time.perf_counter() - started
+        exact = exact or results
+        recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(results, exact)])
+        # Only the codes are scanned; the full vectors stay on disk and are read for the re-ranked shortlist
+        index_bytes = store._quantized.shape[1] * store._quantized.itemsize if mode != "none" else dims * 4
+        print(f"   {mode:>7} {index_bytes:>13} {dims * 4 / index_bytes:>7.0f}x "
+              f"{elapsed / queries * 1000:>10.2f} {recall:>10.3f}")
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Answers every request with a small JSON body on a keep-alive HTTP/1.1 connection"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"result": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def benchmark_connection_pooling(requests: int = 2000, workers: int = 8):
+    """Connections opened and latency with keep-alive off (qdrant-client's localhost default) and pooled"""
+    print(f"\n⏱️  Backend HTTP calls ({requests} requests from {workers} worker threads, local server)\n")
+    print(f"   {'pool':>10} {'connections':>12} {'new/request':>12} {'ms/request':>11}")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/collections/bench/points/search"
+    for name, settings in (("no reuse", PoolSettings(max_keepalive=0)), ("pooled", PoolSettings())):
+        pools = ConnectionPools(settings)
+        client = pools.http_client("qdrant")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(lambda _: client.post(url, json={"vector": [0.0] * 8, "limit": 10}), range(requests)))
+        elapsed = time.perf_counter() - started
+        stats = pools.snapshot()["backends"]["qdrant"]
+        print(f"   {name:>10} {stats['connections_opened']:>12} {stats['new_connection_rate']:>12.3f} "
+              f"{elapsed / requests * 1000:>11.3f}")
+        pools.close()
+    server.shutdown()
+
+async def benchmark_metrics_overhead(calls: int = 100000):
+    """Added latency of the tool and stage instrumentation around calls that do no work"""
+    print(f"\n⏱️  Metrics overhead ({calls} calls)\n")
+    print(f"   {'call':>12} {'µs plain':>9} {'µs timed':>9} {'added':>7}")
+
+    async def noop_tool():
+        return "ok"
+
+    def noop_stage():
+        return None
+
+    timed_tool = instrument_tool(noop_tool)
+    timed_call = timed_stage("bench", "noop")(noop_stage)
+    for name, plain, timed, is_async in (("tool", noop_tool, timed_tool, True), ("stage", noop_stage, timed_call, False)):
+        elapsed = []
+        for fn in (plain, timed):
+            started = time.perf_counter()
+            for _ in range(calls):
+                if is_async:
+                    await fn()
+                else:
+                    fn()
+            elapsed.append((time.perf_counter() - started) / calls * 1e6)
+        print(f"   {name:>12} {elapsed[0]:>9.2f} {elapsed[1]:>9.2f} {elapsed[1] - elapsed[0]:>7.2f}")
+
+async def benchmark_raw_saves(saves: int = 64, llm_latency: float = 0.5, concurrency: int = 16):
+    """save_memory with mem0's LLM fact extraction against infer=false, which stores the text as is"""
+    print(f"\n⏱️  save_memory with and without LLM extraction ({saves} saves, {concurrency} at a time, "
+          f"{llm_latency * 1000:.0f}ms per LLM call)\n")
+    print(f"   {'mode':>6} {'saves/s':>9} {'ms/save':>9} {'LLM calls':>10} {'relations':>10}")
+    texts = [f"Person{i} works at Org{i % 5}." for i in range(saves)]
+    for infer in (True, False):
+        llm, graph = FakeLLM(latency=llm_latency), FakeGraph()
+        app = main.Mem0Context(mem0_client=build_fake_memory(llm=llm, graph=graph), dispatcher=MemoryDispatcher(32))
+        ctx = SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "bench"}), session=None))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def save(text):
+            async with semaphore:
+                return await main.save_memory(ctx, text, "bench", infer=infer)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(save(text) for text in texts))
+        elapsed = time.perf_counter() - started
+        relations = len(graph.get_all({"user_id": "bench"}, limit=saves * 2))
+        print(f"   {'infer' if infer else 'raw':>6} {saves / elapsed:>9.1f} {elapsed / saves * 1000:>9.2f} "
+              f"{llm.calls:>10} {relations:>10}")
+        app.dispatcher.shutdown()
+
+def benchmark_dedup_index(entries: int = 10000, lookups: int = 2000):
+    """Cost of checking a save against a tenant's duplicate index, next to the save it can skip"""
+    print(f"\n⏱️  Duplicate index lookups ({entries} texts indexed, {lookups} lookups)\n")
+    print(f"   {'lookup':>10} {'µs/check':>9} {'caught':>7}")
+    index = DedupIndex(max_entries=entries)
+    texts = [f"user: I met Person{i} from Org{i % 50} today. assistant: What did you talk about? "
+             f"user: Project {i}, which ships next month, and the review with Person{(i * 7) % 500} on Friday."
+             for i in range(entries)]
+    for text in texts:
+        index.claim("bench", "bench", text)
+    # Duplicates of the most recent texts, which are still indexed after the new ones are added
+    recent = texts[-lookups:]
+    cases = {
+        "new": [f"user: Newcomer{i} joined the team {i} days ago. assistant: Noted, they work on search." for i in range(lookups)],
+        "exact": [text.upper() for text in recent],
+        "near": [text + " assistant: Got it." for text in recent],
+    }
+    for name, batch in cases.items():
+        started = time.perf_counter()
+        caught = sum(index.claim("bench", "bench", text) is not None for text in batch)
+        print(f"   {name:>10} {(time.perf_counter() - started) / lookups * 1e6:>9.1f} {caught:>7}")
+
+def benchmark_entity_index(entities: int = 20000, lookups: int = 2000):
+    """Resolving an entity name against a tenant's entity index, next to scanning its relations for the name"""
+    print(f"\n⏱️  Entity name lookups ({entities} entities, {lookups} lookups)\n")
+    print(f"   {'lookup':>10} {'µs/lookup':>10} {'resolved':>9}")
+    names = [f"person{i}_lastname{i % 997}" for i in range(entities)]
+    relations = [(name, "works_at", f"org{i % 500}") for i, name in enumerate(names)]
+    index = EntityIndex()
+    index.observe({"user_id": "bench"}, names)
+    people = [names[i * (entities // lookups)] for i in range(lookups)]
+    cases = {
+        "exact": people,
+        "word": [name.split("_")[1] for name in people],
+        "prefix": [name.split("_")[0][:-1] for name in people],
+        "typo": [name.replace("person", "persn", 1) for name in people],
+    }
+    for case, batch in cases.items():
+        started = time.perf_counter()
+        resolved = sum(bool(index.lookup({"user_id": "bench"}, text)) for text in batch)
+        print(f"   {case:>10} {(time.perf_counter() - started) / lookups * 1e6:>10.1f} {resolved:>9}")
+    # What find_relationships did before: a substring check against every relation
+    started = time.perf_counter()
+    resolved = sum(bool([relation for relation in relations if text in relation[0] or text in relation[2]])
+                   for text in people[:100])
+    print(f"   {'scan':>10} {(time.perf_counter() - started) / 100 * 1e6:>10.1f} {resolved:>9}")
+
+async def benchmark_graph_timeouts(searches: int = 20, graph_latency: float = 0.5, timeout: float = 0.1):
+    """Searches against a slow graph store, waiting on it and with a graph stage timeout"""
+    print(f"\n⏱️  Searches with a {graph_latency * 1000:.0f}ms graph store ({searches} searches)\n")
+    print(f"   {'graph timeout':>14} {'p50 ms':>8} {'partial':>8}")
+    for stages in (StageTimeouts(), StageTimeouts(graph=timeout)):
+        app = main.Mem0Context(mem0_client=build_fake_memory(graph=FakeGraph(latency=graph_latency)),
+                               dispatcher=MemoryDispatcher(32), stages=stages)
+        tenant = main.Tenant(user_id="bench")
+        latencies, partial = [], 0
+        for i in range(searches):
+            started = time.perf_counter()
+            result = await main.search_memory(app, f"Who works at Org{i}?", tenant, 3)
+            latencies.append(time.perf_counter() - started)
+            partial += bool(result.get("partial"))
+        label = f"{stages.graph * 1000:.0f}ms" if stages.graph else "none"
+        print(f"   {label:>14} {np.percentile(latencies, 50) * 1000:>8.1f} {partial:>8}")
+        app.dispatcher.shutdown()
+
+async def benchmark_hybrid_search(memories: int = 2000, queries: int = 200, limit: int = 3):
+    """Finding memories by ticket number with vector, lexical and hybrid search"""
+    print(f"\n⏱️  Identifier lookups ({memories} memories, {queries} ticket-number queries, top {limit})\n")
+    print(f"   {'mode':>8} {'recall':>7} {'ms/search':>10} {'embeds':>7}")
+    embedder = FakeEmbedder()
+    memory = build_fake_memory(embedder=embedder)
+    with tempfile.TemporaryDirectory() as directory:
+        app = main.Mem0Context(mem0_client=memory, dispatcher=MemoryDispatcher(8),
+                               lexical=LexicalIndex(os.path.join(directory, "lexical.db")))
+        install_lexical_index(memory, app.lexical)
+        tenant = main.Tenant(user_id="bench")
+        texts = [f"Ticket OPS-{i} is about the {('login', 'billing', 'search', 'export')[i % 4]} service" for i in range(memories)]
+        for start in range(0, memories, 100):
+            await main.add_many(memory, app.dispatcher, texts[start:start + 100], tenant.scope(), infer=False)
+        targets = list(range(0, memories, memories // queries))[:queries]
+        for mode in ("vector", "lexical", "hybrid"):
+            embedder.calls, found = 0, 0
+            started = time.perf_counter()
+            for i in targets:
+                result = await main.search_in_mode(app, f"OPS-{i}", tenant, limit, mode)
+                found += texts[i] in [item["memory"] for item in result["results"]]
+            elapsed = (time.perf_counter() - started) / len(targets)
+            print(f"   {mode:>8} {found / len(targets):>7.0%} {elapsed * 1000:>10.2f} {embedder.calls:>7}")
+        app.lexical.close()
+        app.dispatcher.shutdown()
+
+async def benchmark_rerank(people: int = 500, queries: int = 200, limit: int = 3, candidates: int = 20):
+    """Whether the answer to a question is in the top results, with and without reranking"""
+    print(f"\n⏱️  Question answering recall ({people * 2} memories, {queries} concurrent questions, top {limit})\n")
+    print(f"   {'rerank':>8} {'recall':>7} {'ms/search':>10} {'batches':>8}")
+    memory = build_fake_memory()
+    app = main.Mem0Context(mem0_client=memory, dispatcher=MemoryDispatcher(16), search_mode="vector")
+    tenant = main.Tenant(user_id="bench")
+    texts = []
+    for i in range(people):
+        texts.append(f"Person{i} works at Org{i % 40} as an engineer")
+        texts.append(f"Person{i} lives in City{i % 30} near the river")
+    for start in range(0, len(texts), 100):
+        await main.add_many(memory, app.dispatcher, texts[start:start + 100], tenant.scope(), infer=False)
+    targets = list(range(0, people, people // queries))[:queries]
+    # The middle row is the ceiling: how often the answer is among the candidates the reranker sees at all
+    for label, reranker, top in (("none", None, limit), (f"none@{candidates}", None, candidates),
+                                 ("overlap", Reranker(OverlapScorer(), app.dispatcher, candidates=candidates), limit)):
+        app.reranker = reranker
+
+        async def ask(i):
+            result = await main.search_and_rerank(app, f"Where does Person{i} work?", tenant, top)
+            return f"Person{i} works at Org{i % 40} as an engineer" in [item["memory"] for item in result["results"]]
+
+        started = time.perf_counter()
+        found = sum(await asyncio.gather(*(ask(i) for i in targets)))
+        elapsed = (time.perf_counter() - started) / len(targets)
+        batches = reranker.stats()["batches"] if reranker else 0
+        print(f"   {label:>8} {found / len(targets):>7.0%} {elapsed * 1000:>10.2f} {batches:>8}")
+    app.dispatcher.shutdown()
+
+async def benchmark_long_conversation(turns: int = 100, llm_latency: float = 0.2, latency_per_kchar: float = 0.5):
+    """save_conversation of a long transcript in one extraction against parallel chunks
+
+    The simulated model takes longer the more it writes, as real ones do. Unlike a real one
+    it has no output limit, so the single extraction still returns every fact.
+    """
+    lines = []
+    for i in range(turns):
+        lines.append(f"user: My colleague Person{i} moved to City{i % 40} and now works at Org{i % 25}.")
+        lines.append(f"assistant: Noted, Person{i} lives in City{i % 40} and works at Org{i % 25}.")
+    conversation = "\n".join(lines)
+    print(f"\n⏱️  save_conversation of {turns * 2} turns ({len(conversation)} chars, LLM {llm_latency * 1000:.0f}ms "
+          f"+ {latency_per_kchar * 1000:.0f}ms per 1000 chars written)\n")
+    print(f"   {'mode':>8} {'chunks':>7} {'writes':>7} {'seconds':>8} {'LLM calls':>10} {'facts':>6}")
+    for chunking in (None, ChunkSettings(max_chars=2000, concurrency=8),
+                     ChunkSettings(max_chars=2000, concurrency=8, facts_per_write=100)):
+        llm = FakeLLM(latency=llm_latency, latency_per_kchar=latency_per_kchar)
+        app = main.Mem0Context(mem0_client=build_fake_memory(llm=llm), dispatcher=MemoryDispatcher(32), chunking=chunking)
+        ctx = SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "bench"}), session=None))
+        started = time.perf_counter()
+        response = json.loads(await main.save_conversation(ctx, conversation, "bench"))
+        elapsed = time.perf_counter() - started
+        # Every write is one mem0 update call over a group of the merged facts
+        print(f"   {'chunked' if chunking else 'single':>8} {response.get('chunks', 1):>7} "
+              f"{response.get('writes', 1):>7} {elapsed:>8.2f} "
+              f"{llm.calls:>10} {response['facts_extracted']:>6}")
+        app.dispatcher.shutdown()
+
+if __name__ == "__main__":
+    print("📋 MCP-Mem0 Benchmarks")
+    print("=" * 40)
+    asyncio.run(benchmark_dispatch())
+    asyncio.run(benchmark_embedding_batching())
+    asyncio.run(benchmark_batch_tools())
+    asyncio.run(benchmark_get_all_memory())
+    asyncio.run(benchmark_tenants())
+    benchmark_response_formats()
+    benchmark_local_store()
+    benchmark_quantization()
+    benchmark_connection_pooling()
+    asyncio.run(benchmark_metrics_overhead())
+    asyncio.run(benchmark_raw_saves())
+    benchmark_dedup_index()
+    asyncio.run(benchmark_long_conversation())
+    benchmark_entity_index()
+    asyncio.run(benchmark_graph_timeouts())
+    asyncio.run(benchmark_hybrid_search())
+    asyncio.run(benchmark_rerank())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Reproducible latency and throughput benchmark of the MCP tools
+
+Drives the tools in main.py in-process against deterministic stand-ins for the LLM and
+embedder (fakes.py), the local vector store and an in-memory graph, for each corpus size
+and concurrency level. Results are printed as a table and can be written as JSON, saved
+as a baseline and compared against one to catch regressions:
+
+    python benchmark_tools.py --save-baseline baseline.json
+    python benchmark_tools.py --baseline baseline.json   # exits 1 on a regression
+
+Use --repeat 3 or more when comparing, so a single slow run does not count as a regression.
+"""
+import argparse
+import asyncio
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import FakeEmbedder, FakeGraph, build_fake_async_memory, build_fake_memory
+from local_store import LocalVectorStore
+from result_cache import SearchResultCache
+
+TOOLS = ("save_memory", "search_memories", "get_all_memories", "find_relationships", "update_memory", "delete_memory")
+USER_ID = "bench"
+DIMS = 64
+PEOPLE, ORGANIZATIONS, CITIES = 500, 50, 20
+
+def corpus_sentence(i: int) -> str:
+    """The i-th stored fact; the same index always gives the same text."""
+    person = f"Person{i % PEOPLE}"
+    kind = i % 3
+    if kind == 0:
+        return f"{person} works at Org{i % ORGANIZATIONS}"
+    if kind == 1:
+        return f"{person} lives in City{i % CITIES}"
+    return f"{person} knows Person{(i * 7 + 1) % PEOPLE} from project {i}"
+
+def build_client(mode: str, corpus: int, path: str):
+    """A Mem0 client on the stand-ins, seeded with `corpus` memories straight into the stores."""
+    embedder, graph = FakeEmbedder(DIMS), FakeGraph()
+    vector_store = LocalVectorStore(path, "bench", DIMS)
+    texts = [corpus_sentence(i) for i in range(corpus)]
+    ids = [f"{i:08d}-0000-4000-8000-000000000000" for i in range(corpus)]
+    created_at = datetime(2025, 1, 1).isoformat()
+    for start in range(0, corpus, 1000):
+        chunk = texts[start:start + 1000]
+        vector_store.insert(
+            [embedder.embed(text) for text in chunk],
+            [{"data": text, "hash": hashlib.md5(text.encode()).hexdigest(), "created_at": created_at,
+              "user_id": USER_ID} for text in chunk],
+            ids[start:start + 1000],
+        )
+    graph.add("\n".join(texts), {"user_id": USER_ID})
+    build = build_fake_async_memory if mode == "async" else build_fake_memory
+    return build(embedder=embedder, vector_store=vector_store, graph=graph), ids
+
+def make_operations(ids: list[str], seed: int) -> dict:
+    """One coroutine factory per tool, taking the request number."""
+    rng = random.Random(seed)
+    # Deletes take IDs from the end and updates from the start, so no request hits a deleted memory
+    delete_ids = list(reversed(ids))
+
+    def person() -> str:
+        return f"Person{rng.randrange(PEOPLE)}"
+
+    return {
+        "save_memory": lambda ctx, i: main.save_memory(ctx, f"Newcomer{i} works at Org{i % ORGANIZATIONS}.", USER_ID),
+        "search_memories": lambda ctx, i: main.search_memories(ctx, f"Where does {person()} work?", 5, USER_ID),
+        "get_all_memories": lambda ctx, i: main.get_all_memories(ctx, page_size=100, user_id=USER_ID),
+        "find_relationships": lambda ctx, i: main.find_relationships(ctx, person(), USER_ID),
+        "update_memory": lambda ctx, i: main.update_memory(ctx, ids[i % (len(ids) // 2)], f"{person()} works at Org{i}", USER_ID),
+        "delete_memory": lambda ctx, i: main.delete_memory(ctx, delete_ids[i], USER_ID),
+    }
+
+async def drive(ctx, operation, requests: int, concurrency: int, offset: int = 0) -> tuple[list[float], int, float]:
+    """Run `requests` calls of one tool from `concurrency` workers; returns latencies, errors and wall time."""
+    latencies, errors, counter = [], 0, iter(range(offset, offset + requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            result = await operation(ctx, i)
+            latencies.append(time.perf_counter() - started)
+            errors += isinstance(result, str) and result.startswith("Error")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+async def run_case(mode: str, corpus: int, concurrency: int, requests: int, warmup: int, search_cache: bool,
+                   seed: int) -> list[dict]:
+    with tempfile.TemporaryDirectory() as path:
+        mem0_client, ids = build_client(mode, corpus, path)
+        app = main.Mem0Context(
+            mem0_client=mem0_client,
+            dispatcher=MemoryDispatcher(32),
+            search_cache=SearchResultCache() if search_cache else None,
+        )
+        ctx = SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": USER_ID}), session=None
+        ))
+        operations = make_operations(ids, seed)
+        results = []
+        for tool in TOOLS:
+            # Warm-up calls use their own request numbers so they never touch the measured IDs
+            await drive(ctx, operations[tool], warmup, 1, offset=requests)
+            latencies, errors, elapsed = await drive(ctx, operations[tool], requests, concurrency)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+            results.append({
+                "client": mode, "tool": tool, "corpus": corpus, "concurrency": concurrency,
+                "requests": requests, "errors": errors,
+                "p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3), "p99_ms": round(float(p99), 3),
+                "throughput": round(requests / elapsed, 1),
+            })
+        app.dispatcher.shutdown()
+        return results
+
+def median_of(runs: list[list[dict]]) -> list[dict]:
+    """Combine repeated runs of the same cases, keeping the median of every statistic."""
+    combined = []
+    for cases in zip(*runs):
+        result = dict(cases[0])
+        for stat in ("p50_ms", "p95_ms", "p99_ms", "throughput"):
+            result[stat] = float(np.median([case[stat] for case in cases]))
+        result["errors"] = max(case["errors"] for case in cases)
+        combined.append(result)
+    return combined
+
+def compare(results: list[dict], baseline: dict, tolerance: float, min_delta_ms: float) -> list[str]:
+    """Describe every case that got slower or lost throughput beyond the tolerance."""
+    key = lambda r: (r["client"], r["tool"], r["corpus"], r["concurrency"])
+    previous = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        name = "{} {} corpus={} concurrency={}".format(*key(result))
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance) and result["p95_ms"] - before["p95_ms"] > min_delta_ms:
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+        if result["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['throughput']:.0f} -> {result['throughput']:.0f} calls/s")
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {result['errors']}")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--client", choices=("sync", "async", "both"), default="both", help="Mem0 client mode")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated corpus sizes")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Measured calls per tool and case")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured calls per tool before each case")
+    parser.add_argument("--search-cache", action="store_true", help="Enable the search result cache")
+    parser.add_argument("--repeat", type=int, default=1, help="Run every case this many times and keep the median")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results saved earlier with --save-baseline")
+    parser.add_argument("--save-baseline", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore p95 changes smaller than this")
+    return parser.parse_args(argv)
+
+def main_cli(argv=None) -> int:
+    args = parse_args(argv)
+    # mem0 logs every memory event at INFO, and its telemetry client warns once per fake client
+    logging.disable(logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    levels = [int(level) for level in args.concurrency.split(",")]
+    if args.requests > min(sizes) // 2:
+        sys.exit(f"--requests must be at most half the smallest corpus ({min(sizes) // 2})")
+    modes = ("sync", "async") if args.client == "both" else (args.client,)
+
+    print("📋 MCP-Mem0 Tool Benchmark")
+    print("=" * 40)
+    print(f"\n   {'client':>6} {'tool':>18} {'corpus':>7} {'conc':>5} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'calls/s':>8} {'errors':>6}")
+    results = []
+    for mode in modes:
+        for corpus in sizes:
+            for concurrency in levels:
+                runs = [asyncio.run(run_case(mode, corpus, concurrency, args.requests, args.warmup,
+                                             args.search_cache, args.seed)) for _ in range(args.repeat)]
+                for result in median_of(runs):
+                    results.append(result)
+                    print(f"   {mode:>6} {result['tool']:>18} {corpus:>7} {concurrency:>5} {result['p50_ms']:>8.2f} "
+                          f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['throughput']:>8.0f} "
+                          f"{result['errors']:>6}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(), "platform": platform.platform(), "requests": args.requests,
+            "warmup": args.warmup, "repeat": args.repeat, "search_cache": args.search_cache, "seed": args.seed,
+        },
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                json.dump(report, file, indent=2)
+            print(f"\n💾 Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+In-process stand-ins for the Mem0 client used by the benchmark and test scripts
+"""
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+import ast
+import hashlib
+import itertools
+import json
+import math
+import re
+import threading
+import time
+import uuid
+
+class StubMemory:
+    """Synchronous stand-in for mem0.Memory that simulates backend latency with time.sleep.
+
+    The sleeps release the GIL just like a real network call would, so it shows how the
+    server behaves when the LLM, embedder or vector store is slow.
+    """
+
+    def __init__(self, add_latency: float = 0.0, search_latency: float = 0.0):
+        self.add_latency = add_latency
+        self.search_latency = search_latency
+        self.memories = {}
+        self._lock = threading.Lock()
+
+    def add(self, messages, user_id=None, **kwargs):
+        time.sleep(self.add_latency)
+        text = messages if isinstance(messages, str) else "\n".join(m["content"] for m in messages)
+        memory_id = str(uuid.uuid4())
+        with self._lock:
+            self.memories[memory_id] = {"id": memory_id, "memory": text, "user_id": user_id}
+        return {"results": [{"id": memory_id, "memory": text, "event": "ADD"}], "relations": {"added_entities": []}}
+
+    def search(self, query, user_id=None, limit=100, **kwargs):
+        time.sleep(self.search_latency)
+        with self._lock:
+            matches = [m for m in self.memories.values() if m["user_id"] == user_id]
+        words = set(query.lower().split())
+        matches.sort(key=lambda m: -len(words & set(m["memory"].lower().split())))
+        return {"results": [{**m, "score": 1.0} for m in matches[:limit]], "relations": []}
+
+    def get_all(self, user_id=None, limit=100, **kwargs):
+        with self._lock:
+            matches = [m for m in self.memories.values() if m["user_id"] == user_id]
+        return {"results": matches[:limit]}
+
+    def update(self, memory_id, data, **kwargs):
+        with self._lock:
+            self.memories[memory_id]["memory"] = data
+        return {"message": "Memory updated successfully!"}
+
+    def delete(self, memory_id, **kwargs):
+        with self._lock:
+            self.memories.pop(memory_id, None)
+        return {"message": "Memory deleted successfully!"}
+
+class FakeEmbedder:
+    """Deterministic bag-of-words embedder: texts sharing words get similar vectors"""
+
+    def __init__(self, dims: int = 64):
+        self.dims = dims
+        self.calls = 0
+        # mem0 reads the model settings off the embedder when it reports telemetry
+        self.config = SimpleNamespace(model="fake-embedder", embedding_dims=dims)
+
+    def embed(self, text, memory_action=None):
+        self.calls += 1
+        vector = [0.0] * self.dims
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.md5(word.encode()).digest()
+            vector[digest[0] % self.dims] += 1.0 if digest[1] % 2 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+class SlowEmbedder(FakeEmbedder):
+    """FakeEmbedder with a simulated provider round trip on every call, single or batched"""
+
+    def __init__(self, dims: int = 64, latency: float = 0.02):
+        super().__init__(dims)
+        self.latency = latency
+        self.round_trips = 0
+
+    def embed(self, text, memory_action=None):
+        self.round_trips += 1
+        time.sleep(self.latency)
+        return super().embed(text, memory_action)
+
+    def embed_batch(self, texts):
+        self.round_trips += 1
+        time.sleep(self.latency)
+        return [super(SlowEmbedder, self).embed(text) for text in texts]
+
+class FakeLLM:
+    """Answers mem0's fact extraction and memory update prompts without a model.
+
+    Facts are the sentences of the input. The update step adds every fact that is not
+    already stored word for word and leaves the rest alone. `latency` simulates the model's
+    response time, plus `latency_per_kchar` for every 1000 characters it generates.
+    """
+
+    def __init__(self, latency: float = 0.0, latency_per_kchar: float = 0.0):
+        self.calls = 0
+        self.latency = latency
+        self.latency_per_kchar = latency_per_kchar
+
+    def generate_response(self, messages, response_format=None, tools=None, tool_choice="auto"):
+        self.calls += 1
+        response = self._respond(messages)
+        delay = self.latency + self.latency_per_kchar * len(response) / 1000
+        if delay:
+            time.sleep(delay)
+        return response
+
+    def _respond(self, messages):
+        if messages[0]["role"] == "system":
+            conversation = messages[-1]["content"].split("Input:\n", 1)[-1]
+            facts = []
+            for line in conversation.splitlines():
+                content = line.split(": ", 1)[-1]
+                facts.extend(s.strip() for s in re.split(r"[.!?]\s+", content) if s.strip())
+            return json.dumps({"facts": [f.rstrip(".") for f in facts]})
+
+        blocks = re.findall(r"```\s*(.*?)\s*```", messages[0]["content"], re.S)
+        old_memory = ast.literal_eval(blocks[-2])
+        new_facts = ast.literal_eval(blocks[-1])
+        existing = {m["text"] for m in old_memory}
+        actions = [{"id": str(len(old_memory) + i), "text": fact, "event": "ADD"}
+                   for i, fact in enumerate(new_facts) if fact not in existing]
+        return json.dumps({"memory": actions})
+
+@dataclass
+class VectorRecord:
+    id: str
+    payload: dict
+    score: float | None = None
+    vector: list = field(default=None, repr=False)
+
+class InMemoryVectorStore:
+    """Brute-force cosine vector store with the mem0 vector store interface"""
+
+    def __init__(self):
+        self.records = {}
+        self._lock = threading.Lock()
+
+    def insert(self, vectors, payloads=None, ids=None):
+        with self._lock:
+            for i, vector in enumerate(vectors):
+                record_id = ids[i] if ids else str(uuid.uuid4())
+                self.records[record_id] = VectorRecord(record_id, dict(payloads[i] if payloads else {}), vector=vector)
+
+    def _matches(self, record, filters):
+        return all(record.payload.get(key) == value for key, value in (filters or {}).items())
+
+    def search(self, query, vectors, limit=5, filters=None):
+        with self._lock:
+            candidates = [r for r in self.records.values() if self._matches(r, filters)]
+        scored = [VectorRecord(r.id, r.payload, sum(a * b for a, b in zip(vectors, r.vector))) for r in candidates]
+        scored.sort(key=lambda r: -r.score)
+        return scored[:limit]
+
+    def get(self, vector_id):
+        record = self.records.get(vector_id)
+        return VectorRecord(record.id, record.payload) if record else None
+
+    def get_many(self, vector_ids):
+        return [self.get(vector_id) for vector_id in vector_ids if vector_id in self.records]
+
+    def update(self, vector_id, vector=None, payload=None):
+        with self._lock:
+            record = self.records[vector_id]
+            if vector is not None:
+                record.vector = vector
+            if payload is not None:
+                record.payload = dict(payload)
+
+    def delete(self, vector_id):
+        with self._lock:
+            self.records.pop(vector_id, None)
+
+    def delete_many(self, vector_ids):
+        with self._lock:
+            for vector_id in vector_ids:
+                self.records.pop(vector_id, None)
+
+    def scroll(self, filters=None, limit=100, offset=None):
+        """Qdrant-style paging: returns (records, next_offset), the offset being a position"""
+        start = offset or 0
+        with self._lock:
+            matches = (r for r in self.records.values() if self._matches(r, filters))
+            page = [VectorRecord(r.id, r.payload) for r in itertools.islice(matches, start, start + limit + 1)]
+        return page[:limit], start + limit if len(page) > limit else None
+
+    def list(self, filters=None, limit=100):
+        with self._lock:
+            matches = [VectorRecord(r.id, r.payload) for r in self.records.values() if self._matches(r, filters)]
+        return [matches[:limit]]
+
+class SlowVectorStore(InMemoryVectorStore):
+    """InMemoryVectorStore with a simulated network round trip on every call, single or bulk"""
+
+    def __init__(self, latency: float = 0.005):
+        super().__init__()
+        self.latency = latency
+        self.round_trips = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+    def insert(self, vectors, payloads=None, ids=None):
+        self._round_trip()
+        return super().insert(vectors, payloads, ids)
+
+    def search(self, query, vectors, limit=5, filters=None):
+        self._round_trip()
+        return super().search(query, vectors, limit, filters)
+
+    def get(self, vector_id):
+        self._round_trip()
+        return super().get(vector_id)
+
+    def get_many(self, vector_ids):
+        self._round_trip()
+        return [InMemoryVectorStore.get(self, vector_id) for vector_id in vector_ids if vector_id in self.records]
+
+    def delete(self, vector_id):
+        self._round_trip()
+        return super().delete(vector_id)
+
+    def delete_many(self, vector_ids):
+        self._round_trip()
+        with self._lock:
+            for vector_id in vector_ids:
+                self.records.pop(vector_id, None)
+
+class FakeGraph:
+    """In-memory stand-in for mem0's Neo4j graph memory.
+
+    Relations are read off sentences of the form "<source> <relation> <target>" for a fixed
+    set of relations, so the same input always produces the same graph.
+    """
+
+    RELATIONS = ("works at", "works on", "lives in", "manages", "reports to", "knows", "uses", "enjoys")
+    PATTERN = re.compile(rf"^(.+?) ({'|'.join(RELATIONS)}) (.+?)\.?$", re.I)
+
+    def __init__(self, latency=0.0):
+        self.relations = {}
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _node(name):
+        return "_".join(name.lower().split())
+
+    def _extract(self, data):
+        triples = []
+        for sentence in re.split(r"[.!?\n]\s*", data):
+            match = self.PATTERN.match(sentence.split(": ", 1)[-1].strip())
+            if match:
+                source, relation, target = match.groups()
+                triples.append((self._node(source), self._node(relation), self._node(target)))
+        return triples
+
+    def add(self, data, filters):
+        time.sleep(self.latency)
+        to_be_added = [{"source": s, "relationship": r, "destination": t} for s, r, t in self._extract(data)]
+        return {"deleted_entities": [], "added_entities": self._add_entities(to_be_added, filters, {})}
+
+    def _add_entities(self, to_be_added, filters, entity_type_map):
+        added = []
+        with self._lock:
+            relations = self.relations.setdefault(filters["user_id"], set())
+            for item in to_be_added:
+                triple = (item["source"], item["relationship"], item["destination"])
+                if triple not in relations:
+                    relations.add(triple)
+                    added.append([{"source": triple[0], "relationship": triple[1], "target": triple[2]}])
+        return added
+
+    def search(self, query, filters, limit=100):
+        time.sleep(self.latency)
+        words = {self._node(word) for word in re.findall(r"\w+", query)}
+        with self._lock:
+            relations = list(self.relations.get(filters["user_id"], ()))
+        matches = [r for r in relations if words & (set(r[0].split("_")) | set(r[2].split("_")) | {r[0], r[2]})]
+        matches.sort()
+        return [{"source": s, "relationship": r, "destination": t} for s, r, t in matches[:limit]]
+
+    def get_all(self, filters, limit=100):
+        with self._lock:
+            relations = sorted(self.relations.get(filters["user_id"], ()))
+        return [{"source": s, "relationship": r, "target": t} for s, r, t in relations[:limit]]
+
+    def delete_all(self, filters):
+        with self._lock:
+            self.relations.pop(filters["user_id"], None)
+
+    def entity_names(self, filters):
+        with self._lock:
+            relations = list(self.relations.get(filters["user_id"], ()))
+        return sorted({relation[0] for relation in relations} | {relation[2] for relation in relations})
+
+    def traverse(self, name, filters, depth, limit, types):
+        """Relationships within `depth` hops of a node, like graph_query.relationship_query on Neo4j"""
+        with self._lock:
+            relations = [r for r in self.relations.get(filters["user_id"], ()) if not types or r[1] in types]
+        hops, frontier = {}, {name}
+        for hop in range(1, depth + 1):
+            reached = set()
+            for relation in relations:
+                if relation not in hops and (relation[0] in frontier or relation[2] in frontier):
+                    hops[relation] = hop
+                    reached |= {relation[0], relation[2]}
+            frontier = reached
+        rows = sorted((hop, s, r, t) for (s, r, t), hop in hops.items())
+        return [{"source": s, "relationship": r, "target": t, "hops": hop} for hop, s, r, t in rows[:limit]]
+
+class AsyncFake:
+    """Exposes every method of a sync fake as a coroutine, standing in for an async driver"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def __getattr__(self, name):
+        method = getattr(self.backend, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+def build_fake_memory(llm=None, embedder=None, vector_store=None, graph=None):
+    """A real mem0.Memory wired to the in-process fakes instead of network backends"""
+    from mem0 import Memory
+    from mem0.configs.base import MemoryConfig
+    from mem0.memory.storage import SQLiteManager
+
+    memory = Memory.__new__(Memory)
+    memory.config = MemoryConfig()
+    memory.custom_fact_extraction_prompt = None
+    memory.custom_update_memory_prompt = None
+    memory.llm = llm or FakeLLM()
+    memory.embedding_model = embedder or FakeEmbedder()
+    memory.vector_store = vector_store or InMemoryVectorStore()
+    memory.db = SQLiteManager(":memory:")
+    memory.collection_name = "fake"
+    memory.api_version = memory.config.version
+    memory.enable_graph = graph is not None
+    memory.graph = graph
+    return memory
+
+def build_fake_async_memory(llm=None, embedder=None, vector_store=None, graph=None):
+    """The async-native client wired to async wrappers around the same fakes"""
+    from async_backend import NativeAsyncMemory
+    from mem0.memory.storage import SQLiteManager
+
+    return NativeAsyncMemory(
+        llm=AsyncFake(llm or FakeLLM()),
+        embedding_model=AsyncFake(embedder or FakeEmbedder()),
+        vector_store=AsyncFake(vector_store or InMemoryVectorStore()),
+        db=SQLiteManager(":memory:"),
+        graph=AsyncFake(graph) if graph is not None else None,
+    )
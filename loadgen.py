@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Load generator that replays recorded MCP sessions against a running server over SSE
+
+Record real traffic by starting the server with MEM0_RECORD_SESSIONS=sessions.jsonl, then
+replay it with more and more concurrent agents to find where latency degrades:
+
+    python loadgen.py sessions.jsonl --url http://localhost:8050/sse --agents 1,4,16,64 --duration 30
+
+Every agent opens its own SSE connection and replays one recorded session after another,
+keeping the recorded gaps between calls (scaled by --speed). For each level the report
+gives per-tool latency percentiles and throughput, and the saturation point: the first
+level where throughput stops growing or the --slo-tool p95 exceeds --slo-p95-ms.
+"""
+import argparse
+import asyncio
+from collections import defaultdict
+import itertools
+import json
+import sys
+import time
+
+import numpy as np
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+USER_HEADER = "x-mem0-user-id"
+
+def load_sessions(path: str) -> list[list[dict]]:
+    """Group a recording into sessions, each a list of calls in the order they started."""
+    sessions = defaultdict(list)
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                call = json.loads(line)
+                sessions[call["session"]].append(call)
+    return [sorted(calls, key=lambda call: call["offset"]) for _, calls in sorted(sessions.items())]
+
+class Pacer:
+    """Spaces calls from all agents to at most `rate` per second (0 for no limit)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.perf_counter()
+            self._next = max(self._next, now)
+            delay, self._next = self._next - now, self._next + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def for_agent(call: dict, agent: int, isolate: bool) -> tuple[dict, dict]:
+    """The arguments and headers of a recorded call as agent number `agent` sends them."""
+    arguments, headers = dict(call["arguments"]), dict(call.get("headers", {}))
+    if isolate:
+        # One user per agent, so N agents look like N users instead of one user with N sessions
+        base = arguments.get("user_id") or headers.get(USER_HEADER) or "loadgen"
+        headers[USER_HEADER] = f"{base}-agent{agent}"
+        if arguments.get("user_id"):
+            arguments["user_id"] = headers[USER_HEADER]
+    return arguments, headers
+
+async def replay_session(url: str, calls: list[dict], agent: int, speed: float, isolate: bool, pacer: Pacer,
+                         deadline: float, samples: list):
+    """Replay one recorded session on a fresh SSE connection, appending (tool, seconds, error) to samples."""
+    _, headers = for_agent(calls[0], agent, isolate)
+    try:
+        async with sse_client(url, headers=headers) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                started = time.perf_counter()
+                for call in calls:
+                    if speed:
+                        await asyncio.sleep(max(0.0, started + call["offset"] / speed - time.perf_counter()))
+                    if time.perf_counter() >= deadline:
+                        return
+                    await pacer.wait()
+                    arguments, _ = for_agent(call, agent, isolate)
+                    call_started = time.perf_counter()
+                    try:
+                        result = await session.call_tool(call["tool"], arguments)
+                        error = result.isError or any(
+                            getattr(content, "text", "").startswith("Error") for content in result.content
+                        )
+                    except Exception:
+                        error = True
+                    samples.append((call["tool"], time.perf_counter() - call_started, error))
+    except Exception:
+        samples.append(("connect", 0.0, True))
+
+async def run_level(url: str, sessions: list[list[dict]], agents: int, duration: float, speed: float,
+                    rate: float, isolate: bool) -> dict:
+    """Run `agents` concurrent agents for `duration` seconds and summarize what they saw."""
+    samples, pacer = [], Pacer(rate)
+    deadline = time.perf_counter() + duration
+    queue = itertools.cycle(sessions)
+
+    async def agent(number: int):
+        while time.perf_counter() < deadline:
+            await replay_session(url, next(queue), number, speed, isolate, pacer, deadline, samples)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(agent(number) for number in range(agents)))
+    return summarize(samples, agents, time.perf_counter() - started)
+
+def summarize(samples: list[tuple[str, float, bool]], agents: int, elapsed: float) -> dict:
+    by_tool = defaultdict(list)
+    for tool, seconds, error in samples:
+        by_tool[tool].append((seconds, error))
+    tools = {}
+    for tool, calls in sorted(by_tool.items()):
+        latencies = np.array([seconds for seconds, _ in calls]) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        tools[tool] = {
+            "calls": len(calls), "errors": sum(error for _, error in calls),
+            "p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2), "p99_ms": round(float(p99), 2),
+            "throughput": round(len(calls) / elapsed, 2),
+        }
+    return {
+        "agents": agents,
+        "calls": len(samples),
+        "errors": sum(error for _, _, error in samples),
+        "throughput": round(len(samples) / elapsed, 2),
+        "tools": tools,
+    }
+
+def find_saturation(levels: list[dict], slo_tool: str, slo_p95_ms: float, min_gain: float) -> dict:
+    """The first level where adding agents no longer adds throughput, or the SLO tool gets too slow."""
+    previous = None
+    for level in levels:
+        slo = level["tools"].get(slo_tool)
+        if slo and slo["p95_ms"] > slo_p95_ms:
+            return {"agents": level["agents"], "reason": f"{slo_tool} p95 {slo['p95_ms']:.0f} ms > {slo_p95_ms:.0f} ms",
+                    "max_agents_within_slo": previous["agents"] if previous else 0}
+        if previous and level["throughput"] < previous["throughput"] * (1 + min_gain):
+            return {"agents": level["agents"],
+                    "reason": f"throughput {previous['throughput']:.1f} -> {level['throughput']:.1f} calls/s",
+                    "max_agents_within_slo": previous["agents"]}
+        previous = level
+    return {"agents": None, "reason": "not reached", "max_agents_within_slo": previous["agents"] if previous else 0}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sessions", help="JSON lines file written with MEM0_RECORD_SESSIONS")
+    parser.add_argument("--url", default="http://localhost:8050/sse", help="SSE endpoint of the server")
+    parser.add_argument("--agents", default="1,2,4,8,16,32", help="Comma-separated concurrent agent counts")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per level")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed: 2 halves the recorded gaps between calls, 0 sends calls back to back")
+    parser.add_argument("--rate", type=float, default=0.0, help="Cap on calls per second across all agents, 0 for none")
+    parser.add_argument("--shared-user", action="store_true", help="Replay every agent as the recorded user")
+    parser.add_argument("--slo-tool", default="search_memories", help="Tool whose latency defines saturation")
+    parser.add_argument("--slo-p95-ms", type=float, default=500.0)
+    parser.add_argument("--min-gain", type=float, default=0.1,
+                        help="Throughput growth below which a level counts as saturated")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    sessions = load_sessions(args.sessions)
+    if not sessions:
+        sys.exit(f"No recorded calls in {args.sessions}")
+    print("📋 MCP-Mem0 Load Generator")
+    print("=" * 40)
+    print(f"   {len(sessions)} recorded sessions, {sum(map(len, sessions))} calls, replaying against {args.url}")
+
+    levels = []
+    for agents in (int(level) for level in args.agents.split(",")):
+        level = asyncio.run(run_level(args.url, sessions, agents, args.duration, args.speed, args.rate,
+                                      not args.shared_user))
+        levels.append(level)
+        print(f"\n⏱️  {agents} agents: {level['throughput']:.1f} calls/s, {level['errors']} errors\n")
+        print(f"   {'tool':>20} {'calls':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        for tool, stats in level["tools"].items():
+            print(f"   {tool:>20} {stats['calls']:>7} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+                  f"{stats['p99_ms']:>8.1f} {stats['errors']:>6}")
+
+    saturation = find_saturation(levels, args.slo_tool, args.slo_p95_ms, args.min_gain)
+    if saturation["agents"] is None:
+        print(f"\n✅ No saturation up to {levels[-1]['agents']} agents")
+    else:
+        print(f"\n📈 Saturated at {saturation['agents']} agents ({saturation['reason']}); "
+              f"{saturation['max_agents_within_slo']} agents stay within the limits")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"url": args.url, "levels": levels, "saturation": saturation}, file, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,606 @@
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+
+import pytz
+from mem0.configs.base import MemoryConfig, MemoryItem
+from mem0.configs.prompts import get_update_memory_messages
+from mem0.memory.main import _build_filters_and_metadata
+from mem0.memory.storage import SQLiteManager
+from mem0.memory.utils import get_fact_retrieval_messages, parse_messages, remove_code_blocks
+
+from embeddings import wrap_async_embedder, wrap_embedder
+from local_store import split_local_vector_store
+from pooling import get_connection_pools
+from quantization import get_quantization_settings, qdrant_quantization_config
+
+logger = logging.getLogger(__name__)
+
+# Payload keys mem0 lifts out of the payload and onto the memory item itself
+PROMOTED_PAYLOAD_KEYS = ["user_id", "agent_id", "run_id", "actor_id", "role"]
+CORE_AND_PROMOTED_KEYS = {"data", "hash", "created_at", "updated_at", "id", *PROMOTED_PAYLOAD_KEYS}
+
+class AsyncOpenAILLM:
+    """OpenAI-compatible chat completions on AsyncOpenAI (also used for OpenRouter)."""
+
+    def __init__(self, config: dict):
+        from openai import AsyncOpenAI
+
+        self.model = config.get("model") or "gpt-4o-mini"
+        self.temperature = config.get("temperature", 0.2)
+        self.max_tokens = config.get("max_tokens", 2000)
+        # Mirrors mem0's OpenAILLM: an OpenRouter key takes precedence over the OpenAI settings
+        if os.environ.get("OPENROUTER_API_KEY"):
+            self.client = AsyncOpenAI(
+                api_key=os.environ["OPENROUTER_API_KEY"],
+                base_url=os.getenv("OPENROUTER_API_BASE") or "https://openrouter.ai/api/v1",
+                http_client=get_connection_pools().async_http_client("llm"),
+            )
+        else:
+            self.client = AsyncOpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                base_url=os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1",
+                http_client=get_connection_pools().async_http_client("llm"),
+            )
+
+    async def generate_response(self, messages, response_format=None):
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+        if response_format:
+            params["response_format"] = response_format
+        response = await self.client.chat.completions.create(**params)
+        return response.choices[0].message.content
+
+    async def close(self):
+        await self.client.close()
+
+class AsyncOllamaLLM:
+    """Ollama chat on ollama.AsyncClient."""
+
+    def __init__(self, config: dict):
+        from ollama import AsyncClient
+
+        self.model = config.get("model")
+        self.options = {"temperature": config.get("temperature", 0.2), "num_predict": config.get("max_tokens", 2000)}
+        pools = get_connection_pools()
+        self.client = AsyncClient(host=config.get("ollama_base_url"), transport=pools.transport("llm", asynchronous=True),
+                                  timeout=pools.timeout())
+
+    async def generate_response(self, messages, response_format=None):
+        params = {"model": self.model, "messages": messages, "options": self.options}
+        if response_format:
+            params["format"] = "json"
+        response = await self.client.chat(**params)
+        return response["message"]["content"]
+
+    async def close(self):
+        pass
+
+class AsyncOpenAIEmbedder:
+    """OpenAI embeddings on AsyncOpenAI."""
+
+    def __init__(self, config: dict):
+        from openai import AsyncOpenAI
+
+        self.model = config.get("model") or "text-embedding-3-small"
+        self.embedding_dims = config.get("embedding_dims") or 1536
+        self.client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1",
+            http_client=get_connection_pools().async_http_client("embedder"),
+        )
+
+    async def embed(self, text, memory_action=None):
+        text = text.replace("\n", " ")
+        response = await self.client.embeddings.create(input=[text], model=self.model, dimensions=self.embedding_dims)
+        return response.data[0].embedding
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        response = await self.client.embeddings.create(
+            input=[text.replace("\n", " ") for text in texts], model=self.model, dimensions=self.embedding_dims
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    async def close(self):
+        await self.client.close()
+
+class AsyncOllamaEmbedder:
+    """Ollama embeddings on ollama.AsyncClient."""
+
+    def __init__(self, config: dict):
+        from ollama import AsyncClient
+
+        self.model = config.get("model") or "nomic-embed-text"
+        self.embedding_dims = config.get("embedding_dims") or 768
+        pools = get_connection_pools()
+        self.client = AsyncClient(host=config.get("ollama_base_url"),
+                                  transport=pools.transport("embedder", asynchronous=True), timeout=pools.timeout())
+
+    async def embed(self, text, memory_action=None):
+        response = await self.client.embeddings(model=self.model, prompt=text)
+        return response["embedding"]
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        response = await self.client.embed(model=self.model, input=texts)
+        return response["embeddings"]
+
+    async def close(self):
+        pass
+
+class AsyncQdrantStore:
+    """Qdrant vector store on AsyncQdrantClient with the same payload layout as mem0's Qdrant store."""
+
+    def __init__(self, config: dict, quantization: str = "none", rerank: int = 10):
+        self.collection_name = config.get("collection_name", "mem0")
+        self.embedding_model_dims = config.get("embedding_model_dims")
+        self.quantization = quantization
+        self.rerank = rerank
+        self.client = get_connection_pools().qdrant_client(config, asynchronous=True)
+
+    async def create_col(self):
+        from qdrant_client.models import Distance, VectorParams
+
+        quantization_config = qdrant_quantization_config(self.quantization)
+        if await self.client.collection_exists(self.collection_name):
+            if quantization_config is not None:
+                await self.client.update_collection(
+                    collection_name=self.collection_name, quantization_config=quantization_config
+                )
+            return
+        await self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(size=self.embedding_model_dims, distance=Distance.COSINE),
+            quantization_config=quantization_config,
+        )
+
+    def _create_filter(self, filters: dict):
+        from qdrant_client.models import FieldCondition, Filter, MatchValue, Range
+
+        conditions = []
+        for key, value in filters.items():
+            if isinstance(value, dict) and "gte" in value and "lte" in value:
+                conditions.append(FieldCondition(key=key, range=Range(gte=value["gte"], lte=value["lte"])))
+            else:
+                conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+        return Filter(must=conditions) if conditions else None
+
+    async def insert(self, vectors: list, payloads: list = None, ids: list = None):
+        from qdrant_client.models import PointStruct
+
+        points = [
+            PointStruct(id=idx if ids is None else ids[idx], vector=vector, payload=payloads[idx] if payloads else {})
+            for idx, vector in enumerate(vectors)
+        ]
+        await self.client.upsert(collection_name=self.collection_name, points=points)
+
+    async def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None) -> list:
+        from qdrant_client.models import QuantizationSearchParams, SearchParams
+
+        search_params = None
+        if self.quantization != "none":
+            # Over-fetch on the quantized index, then re-score the candidates with the original vectors
+            search_params = SearchParams(
+                quantization=QuantizationSearchParams(rescore=True, oversampling=float(self.rerank))
+            )
+        hits = await self.client.query_points(
+            collection_name=self.collection_name,
+            query=vectors,
+            query_filter=self._create_filter(filters) if filters else None,
+            limit=limit,
+            search_params=search_params,
+        )
+        return hits.points
+
+    async def delete(self, vector_id):
+        from qdrant_client.models import PointIdsList
+
+        await self.client.delete(collection_name=self.collection_name, points_selector=PointIdsList(points=[vector_id]))
+
+    async def delete_many(self, vector_ids: list):
+        from qdrant_client.models import PointIdsList
+
+        await self.client.delete(collection_name=self.collection_name, points_selector=PointIdsList(points=vector_ids))
+
+    async def update(self, vector_id, vector: list = None, payload: dict = None):
+        from qdrant_client.models import PointStruct
+
+        await self.client.upsert(
+            collection_name=self.collection_name, points=[PointStruct(id=vector_id, vector=vector, payload=payload)]
+        )
+
+    async def get(self, vector_id):
+        result = await self.client.retrieve(collection_name=self.collection_name, ids=[vector_id], with_payload=True)
+        return result[0] if result else None
+
+    async def get_many(self, vector_ids: list) -> list:
+        return await self.client.retrieve(collection_name=self.collection_name, ids=vector_ids, with_payload=True)
+
+    async def list(self, filters: dict = None, limit: int = 100):
+        return await self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=self._create_filter(filters) if filters else None,
+            limit=limit,
+            with_payload=True,
+            with_vectors=False,
+        )
+
+    async def scroll(self, filters: dict = None, limit: int = 100, offset=None):
+        return await self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=self._create_filter(filters) if filters else None,
+            limit=limit,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+
+    async def close(self):
+        await self.client.close()
+
+class ThreadedAdapter:
+    """Exposes the methods of a synchronous backend as coroutines run through the dispatcher.
+
+    Used for the backends without an async driver (Supabase through vecs, and mem0's graph
+    memory), so they still share the bounded worker pool instead of spawning threads.
+    """
+
+    def __init__(self, backend, dispatcher, operation: str):
+        self.backend = backend
+        self.dispatcher = dispatcher
+        self.operation = operation
+
+    def __getattr__(self, name):
+        method = getattr(self.backend, name)
+
+        async def call(*args, **kwargs):
+            return await self.dispatcher.run(self.operation, method, *args, **kwargs)
+
+        return call
+
+@dataclass
+class _ExistingMemory:
+    id: str
+    text: str
+
+class NativeAsyncMemory:
+    """Async-native counterpart of mem0.Memory for the operations the MCP tools use.
+
+    Every backend call is awaited directly, so hundreds of requests can be in flight on
+    the event loop without holding a thread each. Results, payloads and history rows use
+    the same layout as mem0.Memory, so both client modes can share one store.
+    """
+
+    def __init__(self, llm, embedding_model, vector_store, db, graph=None, custom_fact_extraction_prompt=None,
+                 custom_update_memory_prompt=None):
+        self.llm = llm
+        self.embedding_model = embedding_model
+        self.vector_store = vector_store
+        self.db = db
+        self.graph = graph
+        self.enable_graph = graph is not None
+        self.custom_fact_extraction_prompt = custom_fact_extraction_prompt
+        self.custom_update_memory_prompt = custom_update_memory_prompt
+
+    async def initialize(self):
+        """Create the vector collection if the store needs it."""
+        if hasattr(self.vector_store, "create_col") and not isinstance(self.vector_store, ThreadedAdapter):
+            await self.vector_store.create_col()
+
+    async def close(self):
+        for backend in (self.llm, self.embedding_model, self.vector_store):
+            if hasattr(backend, "close") and not isinstance(backend, ThreadedAdapter):
+                await backend.close()
+
+    async def add(self, messages, *, user_id=None, agent_id=None, run_id=None, metadata=None, infer=True):
+        processed_metadata, effective_filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_metadata=metadata
+        )
+
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        elif isinstance(messages, dict):
+            messages = [messages]
+        elif not isinstance(messages, list):
+            raise ValueError("messages must be str, dict, or list[dict]")
+
+        vector_result, graph_result = await asyncio.gather(
+            self._add_to_vector_store(messages, processed_metadata, effective_filters, infer),
+            self._add_to_graph(messages, effective_filters),
+        )
+
+        if self.enable_graph:
+            return {"results": vector_result, "relations": graph_result}
+        return {"results": vector_result}
+
+    async def _add_to_vector_store(self, messages, metadata, filters, infer):
+        if not infer:
+            returned_memories = []
+            for message in messages:
+                if not isinstance(message, dict) or message.get("role") is None or message.get("content") is None:
+                    continue
+                if message["role"] == "system":
+                    continue
+                per_message_metadata = deepcopy(metadata)
+                per_message_metadata["role"] = message["role"]
+                if message.get("name"):
+                    per_message_metadata["actor_id"] = message["name"]
+                embeddings = await self.embedding_model.embed(message["content"], "add")
+                memory_id = await self._create_memory(message["content"], {message["content"]: embeddings}, per_message_metadata)
+                returned_memories.append({
+                    "id": memory_id,
+                    "memory": message["content"],
+                    "event": "ADD",
+                    "actor_id": message.get("name"),
+                    "role": message["role"],
+                })
+            return returned_memories
+
+        parsed_messages = parse_messages(messages)
+        if self.custom_fact_extraction_prompt:
+            system_prompt, user_prompt = self.custom_fact_extraction_prompt, f"Input:\n{parsed_messages}"
+        else:
+            system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
+
+        response = await self.llm.generate_response(
+            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            response_format={"type": "json_object"},
+        )
+        try:
+            new_retrieved_facts = json.loads(remove_code_blocks(response))["facts"]
+        except Exception as e:
+            logger.error(f"Error in new_retrieved_facts: {e}")
+            new_retrieved_facts = []
+
+        # Embed each fact and look up its neighbours concurrently instead of one at a time
+        async def existing_for_fact(fact):
+            embeddings = await self.embedding_model.embed(fact, "add")
+            existing = await self.vector_store.search(query=fact, vectors=embeddings, limit=5, filters=filters)
+            return fact, embeddings, existing
+
+        new_message_embeddings = {}
+        retrieved_old_memory = {}
+        for fact, embeddings, existing in await asyncio.gather(*(existing_for_fact(f) for f in new_retrieved_facts)):
+            new_message_embeddings[fact] = embeddings
+            for memory in existing:
+                retrieved_old_memory[memory.id] = _ExistingMemory(id=memory.id, text=memory.payload["data"])
+
+        # Map UUIDs to small integers so the LLM cannot hallucinate IDs
+        temp_uuid_mapping = {}
+        old_memory_prompt = []
+        for idx, memory in enumerate(retrieved_old_memory.values()):
+            temp_uuid_mapping[str(idx)] = memory.id
+            old_memory_prompt.append({"id": str(idx), "text": memory.text})
+
+        new_memories_with_actions = {}
+        if new_retrieved_facts:
+            prompt = get_update_memory_messages(old_memory_prompt, new_retrieved_facts, self.custom_update_memory_prompt)
+            try:
+                response = await self.llm.generate_response(
+                    messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"}
+                )
+                new_memories_with_actions = json.loads(remove_code_blocks(response))
+            except Exception as e:
+                logger.error(f"Error in new memory actions response: {e}")
+
+        returned_memories = []
+        for action in new_memories_with_actions.get("memory", []):
+            try:
+                text = action.get("text")
+                event = action.get("event")
+                if not text:
+                    continue
+                if event == "ADD":
+                    memory_id = await self._create_memory(text, new_message_embeddings, deepcopy(metadata))
+                    returned_memories.append({"id": memory_id, "memory": text, "event": event})
+                elif event == "UPDATE":
+                    memory_id = temp_uuid_mapping[action.get("id")]
+                    await self._update_memory(memory_id, text, new_message_embeddings, deepcopy(metadata))
+                    returned_memories.append(
+                        {"id": memory_id, "memory": text, "event": event, "previous_memory": action.get("old_memory")}
+                    )
+                elif event == "DELETE":
+                    memory_id = temp_uuid_mapping[action.get("id")]
+                    await self._delete_memory(memory_id)
+                    returned_memories.append({"id": memory_id, "memory": text, "event": event})
+            except Exception as e:
+                logger.error(f"Error processing memory action: {action}, Error: {e}")
+        return returned_memories
+
+    async def _add_to_graph(self, messages, filters):
+        if not self.enable_graph:
+            return []
+        if filters.get("user_id") is None:
+            filters["user_id"] = "user"
+        data = "\n".join(m["content"] for m in messages if "content" in m and m["role"] != "system")
+        return await self.graph.add(data, filters)
+
+    async def search(self, query, *, user_id=None, agent_id=None, run_id=None, limit=100, filters=None, threshold=None):
+        _, effective_filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_filters=filters
+        )
+
+        if self.enable_graph:
+            results, relations = await asyncio.gather(
+                self._search_vector_store(query, effective_filters, limit, threshold),
+                self.graph.search(query, effective_filters, limit),
+            )
+            return {"results": results, "relations": relations}
+        return {"results": await self._search_vector_store(query, effective_filters, limit, threshold)}
+
+    async def _search_vector_store(self, query, filters, limit, threshold=None):
+        embeddings = await self.embedding_model.embed(query, "search")
+        memories = await self.vector_store.search(query=query, vectors=embeddings, limit=limit, filters=filters)
+        return [
+            _format_memory(memory, with_score=True)
+            for memory in memories
+            if threshold is None or memory.score >= threshold
+        ]
+
+    async def get_all(self, *, user_id=None, agent_id=None, run_id=None, filters=None, limit=100):
+        _, effective_filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_filters=filters
+        )
+
+        async def list_vector_store():
+            listed = await self.vector_store.list(filters=effective_filters, limit=limit)
+            memories = listed[0] if isinstance(listed, (tuple, list)) and len(listed) > 0 else listed
+            return [_format_memory(memory) for memory in memories]
+
+        if self.enable_graph:
+            results, relations = await asyncio.gather(
+                list_vector_store(), self.graph.get_all(effective_filters, limit)
+            )
+            return {"results": results, "relations": relations}
+        return {"results": await list_vector_store()}
+
+    async def get(self, memory_id):
+        memory = await self.vector_store.get(vector_id=memory_id)
+        return _format_memory(memory) if memory else None
+
+    async def update(self, memory_id, data):
+        embeddings = await self.embedding_model.embed(data, "update")
+        await self._update_memory(memory_id, data, {data: embeddings})
+        return {"message": "Memory updated successfully!"}
+
+    async def delete(self, memory_id):
+        await self._delete_memory(memory_id)
+        return {"message": "Memory deleted successfully!"}
+
+    async def _create_memory(self, data, existing_embeddings, metadata=None):
+        if data in existing_embeddings:
+            embeddings = existing_embeddings[data]
+        else:
+            embeddings = await self.embedding_model.embed(data, memory_action="add")
+        memory_id = str(uuid.uuid4())
+        metadata = metadata or {}
+        metadata["data"] = data
+        metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
+        metadata["created_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+
+        await self.vector_store.insert(vectors=[embeddings], ids=[memory_id], payloads=[metadata])
+        # The history table is a SQLite file written with blocking calls, kept off the event loop
+        await asyncio.to_thread(
+            self.db.add_history, memory_id, None, data, "ADD",
+            created_at=metadata.get("created_at"), actor_id=metadata.get("actor_id"), role=metadata.get("role"),
+        )
+        return memory_id
+
+    async def _update_memory(self, memory_id, data, existing_embeddings, metadata=None):
+        existing_memory = await self.vector_store.get(vector_id=memory_id)
+        if existing_memory is None:
+            raise ValueError(f"Error getting memory with ID {memory_id}. Please provide a valid 'memory_id'")
+        prev_value = existing_memory.payload.get("data")
+
+        new_metadata = deepcopy(metadata) if metadata is not None else {}
+        new_metadata["data"] = data
+        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
+        new_metadata["created_at"] = existing_memory.payload.get("created_at")
+        new_metadata["updated_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+        for key in PROMOTED_PAYLOAD_KEYS:
+            if key in existing_memory.payload:
+                new_metadata[key] = existing_memory.payload[key]
+
+        if data in existing_embeddings:
+            embeddings = existing_embeddings[data]
+        else:
+            embeddings = await self.embedding_model.embed(data, "update")
+
+        await self.vector_store.update(vector_id=memory_id, vector=embeddings, payload=new_metadata)
+        await asyncio.to_thread(
+            self.db.add_history, memory_id, prev_value, data, "UPDATE",
+            created_at=new_metadata["created_at"], updated_at=new_metadata["updated_at"],
+            actor_id=new_metadata.get("actor_id"), role=new_metadata.get("role"),
+        )
+        return memory_id
+
+    async def _delete_memory(self, memory_id):
+        existing_memory = await self.vector_store.get(vector_id=memory_id)
+        if existing_memory is None:
+            raise ValueError(f"Memory with ID {memory_id} not found")
+        await self.vector_store.delete(vector_id=memory_id)
+        await asyncio.to_thread(
+            self.db.add_history, memory_id, existing_memory.payload["data"], None, "DELETE",
+            actor_id=existing_memory.payload.get("actor_id"), role=existing_memory.payload.get("role"), is_deleted=1,
+        )
+        return memory_id
+
+def _format_memory(memory, with_score: bool = False) -> dict:
+    """Format a vector store record the same way mem0.Memory does."""
+    item = MemoryItem(
+        id=memory.id,
+        memory=memory.payload["data"],
+        hash=memory.payload.get("hash"),
+        created_at=memory.payload.get("created_at"),
+        updated_at=memory.payload.get("updated_at"),
+        score=memory.score if with_score else None,
+    ).model_dump(exclude=None if with_score else {"score"})
+    for key in PROMOTED_PAYLOAD_KEYS:
+        if key in memory.payload:
+            item[key] = memory.payload[key]
+    additional_metadata = {k: v for k, v in memory.payload.items() if k not in CORE_AND_PROMOTED_KEYS}
+    if additional_metadata:
+        item["metadata"] = additional_metadata
+    return item
+
+def build_async_memory(config: dict, dispatcher) -> NativeAsyncMemory:
+    """Build a NativeAsyncMemory from the config dict produced by utils.get_mem0_config.
+
+    Args:
+        config: The Mem0 config dict
+        dispatcher: The MemoryDispatcher used for backends without an async driver
+    """
+    config, local_store = split_local_vector_store(config)
+    memory_config = MemoryConfig(**deepcopy(config))
+
+    llm_provider = config.get("llm", {}).get("provider")
+    llm_config = config.get("llm", {}).get("config", {})
+    llm = AsyncOllamaLLM(llm_config) if llm_provider == "ollama" else AsyncOpenAILLM(llm_config)
+
+    embedder_provider = config.get("embedder", {}).get("provider")
+    embedder_config = config.get("embedder", {}).get("config", {})
+    if embedder_provider == "ollama":
+        embedding_model = AsyncOllamaEmbedder(embedder_config)
+    else:
+        embedding_model = AsyncOpenAIEmbedder(embedder_config)
+    embedding_model = wrap_async_embedder(embedding_model)
+
+    if local_store:
+        # Local file and numpy work, kept off the event loop
+        vector_store = ThreadedAdapter(local_store, dispatcher, "vector_store")
+    elif config["vector_store"]["provider"] == "qdrant":
+        vector_store = AsyncQdrantStore(config["vector_store"]["config"], *get_quantization_settings())
+    else:
+        # vecs (Supabase) has no async driver, so it runs on the dispatcher's worker pool
+        from mem0.utils.factory import VectorStoreFactory
+
+        sync_store = VectorStoreFactory.create(memory_config.vector_store.provider, memory_config.vector_store.config)
+        vector_store = ThreadedAdapter(sync_store, dispatcher, "vector_store")
+
+    graph = None
+    if memory_config.graph_store.config:
+        # mem0's graph memory drives Neo4j through langchain's synchronous client
+        from mem0.memory.graph_memory import MemoryGraph
+
+        graph_memory = get_connection_pools().pool_graph(MemoryGraph(memory_config))
+        graph_memory.embedding_model = wrap_embedder(graph_memory.embedding_model)
+        graph = ThreadedAdapter(graph_memory, dispatcher, "graph")
+
+    return NativeAsyncMemory(
+        llm=llm,
+        embedding_model=embedding_model,
+        vector_store=vector_store,
+        db=SQLiteManager(memory_config.history_db_path),
+        graph=graph,
+        custom_fact_extraction_prompt=memory_config.custom_fact_extraction_prompt,
+        custom_update_memory_prompt=memory_config.custom_update_memory_prompt,
+    )
@@ -0,0 +1,104 @@
+import asyncio
+import functools
+
+from mem0.vector_stores.qdrant import Qdrant
+
+from async_backend import ThreadedAdapter
+from embeddings import CachingEmbedder, AsyncCachingEmbedder, embed_batch
+from fastpath import add_raw
+
+async def embed_many(memory, dispatcher, texts: list[str]) -> list[list[float]]:
+    """Embed several texts with one provider request through the client's embedding pipeline."""
+    embedder = memory.embedding_model
+    if hasattr(embedder, "embed_batch"):
+        return await dispatcher.run("embed", embedder.embed_batch, texts)
+    return await dispatcher.run("embed", embed_batch, embedder, texts)
+
+def has_embedding_cache(memory) -> bool:
+    return isinstance(memory.embedding_model, (CachingEmbedder, AsyncCachingEmbedder))
+
+async def add_many(memory, dispatcher, texts: list[str], scope: dict, infer: bool = True) -> list:
+    """Run one Mem0 add per text concurrently, returning each result or the exception it raised.
+
+    Every text still goes through its own fact extraction, since the LLM decides per item
+    whether to add, update or skip. Concurrency is bounded by the dispatcher's "add" limit and
+    the embedding calls of items in flight together are coalesced by the micro-batcher.
+    `scope` holds the user_id (and agent_id/run_id) keyword arguments of each add. With
+    infer=False each text is stored verbatim through fastpath.add_raw instead.
+    """
+    async def add_one(text):
+        messages = [{"role": "user", "content": text}]
+        if not infer:
+            return await add_raw(memory, dispatcher, messages, scope)
+        return await dispatcher.run("add", memory.add, messages, **scope)
+
+    return await asyncio.gather(*(add_one(text) for text in texts), return_exceptions=True)
+
+def _sync_vector_store(memory):
+    vector_store = memory.vector_store
+    return vector_store.backend if isinstance(vector_store, ThreadedAdapter) else vector_store
+
+def _get_points(vector_store, ids: list[str]) -> list:
+    """Fetch several records from a mem0 vector store, in one request for Qdrant."""
+    if isinstance(vector_store, Qdrant):
+        return vector_store.client.retrieve(collection_name=vector_store.collection_name, ids=ids, with_payload=True)
+    records = (vector_store.get(vector_id=vector_id) for vector_id in ids)
+    return [record for record in records if record is not None]
+
+def points_getter(memory):
+    """The client's bulk vector store fetch: the store's own get_many, else _get_points on the sync store."""
+    vector_store = memory.vector_store
+    if hasattr(vector_store, "get_many"):
+        return vector_store.get_many
+    return functools.partial(_get_points, _sync_vector_store(memory))
+
+def _delete_points(vector_store, ids: list[str]):
+    """Delete several records from a mem0 vector store, in one request for Qdrant."""
+    if isinstance(vector_store, Qdrant):
+        from qdrant_client.models import PointIdsList
+
+        vector_store.client.delete(collection_name=vector_store.collection_name, points_selector=PointIdsList(points=ids))
+        return
+    for vector_id in ids:
+        vector_store.delete(vector_id=vector_id)
+
+async def delete_many(memory, dispatcher, ids: list[str], owner=None) -> list:
+    """Delete several memories with one bulk fetch and one bulk delete against the vector store.
+
+    Returns, for each ID, the deleted ID or the exception explaining why it was not deleted.
+    History rows are written the same way mem0.Memory.delete writes them. With an `owner`
+    (a tenancy.Tenant), memories of other tenants are reported as not found and left alone.
+    """
+    vector_store = memory.vector_store
+    if hasattr(vector_store, "get_many") and hasattr(vector_store, "delete_many"):
+        get_many, remove_many = vector_store.get_many, vector_store.delete_many
+    else:
+        sync_store = _sync_vector_store(memory)
+        get_many = functools.partial(_get_points, sync_store)
+        remove_many = functools.partial(_delete_points, sync_store)
+
+    unique_ids = list(dict.fromkeys(ids))
+    try:
+        records = await dispatcher.run("delete", get_many, unique_ids)
+    except Exception:
+        # One malformed ID fails the whole bulk request; fetch one by one so only it reports an error
+        records = []
+        for vector_id in unique_ids:
+            try:
+                records.extend(await dispatcher.run("delete", get_many, [vector_id]))
+            except Exception:
+                pass
+    found = {str(record.id): record for record in records if owner is None or owner.owns(record.payload)}
+
+    if found:
+        await dispatcher.run("delete", remove_many, list(found))
+    for record in found.values():
+        memory.db.add_history(
+            str(record.id), record.payload.get("data"), None, "DELETE",
+            actor_id=record.payload.get("actor_id"), role=record.payload.get("role"), is_deleted=1,
+        )
+
+    return [
+        memory_id if memory_id in found else ValueError(f"Memory with ID {memory_id} not found")
+        for memory_id in ids
+    ]
@@ -0,0 +1,233 @@
+from copy import deepcopy
+from dataclasses import dataclass
+import asyncio
+import json
+import logging
+import os
+import re
+
+from mem0.configs.prompts import get_update_memory_messages
+from mem0.memory.main import _build_filters_and_metadata
+from mem0.memory.utils import get_fact_retrieval_messages, parse_messages, remove_code_blocks
+
+from dedup import canonical
+from graph_query import graph_backend
+from stages import StageTimeouts, run_stage
+
+logger = logging.getLogger(__name__)
+
+# "user: ...", "Assistant: ...", "Dr. Smith: ..." - a speaker label up to 40 characters at the start of a line
+TURN_START = re.compile(r"^\s*[\w][\w .'-]{0,39}:\s")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+@dataclass
+class ChunkSettings:
+    """How save_conversation splits long conversations."""
+    max_chars: int = 6000
+    overlap_turns: int = 1
+    concurrency: int = 4
+    facts_per_write: int = 25
+    # Facts sharing at least this share of their words count as one
+    similarity: float = 0.8
+
+def split_turns(conversation: str) -> list[str]:
+    """The turns of a conversation: lines starting with a speaker label and the lines after them.
+
+    Text without speaker labels is split into paragraphs instead.
+    """
+    lines = conversation.splitlines()
+    if not any(TURN_START.match(line) for line in lines):
+        return [paragraph.strip() for paragraph in re.split(r"\n\s*\n", conversation) if paragraph.strip()]
+    turns = []
+    for line in lines:
+        if TURN_START.match(line) or not turns:
+            turns.append(line.strip())
+        elif line.strip():
+            turns[-1] += "\n" + line.strip()
+    return turns
+
+def _split_long_turn(turn: str, max_chars: int) -> list[str]:
+    """Split a turn longer than max_chars between sentences, or anywhere if a sentence is too long."""
+    pieces, current = [], ""
+    for sentence in SENTENCE_END.split(turn):
+        while len(sentence) > max_chars:
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+def chunk_conversation(conversation: str, max_chars: int, overlap_turns: int = 1) -> list[str]:
+    """Split a conversation into chunks of at most max_chars, only between turns where possible.
+
+    Each chunk after the first repeats the last `overlap_turns` turns of the one before it,
+    so a fact that spans a turn boundary is seen whole by at least one chunk.
+    """
+    turns = []
+    for turn in split_turns(conversation):
+        turns.extend(_split_long_turn(turn, max_chars) if len(turn) > max_chars else [turn])
+
+    chunks, current = [], []
+    for turn in turns:
+        if current and sum(map(len, current)) + len(current) + len(turn) > max_chars:
+            chunks.append("\n".join(current))
+            # Carry the tail of this chunk into the next, as long as the new turn still fits
+            overlap = current[-overlap_turns:] if overlap_turns else []
+            while overlap and sum(map(len, overlap)) + len(overlap) + len(turn) > max_chars:
+                overlap = overlap[1:]
+            current = list(overlap)
+        current.append(turn)
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+async def extract_facts(memory, dispatcher, chunk: str) -> list[str]:
+    """Run mem0's fact extraction prompt, with the client's custom prompt if it has one, on one chunk."""
+    parsed = parse_messages([{"role": "user", "content": chunk}])
+    if memory.custom_fact_extraction_prompt:
+        system_prompt, user_prompt = memory.custom_fact_extraction_prompt, f"Input:\n{parsed}"
+    else:
+        system_prompt, user_prompt = get_fact_retrieval_messages(parsed)
+    response = await dispatcher.run(
+        "extract", memory.llm.generate_response,
+        messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+        response_format={"type": "json_object"},
+    )
+    try:
+        return [fact for fact in json.loads(remove_code_blocks(response))["facts"] if isinstance(fact, str)]
+    except Exception as e:
+        logger.error(f"Error parsing facts of a conversation chunk: {e}")
+        return []
+
+def merge_facts(fact_lists: list[list[str]], similarity: float) -> list[str]:
+    """Concatenate the facts of every chunk, dropping repeats from overlapping chunks.
+
+    A fact is a repeat when it matches an earlier one after case and punctuation are
+    ignored, or shares at least `similarity` of its words with it (Jaccard).
+    """
+    merged, seen = [], []
+    for facts in fact_lists:
+        for fact in facts:
+            words = set(canonical(fact).split())
+            if not words:
+                continue
+            if any(len(words & other) / len(words | other) >= similarity for other in seen):
+                continue
+            merged.append(fact.strip())
+            seen.append(words)
+    return merged
+
+async def update_memories(memory, dispatcher, facts: list[str], metadata: dict, filters: dict) -> list[dict]:
+    """Run mem0's update step on facts already extracted: compare them with the stored memories and apply
+    the model's ADD, UPDATE and DELETE decisions, as Memory.add does after its own extraction.
+    """
+    async def existing_for_fact(fact):
+        embeddings = await dispatcher.run("add", memory.embedding_model.embed, fact, "add")
+        existing = await dispatcher.run("add", memory.vector_store.search, query=fact, vectors=embeddings,
+                                        limit=5, filters=filters)
+        return fact, embeddings, existing
+
+    new_message_embeddings, retrieved_old_memory = {}, {}
+    for fact, embeddings, existing in await asyncio.gather(*(existing_for_fact(fact) for fact in facts)):
+        new_message_embeddings[fact] = embeddings
+        for found in existing:
+            retrieved_old_memory[found.id] = found.payload["data"]
+
+    # Map UUIDs to small integers so the LLM cannot hallucinate IDs
+    temp_uuid_mapping = {str(idx): memory_id for idx, memory_id in enumerate(retrieved_old_memory)}
+    old_memory_prompt = [{"id": idx, "text": retrieved_old_memory[memory_id]}
+                         for idx, memory_id in temp_uuid_mapping.items()]
+    prompt = get_update_memory_messages(old_memory_prompt, facts, memory.custom_update_memory_prompt)
+    try:
+        response = await dispatcher.run("add", memory.llm.generate_response,
+                                        messages=[{"role": "user", "content": prompt}],
+                                        response_format={"type": "json_object"})
+        actions = json.loads(remove_code_blocks(response)).get("memory", [])
+    except Exception as e:
+        logger.error(f"Error in new memory actions response: {e}")
+        actions = []
+
+    results = []
+    for action in actions:
+        try:
+            text, event = action.get("text"), action.get("event")
+            if not text:
+                continue
+            if event == "ADD":
+                memory_id = await dispatcher.run("add", memory._create_memory, text, new_message_embeddings,
+                                                 deepcopy(metadata))
+                results.append({"id": memory_id, "memory": text, "event": event})
+            elif event == "UPDATE":
+                memory_id = temp_uuid_mapping[action.get("id")]
+                await dispatcher.run("add", memory._update_memory, memory_id, text, new_message_embeddings,
+                                     deepcopy(metadata))
+                results.append({"id": memory_id, "memory": text, "event": event,
+                                "previous_memory": action.get("old_memory")})
+            elif event == "DELETE":
+                memory_id = temp_uuid_mapping[action.get("id")]
+                await dispatcher.run("add", memory._delete_memory, memory_id)
+                results.append({"id": memory_id, "memory": text, "event": event})
+        except Exception as e:
+            logger.error(f"Error processing memory action: {action}, Error: {e}")
+    return results
+
+async def add_conversation(memory, dispatcher, conversation: str, settings: ChunkSettings, scope: dict,
+                           timeouts: StageTimeouts = StageTimeouts()) -> dict:
+    """Add a long conversation in chunks, extracting facts from every chunk in parallel.
+
+    Facts are extracted from up to settings.concurrency chunks at once and merged. The merged
+    facts then go straight to mem0's update step (see update_memories), one group of
+    settings.facts_per_write at a time, so each group is compared with the stored memories,
+    including those the previous group wrote. With a graph store, each group is also added
+    to the graph, under timeouts.graph. Returns a result shaped like Memory.add's, plus the
+    number of chunks and writes.
+    """
+    chunks = chunk_conversation(conversation, settings.max_chars, settings.overlap_turns)
+    semaphore = asyncio.Semaphore(settings.concurrency)
+
+    async def extract(chunk):
+        async with semaphore:
+            return await extract_facts(memory, dispatcher, chunk)
+
+    facts = merge_facts(await asyncio.gather(*(extract(chunk) for chunk in chunks)), settings.similarity)
+    groups = [facts[i:i + settings.facts_per_write] for i in range(0, len(facts), settings.facts_per_write)]
+
+    metadata, filters = _build_filters_and_metadata(input_metadata=None, **scope)
+    graph = graph_backend(memory)
+    graph_filters = {**filters, "user_id": filters.get("user_id") or "user"}
+    combined = {"results": [], "chunks": len(chunks), "writes": len(groups)}
+    relations = {"deleted_entities": [], "added_entities": []}
+    errors = {}
+    for group in groups:
+        writes = [update_memories(memory, dispatcher, group, metadata, filters)]
+        if graph is not None:
+            writes.append(run_stage("graph", dispatcher.run("graph", graph.add, "\n".join(group), dict(graph_filters)),
+                                    timeouts.graph, errors))
+        written, *added = await asyncio.gather(*writes)
+        combined["results"].extend(written)
+        if added and isinstance(added[0], dict):
+            for key in relations:
+                relations[key].extend(added[0].get(key, []))
+    if graph is not None:
+        combined["relations"] = relations
+    if errors:
+        combined["partial"] = True
+        combined["stage_errors"] = errors
+    return combined
+
+def get_chunk_settings() -> ChunkSettings | None:
+    """Read the chunking settings from the environment; None when MEM0_CHUNK_CHARS=0 turns chunking off."""
+    defaults = ChunkSettings()
+    max_chars = int(os.getenv("MEM0_CHUNK_CHARS", defaults.max_chars))
+    if max_chars <= 0:
+        return None
+    return ChunkSettings(
+        max_chars=max_chars,
+        overlap_turns=int(os.getenv("MEM0_CHUNK_OVERLAP_TURNS", defaults.overlap_turns)),
+        concurrency=int(os.getenv("MEM0_CHUNK_CONCURRENCY", defaults.concurrency)),
+        facts_per_write=int(os.getenv("MEM0_CHUNK_FACTS_PER_WRITE", defaults.facts_per_write)),
+    )
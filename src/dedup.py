@@ -0,0 +1,158 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import os
+import re
+import threading
+
+import numpy as np
+
+WORD = re.compile(r"\w+")
+NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+SIMHASH_BITS = 64
+SHINGLE = 3
+
+def canonical(text: str) -> str:
+    """The text with case, punctuation and spacing removed, so trivial rewrites hash the same."""
+    return " ".join(WORD.findall(text.casefold()))
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the word 3-shingles of a text; similar texts differ in few bits."""
+    words = WORD.findall(text.casefold())
+    features = [" ".join(words[i:i + SHINGLE]) for i in range(max(1, len(words) - SHINGLE + 1))]
+    digests = b"".join(hashlib.blake2b(feature.encode(), digest_size=8).digest() for feature in features)
+    # One row of 64 bits per feature; a bit of the SimHash is set where most features have it set
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(len(features), SIMHASH_BITS)
+    majority = bits.sum(axis=0) * 2 > len(features)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+@dataclass
+class IndexedText:
+    # None for texts too short to be matched as near duplicates
+    simhash: int | None
+    numbers: tuple[str, ...] = ()
+
+class DedupIndex:
+    """Recognizes saves whose text was already saved for the same tenant, before any provider call.
+
+    Every text is indexed by the hash of its canonical form (exact duplicates) and by its
+    SimHash (near duplicates: rewordings that change a few words). SimHashes are split into
+    max_distance + 1 bands, so two texts within max_distance bits always share a band and
+    a lookup only compares against the texts in matching bands. A near duplicate must also
+    mention the same numbers, so "Alice is 30" never hides "Alice is 31". Each tenant keeps
+    its `max_entries` most recent texts; texts are forgotten when the user deletes or
+    updates memories, so a deleted fact can be saved again.
+    """
+
+    def __init__(self, max_distance: int = 3, max_entries: int = 10000, min_words: int = 6):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        # Short texts have too few shingles for SimHash distances to mean anything
+        self.min_words = min_words
+        self.checked = 0
+        self.duplicates = {"exact": 0, "near": 0}
+        self.skipped_chars = 0
+        self.saves = 0
+        self.save_seconds = 0.0
+        self._partitions: dict[tuple[str, str], OrderedDict[str, IndexedText]] = {}
+        self._bands: dict[tuple[str, str], list[dict[int, set[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def _band_values(self, value: int) -> list[int]:
+        bands = self.max_distance + 1
+        width = SIMHASH_BITS // bands
+        return [value >> (band * width) & ((1 << width) - 1) for band in range(bands)]
+
+    def _find_near(self, key: tuple[str, str], entry: IndexedText) -> str | None:
+        partition, bands = self._partitions[key], self._bands[key]
+        candidates = set()
+        for band, value in zip(bands, self._band_values(entry.simhash)):
+            candidates |= band.get(value, set())
+        for digest in candidates:
+            other = partition[digest]
+            if other.numbers == entry.numbers and bin(other.simhash ^ entry.simhash).count("1") <= self.max_distance:
+                return digest
+        return None
+
+    def _remove(self, key: tuple[str, str], digest: str):
+        entry = self._partitions[key].pop(digest)
+        if entry.simhash is not None:
+            for band, value in zip(self._bands[key], self._band_values(entry.simhash)):
+                band[value].discard(digest)
+                if not band[value]:
+                    del band[value]
+
+    def claim(self, user_id: str, scope: str, text: str) -> str | None:
+        """Return "exact" or "near" if the tenant already saved this text, else index it and return None.
+
+        Indexing on the first claim means two identical saves running at once only write
+        once. Call release() if the save then fails, so a retry is not taken for a duplicate.
+        """
+        words = canonical(text)
+        digest = hashlib.blake2b(words.encode(), digest_size=16).hexdigest()
+        key = (user_id, scope)
+        with self._lock:
+            self.checked += 1
+            partition = self._partitions.setdefault(key, OrderedDict())
+            self._bands.setdefault(key, [{} for _ in range(self.max_distance + 1)])
+            match = "exact" if digest in partition else None
+            entry = IndexedText(None)
+            if match is None and self.max_distance and len(words.split()) >= self.min_words:
+                entry = IndexedText(simhash(words), tuple(sorted(NUMBER.findall(words))))
+                near = self._find_near(key, entry)
+                if near is not None:
+                    match, digest = "near", near
+            if match:
+                partition.move_to_end(digest)
+                self.duplicates[match] += 1
+                self.skipped_chars += len(text)
+                return match
+
+            partition[digest] = entry
+            if entry.simhash is not None:
+                for band, value in zip(self._bands[key], self._band_values(entry.simhash)):
+                    band.setdefault(value, set()).add(digest)
+            while len(partition) > self.max_entries:
+                self._remove(key, next(iter(partition)))
+        return None
+
+    def release(self, user_id: str, scope: str, text: str):
+        """Forget a claimed text whose save failed."""
+        digest = hashlib.blake2b(canonical(text).encode(), digest_size=16).hexdigest()
+        with self._lock:
+            if digest in self._partitions.get((user_id, scope), {}):
+                self._remove((user_id, scope), digest)
+
+    def forget(self, user_id: str):
+        """Drop every indexed text of a user, after their memories were deleted or changed."""
+        with self._lock:
+            for key in [key for key in self._partitions if key[0] == user_id]:
+                del self._partitions[key], self._bands[key]
+
+    def observe_save(self, seconds: float):
+        """Record how long a save that was not a duplicate took, to estimate the time duplicates saved."""
+        with self._lock:
+            self.saves += 1
+            self.save_seconds += seconds
+
+    def stats(self) -> dict:
+        skipped = sum(self.duplicates.values())
+        average = self.save_seconds / self.saves if self.saves else 0.0
+        return {
+            "checked": self.checked,
+            "duplicates": skipped,
+            "exact_duplicates": self.duplicates["exact"],
+            "near_duplicates": self.duplicates["near"],
+            "skipped_chars": self.skipped_chars,
+            "average_save_seconds": round(average, 4),
+            "estimated_seconds_saved": round(skipped * average, 3),
+        }
+
+def get_dedup_index() -> DedupIndex | None:
+    """Build the duplicate index unless MEM0_DEDUP=false."""
+    if os.getenv("MEM0_DEDUP", "true").lower() not in ("true", "1", "yes"):
+        return None
+    return DedupIndex(
+        max_distance=int(os.getenv("MEM0_DEDUP_MAX_DISTANCE", "3")),
+        max_entries=int(os.getenv("MEM0_DEDUP_MAX_ENTRIES", "10000")),
+    )
@@ -0,0 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+
+# Default number of concurrent calls allowed per Memory operation.
+# Writes go through the LLM for fact extraction so they are kept lower than reads.
+DEFAULT_OPERATION_LIMITS = {
+    "add": 4,
+    "search": 16,
+    "get_all": 4,
+    "update": 8,
+    "delete": 8,
+}
+
+@dataclass
+class OperationStats:
+    """Counters for a single Memory operation (add, search, ...)."""
+    limit: int
+    waiting: int = 0
+    in_flight: int = 0
+    completed: int = 0
+    failed: int = 0
+    max_waiting: int = 0
+    total_wait_seconds: float = 0.0
+    total_run_seconds: float = 0.0
+
+class MemoryDispatcher:
+    """Runs blocking Mem0 client calls in a bounded thread pool.
+
+    Every tool in main.py is async but the Memory client is synchronous, so calling it
+    directly blocks the event loop and stalls every connected SSE client. The dispatcher
+    moves each call onto a worker thread and caps how many calls of each operation can
+    run at once. Calls over the cap wait on the event loop without holding a thread.
+
+    Coroutine functions (the async client from MEM0_CLIENT_MODE=async) are awaited
+    directly on the event loop under the same limits and stats.
+
+    A worker thread cannot be interrupted, so a caller cancelled while its call runs stops
+    waiting but the call keeps its slot until the thread finishes.
+    """
+
+    def __init__(self, max_workers: int, operation_limits: dict[str, int] | None = None):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mem0-worker")
+        self.operation_limits = {**DEFAULT_OPERATION_LIMITS, **(operation_limits or {})}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._stats: dict[str, OperationStats] = {}
+        # Calls handed to the executor that have not started on a worker thread yet
+        self._pool_pending = 0
+        self._lock = threading.Lock()
+
+    def _operation(self, operation: str) -> tuple[asyncio.Semaphore, OperationStats]:
+        if operation not in self._semaphores:
+            limit = self.operation_limits.get(operation, self.max_workers)
+            self._semaphores[operation] = asyncio.Semaphore(limit)
+            self._stats[operation] = OperationStats(limit=limit)
+        return self._semaphores[operation], self._stats[operation]
+
+    async def run(self, operation: str, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the worker pool under the limit for operation.
+
+        Args:
+            operation: Name of the Memory operation, used for limits and stats
+            fn: The blocking callable or coroutine function to run
+            *args, **kwargs: Arguments passed through to fn
+
+        Returns:
+            Whatever fn returns. Exceptions raised by fn propagate to the caller.
+        """
+        semaphore, stats = self._operation(operation)
+        queued_at = time.perf_counter()
+        stats.waiting += 1
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        acquired = False
+        try:
+            await semaphore.acquire()
+            acquired = True
+        finally:
+            stats.waiting -= 1
+        stats.in_flight += 1
+        if not inspect.iscoroutinefunction(fn):
+            try:
+                future = self._submit(functools.partial(fn, *args, **kwargs), stats, queued_at)
+            except BaseException:
+                self._finished(semaphore, stats, None)
+                raise
+            # Released when the thread is done, not when this caller stops waiting for it
+            future.add_done_callback(functools.partial(self._finished, semaphore, stats))
+            return await asyncio.shield(future)
+        try:
+            result = await self._await(fn(*args, **kwargs), stats, queued_at)
+            stats.completed += 1
+            return result
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            if acquired:
+                stats.in_flight -= 1
+                semaphore.release()
+
+    @staticmethod
+    def _finished(semaphore: asyncio.Semaphore, stats: OperationStats, future: asyncio.Future | None):
+        if future is not None and not future.cancelled() and future.exception() is None:
+            stats.completed += 1
+        else:
+            stats.failed += 1
+        stats.in_flight -= 1
+        semaphore.release()
+
+    async def _await(self, coroutine, stats: OperationStats, queued_at: float):
+        started = time.perf_counter()
+        stats.total_wait_seconds += started - queued_at
+        try:
+            return await coroutine
+        finally:
+            stats.total_run_seconds += time.perf_counter() - started
+
+    def _submit(self, call, stats: OperationStats, queued_at: float) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        with self._lock:
+            self._pool_pending += 1
+
+        def _run_on_worker():
+            started = time.perf_counter()
+            with self._lock:
+                self._pool_pending -= 1
+                stats.total_wait_seconds += started - queued_at
+            try:
+                return context.run(call)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    stats.total_run_seconds += elapsed
+
+        return loop.run_in_executor(self.executor, _run_on_worker)
+
+    def snapshot(self) -> dict:
+        """Return the current queue depths and per-operation counters."""
+        with self._lock:
+            pool_pending = self._pool_pending
+        return {
+            "max_workers": self.max_workers,
+            "pool_pending": pool_pending,
+            "operations": {name: asdict(stats) for name, stats in self._stats.items()},
+        }
+
+    def shutdown(self):
+        """Drop the calls that have not started and wait for the running ones to finish.
+
+        This blocks; on a running event loop call it through asyncio.to_thread.
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+def parse_operation_limits(spec: str) -> dict[str, int]:
+    """Parse a limit spec like "search=16,add=4" into a dict."""
+    limits = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        limits[name.strip()] = int(value)
+    return limits
+
+def get_dispatcher() -> MemoryDispatcher:
+    """Build a MemoryDispatcher from the MEM0_WORKER_THREADS and MEM0_OPERATION_LIMITS env vars."""
+    max_workers = int(os.getenv("MEM0_WORKER_THREADS") or min(32, (os.cpu_count() or 1) + 4))
+    operation_limits = parse_operation_limits(os.getenv("MEM0_OPERATION_LIMITS", ""))
+    return MemoryDispatcher(max_workers, operation_limits)
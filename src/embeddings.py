@@ -0,0 +1,463 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from array import array
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+import weakref
+
+logger = logging.getLogger(__name__)
+
+# Every sync batcher's collector thread and pool, so the server can stop them on shutdown
+_batchers = weakref.WeakSet()
+
+def embed_batch(embedder, texts: list[str]) -> list[list[float]]:
+    """Embed several texts with one provider call when the mem0 embedder supports it.
+
+    OpenAI takes a list input on the embeddings endpoint and Ollama on /api/embed.
+    Embedders with their own embed_batch use it; any other embedder falls back to one
+    embed call per text.
+    """
+    if hasattr(embedder, "embed_batch"):
+        return embedder.embed_batch(texts)
+    provider = type(embedder).__name__
+    if provider == "OpenAIEmbedding":
+        texts = [text.replace("\n", " ") for text in texts]
+        response = embedder.client.embeddings.create(
+            input=texts, model=embedder.config.model, dimensions=embedder.config.embedding_dims
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+    if provider == "OllamaEmbedding":
+        return embedder.client.embed(model=embedder.config.model, input=texts)["embeddings"]
+    return [embedder.embed(text) for text in texts]
+
+def _settle(batch, results, error: Exception | None):
+    """Resolve every future of a batch: each with its result, or all with the error.
+
+    A batch call that returned a different number of results than it was given items
+    fails the whole batch, since there is no telling which result belongs to which item.
+    """
+    if error is None and (results is None or len(results) != len(batch)):
+        got = "no" if results is None else len(results)
+        error = RuntimeError(f"Batch call returned {got} results for {len(batch)} items")
+    for i, (_, future) in enumerate(batch):
+        if future.done():
+            continue
+        if error is None:
+            future.set_result(results[i])
+        else:
+            future.set_exception(error)
+
+def supports_batching(embedder) -> bool:
+    """Whether embed_batch can send a single provider call for this embedder."""
+    return type(embedder).__name__ in ("OpenAIEmbedding", "OllamaEmbedding") or hasattr(embedder, "embed_batch")
+
+class MicroBatcher:
+    """Coalesces calls made from many threads into batched calls.
+
+    Callers block on submit() while a collector thread waits up to `window` seconds after
+    the first pending item (or until `max_batch` items are pending), then hands the batch
+    to batch_fn on a small pool so a slow batch does not hold up the next one.
+    """
+
+    def __init__(self, batch_fn, window: float, max_batch: int, max_concurrent_batches: int = 4, name: str = "batcher"):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.items = 0
+        self._pending: list[tuple[object, Future]] = []
+        self._closed = False
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix=name)
+        self._collector = threading.Thread(target=self._collect, name=f"{name}-collector", daemon=True)
+        self._collector.start()
+        _batchers.add(self)
+
+    def submit(self, item):
+        """Queue an item and block until its result is ready."""
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The batcher is shut down")
+            self._pending.append((item, future))
+            self._condition.notify()
+        return future.result()
+
+    def _collect(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self.batches += 1
+            self.items += len(batch)
+            self._executor.submit(self._run, batch)
+
+    def _run(self, batch):
+        results, error = None, None
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+        except Exception as e:
+            error = e
+        finally:
+            _settle(batch, results, error)
+
+    def shutdown(self):
+        """Flush what is pending, then stop the collector thread and the batch pool."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._collector.join()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": self.items / self.batches if self.batches else 0.0,
+        }
+
+class AsyncMicroBatcher:
+    """Coalesces coroutine calls on one event loop into batched calls.
+
+    The first pending item schedules a flush `window` seconds later; reaching `max_batch`
+    flushes immediately. Each flush runs batch_fn as its own task.
+    """
+
+    def __init__(self, batch_fn, window: float, max_batch: int):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.items = 0
+        self._pending: list[tuple[object, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        if self._pending:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        self.batches += 1
+        self.items += len(batch)
+        results, error = None, None
+        try:
+            results = await self.batch_fn([item for item, _ in batch])
+        except Exception as e:
+            error = e
+        finally:
+            # Also runs when the task is cancelled, so no caller is left waiting
+            _settle(batch, results, error)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": self.items / self.batches if self.batches else 0.0,
+        }
+
+class BatchingEmbedder:
+    """Drop-in replacement for a mem0 embedder that batches concurrent embed calls.
+
+    Concurrent searches and saves each embed on their own worker thread. Routing them
+    through a MicroBatcher turns N concurrent requests into one provider round trip.
+    """
+
+    def __init__(self, embedder, window: float, max_batch: int):
+        self.embedder = embedder
+        self.batcher = MicroBatcher(lambda texts: embed_batch(embedder, texts), window, max_batch, name="embed-batch")
+
+    def embed(self, text, memory_action=None):
+        return self.batcher.submit(text)
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return embed_batch(self.embedder, texts)
+
+    def __getattr__(self, name):
+        # mem0 reads attributes such as .config off the embedder
+        return getattr(self.embedder, name)
+
+class AsyncBatchingEmbedder:
+    """Async counterpart of BatchingEmbedder for the async client's embedders."""
+
+    def __init__(self, embedder, window: float, max_batch: int):
+        self.embedder = embedder
+        self.batcher = AsyncMicroBatcher(embedder.embed_batch, window, max_batch)
+
+    async def embed(self, text, memory_action=None):
+        return await self.batcher.submit(text)
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return await self.embedder.embed_batch(texts)
+
+    def __getattr__(self, name):
+        return getattr(self.embedder, name)
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: Unicode NFC and collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def embedder_identity(embedder) -> tuple[str, int]:
+    """Return the (model, dims) pair that identifies an embedder's vector space."""
+    config = getattr(embedder, "config", None)
+    model = getattr(config, "model", None) or getattr(embedder, "model", None) or type(embedder).__name__
+    dims = getattr(config, "embedding_dims", None) or getattr(embedder, "embedding_dims", None) or 0
+    return str(model), int(dims)
+
+class EmbeddingCache:
+    """Persistent content-addressed embedding cache in SQLite with LRU eviction.
+
+    Entries are keyed by a hash of (model, dims, normalized text) and store the vector as
+    packed float32. The model fingerprint is recorded in the file; opening it with a
+    different EMBEDDING_MODEL_CHOICE or dimension clears the stale vectors. Hits only note
+    when they were used; those times are written in one batch every `touch_batch` hits or
+    before the next eviction, so a lookup is a single read.
+    """
+
+    def __init__(self, path: str, max_entries: int, model: str, dims: int, touch_batch: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_batch = touch_batch
+        self.model = model
+        self.dims = dims
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Last use of entries hit since the last flush, by key
+        self._touched: dict[str, float] = {}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS cache_meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS embeddings_lru ON embeddings (last_used)")
+        self._check_fingerprint()
+        self._entries = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _check_fingerprint(self):
+        fingerprint = f"{self.model}|{self.dims}"
+        row = self._connection.execute("SELECT value FROM cache_meta WHERE key = 'fingerprint'").fetchone()
+        if row and row[0] != fingerprint:
+            self.invalidate()
+            logger.info(f"Embedding model changed from {row[0]} to {fingerprint}, cleared the embedding cache")
+        self._connection.execute(
+            "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,)
+        )
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}|{self.dims}|{normalize_text(text)}".encode()).hexdigest()
+
+    def get_many(self, texts: list[str]) -> list[list[float] | None]:
+        """Look up several texts at once. Missing entries come back as None."""
+        keys = [self.key(text) for text in texts]
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = dict(self._connection.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall())
+            if rows:
+                now = time.time()
+                self._touched.update((key, now) for key in rows)
+                if len(self._touched) >= self.touch_batch:
+                    self._flush_touches()
+        results = []
+        for key in keys:
+            if key in rows:
+                self.hits += 1
+                results.append(array("f", rows[key]).tolist())
+            else:
+                self.misses += 1
+                results.append(None)
+        return results
+
+    def _flush_touches(self):
+        """Write the buffered last-use times. Called with the lock held."""
+        if self._touched:
+            self._connection.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key, now in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def put_many(self, texts: list[str], vectors: list[list[float]]):
+        """Store vectors for texts, evicting the least recently used entries past max_entries."""
+        now = time.time()
+        rows = [(self.key(text), array("f", vector).tobytes(), now) for text, vector in zip(texts, vectors)]
+        with self._lock:
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows
+            )
+            self._entries += self._connection.total_changes - before
+            if self._entries > self.max_entries:
+                self._flush_touches()
+                # Evict down to 90% so eviction runs in occasional chunks rather than on every insert
+                excess = self._entries - int(self.max_entries * 0.9)
+                self._connection.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._entries -= excess
+
+    def invalidate(self):
+        """Drop every cached vector."""
+        with self._lock:
+            self._connection.execute("DELETE FROM embeddings")
+            self._entries = 0
+            self._touched.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+        }
+
+class CachingEmbedder:
+    """Serves embed calls from an EmbeddingCache and only sends misses to the provider."""
+
+    def __init__(self, embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+
+    def embed(self, text, memory_action=None):
+        cached = self.cache.get_many([text])[0]
+        if cached is not None:
+            return cached
+        vector = self.embedder.embed(text, memory_action)
+        self.cache.put_many([text], [vector])
+        return vector
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        vectors = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fetched = embed_batch(self.embedder, [texts[i] for i in missing])
+            self.cache.put_many([texts[i] for i in missing], fetched)
+            for i, vector in zip(missing, fetched):
+                vectors[i] = vector
+        return vectors
+
+    def __getattr__(self, name):
+        return getattr(self.embedder, name)
+
+class AsyncCachingEmbedder:
+    """Async counterpart of CachingEmbedder. Cache reads and writes run in a thread, off the event loop."""
+
+    def __init__(self, embedder, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+
+    async def embed(self, text, memory_action=None):
+        cached = (await asyncio.to_thread(self.cache.get_many, [text]))[0]
+        if cached is not None:
+            return cached
+        vector = await self.embedder.embed(text, memory_action)
+        await asyncio.to_thread(self.cache.put_many, [text], [vector])
+        return vector
+
+    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        vectors = await asyncio.to_thread(self.cache.get_many, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fetched = await self.embedder.embed_batch([texts[i] for i in missing])
+            await asyncio.to_thread(self.cache.put_many, [texts[i] for i in missing], fetched)
+            for i, vector in zip(missing, fetched):
+                vectors[i] = vector
+        return vectors
+
+    def __getattr__(self, name):
+        return getattr(self.embedder, name)
+
+# One cache per (model, dims), shared by the main and graph embedders
+_caches: dict[tuple[str, int], EmbeddingCache] = {}
+
+def get_embedding_cache(embedder) -> EmbeddingCache | None:
+    """Return the shared EmbeddingCache for this embedder, or None when MEM0_EMBED_CACHE=false."""
+    if os.getenv("MEM0_EMBED_CACHE", "true").lower() not in ("true", "1", "yes"):
+        return None
+    identity = embedder_identity(embedder)
+    if identity not in _caches:
+        mem0_dir = os.getenv("MEM0_DIR") or os.path.join(os.path.expanduser("~"), ".mem0")
+        _caches[identity] = EmbeddingCache(
+            path=os.getenv("MEM0_EMBED_CACHE_PATH") or os.path.join(mem0_dir, "mcp_embeddings.db"),
+            max_entries=int(os.getenv("MEM0_EMBED_CACHE_MAX_ENTRIES", "20000")),
+            model=identity[0],
+            dims=identity[1],
+        )
+    return _caches[identity]
+
+def get_batching_settings() -> tuple[float, int]:
+    """Read the batch window (seconds) and maximum batch size from the environment."""
+    window = float(os.getenv("MEM0_EMBED_BATCH_WINDOW_MS", "2")) / 1000
+    max_batch = int(os.getenv("MEM0_EMBED_MAX_BATCH", "64"))
+    return window, max_batch
+
+def wrap_embedder(embedder):
+    """Wrap a sync mem0 embedder with the cache and micro-batching, where enabled.
+
+    The cache sits in front so hits return without waiting for a batch window.
+    """
+    cache = get_embedding_cache(embedder)
+    window, max_batch = get_batching_settings()
+    if window > 0 and supports_batching(embedder):
+        embedder = BatchingEmbedder(embedder, window, max_batch)
+    return CachingEmbedder(embedder, cache) if cache else embedder
+
+def wrap_async_embedder(embedder):
+    """Wrap an async embedder from async_backend with the cache and micro-batching, where enabled."""
+    cache = get_embedding_cache(embedder)
+    window, max_batch = get_batching_settings()
+    if window > 0 and hasattr(embedder, "embed_batch"):
+        embedder = AsyncBatchingEmbedder(embedder, window, max_batch)
+    return AsyncCachingEmbedder(embedder, cache) if cache else embedder
+
+def shutdown_batchers():
+    """Stop the collector threads and pools of every sync batcher, on server shutdown."""
+    for batcher in list(_batchers):
+        batcher.shutdown()
+
+def install_embedding_pipeline(memory):
+    """Replace the embedders on a mem0.Memory client (and its graph memory) with the wrapped versions."""
+    memory.embedding_model = wrap_embedder(memory.embedding_model)
+    if getattr(memory, "graph", None) is not None:
+        memory.graph.embedding_model = wrap_embedder(memory.graph.embedding_model)
+    return memory
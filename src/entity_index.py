@@ -0,0 +1,274 @@
+import os
+import re
+import threading
+
+from graph_query import entity_names, graph_backend, node_name
+
+WORD = re.compile(r"[^\W_]+")
+POSSESSIVE = re.compile(r"['’]s\b")
+ARTICLES = {"a", "an", "the"}
+# Words of a name shorter than this are not aliases of it on their own ("of", "co")
+MIN_WORD_ALIAS = 3
+# Prefixes shorter than this match too many names to be useful
+MIN_PREFIX = 2
+# How far a prefix lookup walks before giving up on listing every completion
+MAX_COMPLETIONS = 64
+# Shorter names are one typo away from too many other words to correct them
+MIN_FUZZY = 4
+# Best first; a name found in more than one way keeps its best kind of match
+MATCH_KINDS = ("exact", "alias", "word", "prefix", "fuzzy")
+
+def alias_key(name: str) -> str:
+    """A name without case, punctuation, possessives or leading articles: "The Acme-Corp's" -> "acme_corp"."""
+    words = WORD.findall(POSSESSIVE.sub("", name.casefold()))
+    while len(words) > 1 and words[0] in ARTICLES:
+        words.pop(0)
+    return "_".join(words)
+
+def _deletions(word: str) -> set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+def one_typo_apart(a: str, b: str) -> bool:
+    """Whether two different strings differ by one inserted, deleted, replaced or swapped character."""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1 or a == b:
+        return False
+    if len(a) < len(b):
+        return a in _deletions(b)
+    diffs = [i for i in range(len(a)) if a[i] != b[i]]
+    return len(diffs) == 1 or (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                               and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]])
+
+class _Partition:
+    """The entity names of one user (and agent), with their aliases in a character trie."""
+
+    def __init__(self):
+        self.names: set[str] = set()
+        # alias -> {node name: "alias" for the whole name, "word" for one word of it}
+        self.aliases: dict[str, dict[str, str]] = {}
+        # Nested dicts keyed by character; the "" key of a node holds the alias ending there
+        self.trie: dict = {}
+        # Every alias with one character left out -> the aliases it came from, to find typos by lookup
+        self.deletions: dict[str, set[str]] = {}
+        self.loaded = False
+
+    def add(self, name: str):
+        if name in self.names:
+            return
+        self.names.add(name)
+        key = alias_key(name)
+        if not key:
+            return
+        entries = [(key, "alias")]
+        entries += [(word, "word") for word in key.split("_") if len(word) >= MIN_WORD_ALIAS and word != key]
+        for alias, kind in entries:
+            names = self.aliases.setdefault(alias, {})
+            if names.get(name) != "alias":
+                names[name] = kind
+            node = self.trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[""] = alias
+            if len(alias) >= MIN_FUZZY:
+                for deletion in _deletions(alias):
+                    self.deletions.setdefault(deletion, set()).add(alias)
+
+    def completions(self, prefix: str) -> list[str]:
+        """Aliases starting with prefix, at most MAX_COMPLETIONS of them."""
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        found, stack = [], [node]
+        while stack and len(found) < MAX_COMPLETIONS:
+            node = stack.pop()
+            for char, child in node.items():
+                if char:
+                    stack.append(child)
+                else:
+                    found.append(child)
+        return found
+
+    def typos(self, word: str) -> set[str]:
+        """Aliases one typo away from word.
+
+        Two strings one edit apart share a string with at most one character left out of
+        each, so the candidates are a handful of dictionary lookups rather than a scan.
+        """
+        candidates = set(self.deletions.get(word, ()))
+        for deletion in _deletions(word):
+            if deletion in self.aliases:
+                candidates.add(deletion)
+            candidates |= self.deletions.get(deletion, set())
+        return {alias for alias in candidates if len(alias) >= MIN_FUZZY and one_typo_apart(word, alias)}
+
+class EntityIndex:
+    """The entity names in each tenant's graph, resolved from what a caller or an extraction calls them.
+
+    Partitions are loaded from the graph store on first use and kept current by the graph
+    writes themselves (see install_entity_index), so a lookup never leaves the process.
+    A name resolves, best match first, to the node of that exact name, to nodes whose name
+    is the same once case, punctuation and articles are ignored ("The Acme Corp." is
+    acme_corp), to nodes with that word in their name, to names starting with it, and
+    failing all of those to names one typo away from it.
+    """
+
+    def __init__(self):
+        self._partitions: dict[tuple[str, str | None], _Partition] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.resolved = 0
+        self.merged = 0
+
+    @staticmethod
+    def _keys(filters: dict) -> list[tuple[str, str | None]]:
+        # Nodes written for an agent also belong to the user's graph as a whole
+        keys = [(filters["user_id"], None)]
+        if filters.get("agent_id"):
+            keys.append((filters["user_id"], filters["agent_id"]))
+        return keys
+
+    def _partition(self, filters: dict) -> _Partition:
+        return self._partitions.setdefault(self._keys(filters)[-1], _Partition())
+
+    def is_loaded(self, filters: dict) -> bool:
+        with self._lock:
+            partition = self._partitions.get(self._keys(filters)[-1])
+            return partition is not None and partition.loaded
+
+    def load(self, graph, filters: dict):
+        """Read the tenant's entity names from the graph store, unless they were read already."""
+        if self.is_loaded(filters):
+            return
+        names = entity_names(graph, filters)
+        with self._lock:
+            partition = self._partition(filters)
+            for name in names:
+                partition.add(name)
+            partition.loaded = True
+
+    def observe(self, filters: dict, names):
+        """Add the names of nodes a graph write created or matched."""
+        with self._lock:
+            for key in self._keys(filters):
+                partition = self._partitions.setdefault(key, _Partition())
+                for name in names:
+                    if name:
+                        partition.add(name)
+
+    def forget(self, filters: dict):
+        """Drop every partition of the user, after their graph was deleted; it is reloaded on next use."""
+        with self._lock:
+            for key in [key for key in self._partitions if key[0] == filters["user_id"]]:
+                del self._partitions[key]
+
+    def lookup(self, filters: dict, text: str, limit: int = 5) -> list[str]:
+        """The node names text may refer to, best match first."""
+        key = alias_key(text)
+        matches: dict[str, int] = {}
+
+        def found(name, kind):
+            rank = MATCH_KINDS.index(kind)
+            if name not in matches or rank < matches[name]:
+                matches[name] = rank
+
+        with self._lock:
+            self.lookups += 1
+            partition = self._partitions.get(self._keys(filters)[-1])
+            if partition is None or not key:
+                return []
+            if node_name(text) in partition.names:
+                found(node_name(text), "exact")
+            for name, kind in partition.aliases.get(key, {}).items():
+                found(name, kind)
+            if len(matches) < limit and len(key) >= MIN_PREFIX:
+                for alias in partition.completions(key):
+                    for name in partition.aliases[alias]:
+                        found(name, "prefix")
+            if not matches and len(key) >= MIN_FUZZY:
+                for alias in partition.typos(key):
+                    for name in partition.aliases[alias]:
+                        found(name, "fuzzy")
+            if matches:
+                self.resolved += 1
+        return sorted(matches, key=lambda name: (matches[name], len(name), name))[:limit]
+
+    def canonicalize(self, filters: dict, to_be_added: list[dict], entity_type_map: dict) -> tuple[list[dict], dict]:
+        """Point relations about to be written at the existing node of the same entity.
+
+        Only names that are equal once case, punctuation and articles are ignored are merged,
+        and only when exactly one existing node has that name; partial and fuzzy matches are
+        left to mem0's own embedding comparison, since "project_a" and "project_b" are one
+        typo apart.
+        """
+        with self._lock:
+            partition = self._partitions.get(self._keys(filters)[-1])
+            if partition is None:
+                return to_be_added, entity_type_map
+            renamed = {}
+            for item in to_be_added:
+                for field in ("source", "destination"):
+                    name = item[field]
+                    if name in partition.names or name in renamed:
+                        continue
+                    same = [other for other, kind in partition.aliases.get(alias_key(name), {}).items() if kind == "alias"]
+                    if len(same) == 1:
+                        renamed[name] = same[0]
+            self.merged += len(renamed)
+        if not renamed:
+            return to_be_added, entity_type_map
+        to_be_added = [
+            {**item, "source": renamed.get(item["source"], item["source"]),
+             "destination": renamed.get(item["destination"], item["destination"])}
+            for item in to_be_added
+        ]
+        entity_type_map = {**entity_type_map, **{new: entity_type_map[old] for old, new in renamed.items()
+                                                 if old in entity_type_map and new not in entity_type_map}}
+        return to_be_added, entity_type_map
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "partitions": len(self._partitions),
+                "entities": sum(len(partition.names) for partition in self._partitions.values()),
+                "lookups": self.lookups,
+                "resolved": self.resolved,
+                "merged_on_write": self.merged,
+            }
+
+def install_entity_index(memory, index: EntityIndex):
+    """Keep the index current through the graph memory's own writes.
+
+    Every relation mem0 writes, from its LLM extraction or from raw saves, goes through the
+    graph memory's _add_entities, and deleting a user's graph through delete_all; both are
+    replaced on the instance, the way metrics.instrument_component times them.
+    """
+    graph = graph_backend(memory)
+    add_entities, delete_all = graph._add_entities, graph.delete_all
+
+    def indexed_add_entities(to_be_added, filters, entity_type_map):
+        index.load(graph, filters)
+        to_be_added, entity_type_map = index.canonicalize(filters, to_be_added, entity_type_map)
+        added = add_entities(to_be_added, filters, entity_type_map)
+        # Rows name the nodes actually written, which mem0 may have matched to existing ones
+        index.observe(filters, [row.get(key) for rows in added for row in rows for key in ("source", "target")])
+        return added
+
+    def indexed_delete_all(filters):
+        try:
+            return delete_all(filters)
+        finally:
+            index.forget(filters)
+
+    graph._add_entities = indexed_add_entities
+    graph.delete_all = indexed_delete_all
+
+def get_entity_index(memory) -> EntityIndex | None:
+    """Build the entity index for a client with a graph store unless MEM0_ENTITY_INDEX=false."""
+    if graph_backend(memory) is None or os.getenv("MEM0_ENTITY_INDEX", "true").lower() == "false":
+        return None
+    index = EntityIndex()
+    install_entity_index(memory, index)
+    return index
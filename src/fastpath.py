@@ -0,0 +1,111 @@
+import asyncio
+import os
+import re
+
+from mem0.memory.main import _build_filters_and_metadata
+
+from stages import _merged, run_stage
+
+# Words that start a sentence capitalized without naming anything
+NOT_ENTITIES = {
+    "a", "an", "the", "this", "that", "these", "those", "he", "she", "it", "they", "we", "you", "his", "her",
+    "its", "their", "our", "your", "there", "here", "when", "while", "after", "before", "if", "also", "then",
+}
+SELF_REFERENCES = {"i", "me", "my", "mine", "myself"}
+# Words between two entities that join a list rather than relate its members
+CONNECTORS = {"and", "or", "but", "nor", "with"}
+ARTICLES = {"a", "an", "the"}
+MAX_RELATION_WORDS = 4
+TOKEN = re.compile(r"[\w][\w&'.-]*|[^\w\s]")
+
+def infer_by_default() -> bool:
+    """Whether saves run mem0's LLM fact extraction unless a call says otherwise (MEM0_INFER)."""
+    return os.getenv("MEM0_INFER", "true").lower() != "false"
+
+def _node(name: str) -> str:
+    """An entity name the way mem0's graph memory stores it."""
+    return "_".join(name.lower().split())
+
+def _spans(tokens: list[str]) -> list[tuple[int, int, str]]:
+    """(start, end, kind) of every entity in a sentence: runs of capitalized words, or a self-reference."""
+    spans, i = [], 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.lower() in SELF_REFERENCES:
+            spans.append((i, i + 1, "self"))
+            i += 1
+        elif token[0].isupper() and not (i == 0 and token.lower() in NOT_ENTITIES):
+            end = i + 1
+            while end < len(tokens) and tokens[end][0].isupper() and tokens[end].lower() not in SELF_REFERENCES:
+                end += 1
+            spans.append((i, end, "entity"))
+            i = end
+        else:
+            i += 1
+    return spans
+
+def extract_relations(text: str, user_id: str) -> tuple[list[dict], dict]:
+    """Read (source, relationship, destination) triples off text without an LLM.
+
+    A relation is the short run of lowercase words between two neighbouring entities in a
+    sentence, as in "Alice works at Acme" or "I live in Berlin". First-person references
+    stand for the user, as they do in mem0's own extraction. This finds far fewer relations
+    than the LLM does and never removes contradicted ones, which suits facts the agent has
+    already written out plainly. Returns the triples and the entity type of each node.
+    """
+    relations, types = [], {}
+    for sentence in re.split(r"[.!?;\n]+", text):
+        tokens = TOKEN.findall(sentence)
+        spans = _spans(tokens)
+        for source_span, destination_span in zip(spans, spans[1:]):
+            words = [word.lower() for word in tokens[source_span[1]:destination_span[0]]]
+            while words and words[0] in ARTICLES:
+                words.pop(0)
+            while words and words[-1] in ARTICLES:
+                words.pop()
+            if not words or len(words) > MAX_RELATION_WORDS or not all(word.isalpha() for word in words):
+                continue
+            if CONNECTORS & set(words):
+                continue
+            nodes = []
+            for start, end, kind in (source_span, destination_span):
+                if kind == "self":
+                    nodes.append((_node(user_id), "person"))
+                else:
+                    nodes.append((_node(" ".join(tokens[start:end])), "entity"))
+            (source, source_type), (destination, destination_type) = nodes
+            if source == destination:
+                continue
+            relation = {"source": source, "relationship": "_".join(words), "destination": destination}
+            if relation not in relations:
+                relations.append(relation)
+                types.setdefault(source, source_type)
+                types.setdefault(destination, destination_type)
+    return relations, types
+
+async def add_raw(memory, dispatcher, messages: list[dict], scope: dict, graph: bool = True) -> dict:
+    """Store messages verbatim, skipping mem0's LLM fact extraction and update decision.
+
+    Each message is embedded and inserted as one memory, exactly as mem0's add(infer=False)
+    does. When the client has a graph, its relations come from extract_relations instead of
+    the LLM and are merged with the same Cypher mem0 uses. A failed graph write is reported
+    with "partial" set rather than raised, so a retried save never stores the memory twice.
+    Returns a result shaped like Memory.add's.
+    """
+    metadata, filters = _build_filters_and_metadata(input_metadata=None, **scope)
+    vector_write = dispatcher.run("add", memory._add_to_vector_store, messages, metadata, filters, False)
+    if not memory.enable_graph:
+        return {"results": await vector_write}
+
+    relations, errors, added = [], {}, []
+    if graph:
+        text = "\n".join(message["content"] for message in messages if message.get("role") != "system")
+        relations, types = extract_relations(text, filters.get("user_id") or "user")
+        graph_filters = {**filters, "user_id": filters.get("user_id") or "user"}
+    if relations:
+        results, added = await asyncio.gather(vector_write, run_stage(
+            "graph", dispatcher.run("add", memory.graph._add_entities, relations, graph_filters, types), None, errors
+        ))
+    else:
+        results = await vector_write
+    return _merged(results, {"deleted_entities": [], "added_entities": added or []}, errors)
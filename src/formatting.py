@@ -0,0 +1,119 @@
+import json
+import os
+
+from metrics import timed_stage
+
+try:
+    import orjson
+except ImportError:
+    # orjson ships no PyPy wheels; the standard library encoder produces the same compact output
+    orjson = None
+
+RESPONSE_FORMATS = ("compact", "pretty", "lines")
+
+def get_response_settings() -> tuple[str, int]:
+    """Read the response format and the response size cap (0 for none) from the environment."""
+    style = os.getenv("MEM0_RESPONSE_FORMAT", "compact")
+    if style not in RESPONSE_FORMATS:
+        style = "compact"
+    return style, int(os.getenv("MEM0_MAX_RESPONSE_BYTES", "0"))
+
+def encode(data, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON, compact unless pretty is set."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode()
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+def _largest_list(data) -> tuple[str | None, list | None]:
+    """Find the list a response can be shortened by: the response itself or its longest list field."""
+    if isinstance(data, list):
+        return None, data
+    if isinstance(data, dict):
+        lists = [(key, value) for key, value in data.items() if isinstance(value, list)]
+        if lists:
+            return max(lists, key=lambda item: len(item[1]))
+    return None, None
+
+def _shrink(render, count: int, max_bytes: int) -> int:
+    """Binary search the largest number of items whose rendering fits in max_bytes."""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high + 1) // 2
+        if len(render(middle)) <= max_bytes:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def _truncate_json(data, pretty: bool, max_bytes: int) -> bytes:
+    """Cut the longest list so the whole encoded response, notice included, fits in max_bytes.
+
+    A list response stays a list, ending with a {"truncated": ...} item. When not even an
+    empty list fits, only the notice is returned.
+    """
+    key, items = _largest_list(data)
+    if items is None:
+        return encode(data, pretty)
+
+    def notice(count):
+        return {"truncated": {"returned": count, "total": len(items)}}
+
+    def render(count):
+        if key is None:
+            return encode([*items[:count], notice(count)], pretty)
+        return encode({**data, key: items[:count], **notice(count)}, pretty)
+
+    count = _shrink(render, len(items), max_bytes)
+    output = render(count)
+    if len(output) > max_bytes:
+        output = encode([notice(0)] if key is None else notice(0), pretty)
+    return output
+
+def _truncate_lines(lines: list[str], max_bytes: int) -> bytes:
+    def render(count):
+        notice = f"[truncated: {count} of {len(lines)} shown]"
+        return "\n".join([*lines[:count], notice] if count < len(lines) else lines).encode()
+
+    return render(_shrink(render, len(lines), max_bytes))
+
+@timed_stage("serialize")
+def format_response(data, lines=None) -> str:
+    """Encode a tool response in the configured format, within the configured size cap.
+
+    Args:
+        data: The JSON-serializable response
+        lines: Optional function turning data into a list of text lines, used when
+            MEM0_RESPONSE_FORMAT=lines. Tools without one answer with compact JSON.
+
+    Oversized responses are cut at item boundaries of their longest list and say so:
+    JSON responses get a "truncated" object with the returned and total counts (as the
+    last item of a list response), and line responses end with a "[truncated: ...]" line.
+    """
+    style, max_bytes = get_response_settings()
+    if style == "lines" and lines is not None:
+        rendered = lines(data)
+        output = "\n".join(rendered).encode()
+        if max_bytes and len(output) > max_bytes:
+            output = _truncate_lines(rendered, max_bytes)
+        return output.decode()
+
+    pretty = style == "pretty"
+    output = encode(data, pretty)
+    if max_bytes and len(output) > max_bytes:
+        output = _truncate_json(data, pretty, max_bytes)
+    return output.decode()
+
+def memory_lines(memories: list) -> list[str]:
+    """One memory per line, for search_memories."""
+    return [str(memory).replace("\n", " ") for memory in memories]
+
+def relationship_lines(response: dict) -> list[str]:
+    """One "source -[relationship]-> target" per line for find_relationships, or the related memories."""
+    if "relationships" in response:
+        return [
+            f"{relation['source']} -[{relation['relationship']}]-> {relation['target']}"
+            for relation in response["relationships"]
+        ]
+    return memory_lines(response.get("related_memories", []))
@@ -0,0 +1,78 @@
+MAX_DEPTH = 3
+MAX_LIMIT = 500
+
+def graph_backend(memory):
+    """The synchronous graph memory of a client, or None when it has no graph store.
+
+    The async client reaches mem0's graph memory through a ThreadedAdapter; queries here
+    go to the graph memory itself and are run through the dispatcher by the caller.
+    """
+    if not getattr(memory, "enable_graph", False):
+        return None
+    return getattr(memory.graph, "backend", memory.graph)
+
+def node_name(entity: str) -> str:
+    """An entity or relationship name the way mem0's graph memory stores it."""
+    return "_".join(entity.lower().split())
+
+def relationship_query(node_label: str, depth: int, agent_scoped: bool) -> str:
+    """Cypher for every relationship within `depth` hops of one entity, nearest first.
+
+    The start node is found by name and user_id, which mem0 indexes when the graph uses
+    its base label (NEO4J_BASE_LABEL=true). Every node on a path must belong to the same
+    user (and agent), so a traversal never leaves the tenant's part of the graph. Each
+    relationship is returned once, with the fewest hops it was reached in.
+    """
+    owner = "n.user_id = $user_id" + (" AND n.agent_id = $agent_id" if agent_scoped else "")
+    start = "{name: $name, user_id: $user_id" + (", agent_id: $agent_id" if agent_scoped else "") + "}"
+    return f"""
+    MATCH (start {node_label} {start})
+    MATCH path = (start)-[rels*1..{depth}]-(other {node_label})
+    WHERE all(r IN rels WHERE size($types) = 0 OR type(r) IN $types)
+      AND all(n IN nodes(path) WHERE {owner})
+    UNWIND range(0, size(rels) - 1) AS i
+    WITH rels[i] AS r, min(i + 1) AS hops
+    RETURN startNode(r).name AS source, type(r) AS relationship, endNode(r).name AS target, hops
+    ORDER BY hops, source, relationship, target
+    LIMIT $limit
+    """
+
+def find_related(graph, entity: str, filters: dict, depth: int = 1, limit: int = 50,
+                 relationship_types: list[str] | None = None) -> tuple[list[dict], bool]:
+    """Relationships within `depth` hops of an entity, in one graph round trip.
+
+    Returns up to `limit` relationships as dicts with source, relationship, target and
+    hops, and whether more were left out.
+    """
+    if not 1 <= depth <= MAX_DEPTH:
+        raise ValueError(f"depth must be between 1 and {MAX_DEPTH}")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    name = node_name(entity)
+    types = [node_name(relationship) for relationship in relationship_types or []]
+    if hasattr(graph, "traverse"):
+        # In-process graphs (the fakes behind the tests and benchmarks) walk themselves
+        rows = graph.traverse(name, filters, depth, limit + 1, types)
+    else:
+        agent_id = filters.get("agent_id")
+        params = {"name": name, "user_id": filters["user_id"], "types": types, "limit": limit + 1}
+        if agent_id:
+            params["agent_id"] = agent_id
+        rows = graph.graph.query(relationship_query(graph.node_label, depth, bool(agent_id)), params=params)
+    relationships = [
+        {"source": row["source"], "relationship": row["relationship"], "target": row["target"], "hops": row["hops"]}
+        for row in rows
+    ]
+    return relationships[:limit], len(relationships) > limit
+
+def entity_names(graph, filters: dict) -> list[str]:
+    """The name of every node of a user (and agent) in the graph, in one query."""
+    if hasattr(graph, "entity_names"):
+        return graph.entity_names(filters)
+    params = {"user_id": filters["user_id"]}
+    owner = "n.user_id = $user_id"
+    if filters.get("agent_id"):
+        params["agent_id"] = filters["agent_id"]
+        owner += " AND n.agent_id = $agent_id"
+    rows = graph.graph.query(f"MATCH (n {graph.node_label}) WHERE {owner} RETURN DISTINCT n.name AS name", params=params)
+    return [row["name"] for row in rows if row.get("name")]
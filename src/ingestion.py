@@ -0,0 +1,280 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ("pending", "running", "done", "failed")
+
+class IngestionQueue:
+    """Durable write-behind queue for save_memory and save_conversation.
+
+    Jobs are appended to a local SQLite database before the tool returns, then drained by
+    a pool of asyncio workers that run the actual Mem0 add. Failed jobs are retried with
+    exponential backoff. Jobs left 'running' by a crash are put back to 'pending' when the
+    queue starts, so nothing accepted by a tool is lost. The workers reach SQLite through
+    asyncio.to_thread, so a slow or locked database never stalls the event loop.
+
+    A retry runs the whole add again. With fact extraction that is safe: mem0 compares the
+    facts with what the failed attempt already stored and skips them. A raw save fails only
+    when its single vector insert does, so its retry cannot store the memory twice.
+    """
+
+    def __init__(self, path: str, workers: int = 4, max_attempts: int = 5, retry_delay: float = 2.0,
+                 retention_hours: float = 24.0, prune_interval: float = 3600.0):
+        self.path = path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.retention_hours = retention_hours
+        self.prune_interval = prune_interval
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                result TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                next_attempt_at REAL NOT NULL
+            )
+        """)
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ingestion_jobs_ready ON ingestion_jobs (status, next_attempt_at)"
+        )
+        self._lock = threading.Lock()
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+
+    def enqueue(self, kind: str, payload: dict) -> str:
+        """Persist a job and return its ID. The job is durable once this returns."""
+        return self.enqueue_many(kind, [payload])[0]
+
+    def enqueue_many(self, kind: str, payloads: list[dict]) -> list[str]:
+        """Persist several jobs in one transaction and return their IDs, in order."""
+        job_ids = [str(uuid.uuid4()) for _ in payloads]
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT INTO ingestion_jobs (id, kind, payload, status, created_at, updated_at, next_attempt_at) "
+                    "VALUES (?, ?, ?, 'pending', ?, ?, ?)",
+                    [(job_id, kind, json.dumps(payload), now, now, now) for job_id, payload in zip(job_ids, payloads)],
+                )
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        wakeup, loop = self._wakeup, self._loop
+        if wakeup is not None:
+            # Called through asyncio.to_thread, so the event is set from the loop's own thread
+            loop.call_soon_threadsafe(wakeup.set)
+        return job_ids
+
+    def status(self, job_id: str) -> dict | None:
+        """Return the state of a single job, or None if the ID is unknown."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, kind, status, attempts, last_error, result, created_at, updated_at "
+                "FROM ingestion_jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "attempts": row[3],
+            "last_error": row[4],
+            "result": json.loads(row[5]) if row[5] else None,
+            "created_at": row[6],
+            "updated_at": row[7],
+        }
+
+    def summary(self) -> dict:
+        """Return the number of jobs in each state."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM ingestion_jobs GROUP BY status"
+            ).fetchall()
+        counts = {state: 0 for state in JOB_STATES}
+        counts.update(dict(rows))
+        return counts
+
+    def replay(self) -> int:
+        """Put jobs interrupted by a crash back in the queue. Returns how many were recovered."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE ingestion_jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def prune(self) -> int:
+        """Delete done and failed jobs older than the retention window."""
+        cutoff = time.time() - self.retention_hours * 3600
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM ingestion_jobs WHERE status IN ('done', 'failed') AND updated_at < ?", (cutoff,)
+            )
+        return cursor.rowcount
+
+    def _claim(self) -> tuple[str, str, dict, int] | None:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "UPDATE ingestion_jobs SET status = 'running', attempts = attempts + 1, updated_at = ? "
+                "WHERE id = (SELECT id FROM ingestion_jobs WHERE status = 'pending' AND next_attempt_at <= ? "
+                "ORDER BY created_at LIMIT 1) "
+                "RETURNING id, kind, payload, attempts",
+                (now, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2]), row[3]
+
+    def _complete(self, job_id: str, result):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE ingestion_jobs SET status = 'done', result = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result, default=str), time.time(), job_id),
+            )
+
+    def _fail(self, job_id: str, attempts: int, error: Exception) -> str:
+        """Record a failed attempt and return the job's new status: pending to retry, or failed for good."""
+        now = time.time()
+        if attempts >= self.max_attempts:
+            status, next_attempt_at = "failed", now
+        else:
+            status, next_attempt_at = "pending", now + self.retry_delay * 2 ** (attempts - 1)
+        with self._lock:
+            self._connection.execute(
+                "UPDATE ingestion_jobs SET status = ?, last_error = ?, updated_at = ?, next_attempt_at = ? WHERE id = ?",
+                (status, str(error), now, next_attempt_at, job_id),
+            )
+        return status
+
+    def _next_retry_in(self) -> float | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MIN(next_attempt_at) FROM ingestion_jobs WHERE status = 'pending'"
+            ).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    async def start(self, handler, on_failed=None):
+        """Recover interrupted jobs and start the workers.
+
+        Args:
+            handler: Coroutine function called as handler(kind, payload) for each job.
+                Its return value is stored as the job result; raising marks the attempt failed.
+            on_failed: Optional function called as on_failed(kind, payload) once a job has
+                failed its last attempt and will not be retried.
+        """
+        recovered = await asyncio.to_thread(self.replay)
+        if recovered:
+            logger.info(f"Replaying {recovered} ingestion jobs interrupted by a previous shutdown")
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._worker(handler, on_failed)) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._pruner()))
+
+    async def _pruner(self):
+        while not self._stopping:
+            try:
+                pruned = await asyncio.to_thread(self.prune)
+                if pruned:
+                    logger.info(f"Pruned {pruned} finished ingestion jobs")
+            except Exception as e:
+                logger.warning(f"Error pruning ingestion jobs: {e}")
+            await asyncio.sleep(self.prune_interval)
+
+    async def _record(self, write, *args):
+        """Run a job state write until it succeeds, backing off while the database is unavailable."""
+        delay = self.retry_delay
+        while True:
+            try:
+                return await asyncio.to_thread(write, *args)
+            except Exception as e:
+                logger.error(f"Error recording ingestion job state, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+
+    async def _worker(self, handler, on_failed=None):
+        delay = self.retry_delay
+        # stop() also sets this: asyncio.wait_for can swallow the cancellation of an idle worker
+        while not self._stopping:
+            try:
+                job = await asyncio.to_thread(self._claim)
+                next_retry_in = None if job else await asyncio.to_thread(self._next_retry_in)
+                delay = self.retry_delay
+            except Exception as e:
+                logger.error(f"Error reading the ingestion queue, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+                continue
+            if job is None:
+                self._wakeup.clear()
+                # Sleep until a new job arrives or the earliest retry becomes due
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=60.0 if next_retry_in is None else max(next_retry_in, 0.05)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, kind, payload, attempts = job
+            try:
+                result = await handler(kind, payload)
+            except asyncio.CancelledError:
+                # Left as 'running' on purpose so the job is replayed on the next start
+                raise
+            except Exception as e:
+                logger.warning(f"Ingestion job {job_id} failed on attempt {attempts}: {e}")
+                if await self._record(self._fail, job_id, attempts, e) == "failed" and on_failed:
+                    on_failed(kind, payload)
+                continue
+            await self._record(self._complete, job_id, result)
+
+    async def stop(self):
+        """Stop the workers. Jobs still running are replayed on the next start."""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks, self._wakeup = [], None
+        with self._lock:
+            self._connection.close()
+
+def get_ingestion_queue() -> IngestionQueue | None:
+    """Build the ingestion queue when MEM0_INGEST_MODE=async, otherwise return None."""
+    if os.getenv("MEM0_INGEST_MODE", "sync") != "async":
+        return None
+    mem0_dir = os.getenv("MEM0_DIR") or os.path.join(os.path.expanduser("~"), ".mem0")
+    return IngestionQueue(
+        path=os.getenv("MEM0_INGEST_DB") or os.path.join(mem0_dir, "mcp_ingestion.db"),
+        workers=int(os.getenv("MEM0_INGEST_WORKERS", "4")),
+        max_attempts=int(os.getenv("MEM0_INGEST_MAX_ATTEMPTS", "5")),
+        retry_delay=float(os.getenv("MEM0_INGEST_RETRY_DELAY", "2.0")),
+        retention_hours=float(os.getenv("MEM0_INGEST_RETENTION_HOURS", "24")),
+    )
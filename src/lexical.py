@@ -0,0 +1,302 @@
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from batch import points_getter
+from pagination import iter_memories
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("vector", "hybrid", "lexical", "auto")
+# Reciprocal rank fusion constant; 60 is the value from the original RRF paper and what most engines use
+RRF_K = 60
+TERM = re.compile(r"[^\W_]+")
+# Ticket numbers, hostnames, paths, versions and code names: a word mixing letters with digits or
+# joined by - _ . / :, or written in camelCase
+IDENTIFIER = re.compile(r"\w*\d\w*|\w+(?:[-_./:]\w+)+|[a-z]+[A-Z]\w*")
+
+def looks_like_identifier(query: str) -> bool:
+    """Whether a query is a few words that are mostly identifiers, which embeddings match poorly."""
+    words = query.split()
+    return 0 < len(words) <= 3 and all(IDENTIFIER.fullmatch(word.strip("\"'`?,")) for word in words)
+
+def match_expression(query: str) -> str:
+    """An FTS5 query matching any word of the query, each word's parts as one phrase.
+
+    "JIRA-1234 deploy" becomes "jira 1234" OR "deploy", so an identifier only matches
+    where its parts appear together, in order.
+    """
+    phrases = []
+    for word in query.split():
+        terms = TERM.findall(word.casefold())
+        if terms:
+            phrases.append('"' + " ".join(terms) + '"')
+    return " OR ".join(dict.fromkeys(phrases))
+
+class LexicalIndex:
+    """BM25 index of memory texts in a local SQLite FTS5 table, kept in step with the vector store.
+
+    Rows are written by the vector store's own insert, update and delete (see
+    install_lexical_index), so every save, update and delete this process makes reaches
+    both. Writes made elsewhere (another replica, mem0 used directly, or this server with
+    the index off) do not: a user's memories are read from the vector store again, in the
+    background, on their first lexical search every `refresh` seconds (see start_backfill),
+    and every hit is checked against the vector store before it is returned (see verify).
+    """
+
+    def __init__(self, path: str, refresh: float = 3600.0):
+        self.path = path
+        self.refresh = refresh
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS lexical_memories (
+                rowid INTEGER PRIMARY KEY,
+                memory_id TEXT NOT NULL UNIQUE,
+                user_id TEXT,
+                agent_id TEXT,
+                run_id TEXT
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS lexical_memories_user ON lexical_memories (user_id)")
+        # unicode61 splits "JIRA-1234" into jira and 1234; match_expression puts them back together as a phrase
+        self._connection.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS lexical_text USING fts5(text, tokenize='unicode61 remove_diacritics 2')"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS lexical_synced (user_id TEXT PRIMARY KEY, synced_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        # Running backfills by user, so concurrent searches of one user share a single one
+        self._backfills: dict[str, asyncio.Task] = {}
+
+    def upsert(self, memory_id: str, text: str, payload: dict):
+        self.upsert_many([(memory_id, text, payload)])
+
+    def upsert_many(self, items: list[tuple[str, str, dict]]):
+        """Index several (memory_id, text, payload) triples in one transaction."""
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                for memory_id, text, payload in items:
+                    self._delete(memory_id)
+                    cursor = self._connection.execute(
+                        "INSERT INTO lexical_memories (memory_id, user_id, agent_id, run_id) VALUES (?, ?, ?, ?)",
+                        (memory_id, payload.get("user_id"), payload.get("agent_id"), payload.get("run_id")),
+                    )
+                    self._connection.execute(
+                        "INSERT INTO lexical_text (rowid, text) VALUES (?, ?)", (cursor.lastrowid, text)
+                    )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def _delete(self, memory_id: str):
+        row = self._connection.execute("SELECT rowid FROM lexical_memories WHERE memory_id = ?", (memory_id,)).fetchone()
+        if row:
+            self._connection.execute("DELETE FROM lexical_text WHERE rowid = ?", row)
+            self._connection.execute("DELETE FROM lexical_memories WHERE rowid = ?", row)
+
+    def delete(self, memory_id: str):
+        with self._lock:
+            self._delete(memory_id)
+
+    def synced_at(self, user_id: str) -> float | None:
+        """When the user's memories were last read from the vector store, or None if they never were."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT synced_at FROM lexical_synced WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_backfilled(self, user_id: str) -> bool:
+        """Whether the user's memories were read from the vector store within the last `refresh` seconds."""
+        synced_at = self.synced_at(user_id)
+        return synced_at is not None and time.time() - synced_at < self.refresh
+
+    def mark_backfilled(self, user_id: str, synced_at: float | None = None):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO lexical_synced (user_id, synced_at) VALUES (?, ?)",
+                (user_id, synced_at or time.time()),
+            )
+
+    def search(self, query: str, scope: dict, limit: int) -> list[dict]:
+        """The tenant's memories matching the query, best BM25 score first, formatted like search results."""
+        expression = match_expression(query)
+        if not expression:
+            return []
+        conditions = [f"m.{key} = ?" for key in ("user_id", "agent_id", "run_id") if scope.get(key)]
+        values = [scope[key] for key in ("user_id", "agent_id", "run_id") if scope.get(key)]
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT m.memory_id, t.text, bm25(lexical_text) AS rank FROM lexical_text t "
+                "JOIN lexical_memories m ON m.rowid = t.rowid "
+                f"WHERE lexical_text MATCH ? AND {' AND '.join(conditions)} ORDER BY rank LIMIT ?",
+                (expression, *values, limit),
+            ).fetchall()
+        # FTS5's bm25() is negative, lower being better; flip it so higher scores are better as in vector results
+        return [{"id": memory_id, "memory": text, "score": -rank} for memory_id, text, rank in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            indexed = self._connection.execute("SELECT COUNT(*) FROM lexical_memories").fetchone()[0]
+        return {"path": self.path, "indexed_memories": indexed}
+
+    def close(self):
+        for task in self._backfills.values():
+            task.cancel()
+        with self._lock:
+            self._connection.close()
+
+def reciprocal_rank_fusion(rankings: list[list[dict]], limit: int, k: int = RRF_K) -> list[dict]:
+    """Merge ranked result lists by summing 1 / (k + rank) per memory, so neither list's scores need calibrating."""
+    fused, scores = {}, {}
+    for ranking in rankings:
+        for rank, memory in enumerate(ranking, start=1):
+            fused.setdefault(memory["id"], memory)
+            scores[memory["id"]] = scores.get(memory["id"], 0.0) + 1 / (k + rank)
+    ordered = sorted(fused, key=lambda memory_id: -scores[memory_id])[:limit]
+    return [{**fused[memory_id], "score": round(scores[memory_id], 6)} for memory_id in ordered]
+
+async def backfill(index: LexicalIndex, memory, dispatcher, user_id: str, page_size: int = 500):
+    """Index the memories of a user written without going through this index, a page per transaction."""
+    fields = ("id", "memory", "user_id", "agent_id", "run_id")
+    started, count, page = time.time(), 0, []
+    async for item in iter_memories(memory, dispatcher, {"user_id": user_id}, page_size=page_size, fields=fields):
+        page.append((item["id"], item["memory"], item))
+        if len(page) == page_size:
+            await dispatcher.run("lexical", index.upsert_many, page)
+            count, page = count + len(page), []
+    if page:
+        await dispatcher.run("lexical", index.upsert_many, page)
+        count += len(page)
+    # Writes landing while the store was read are in the index already; elsewhere, the next refresh gets them
+    await dispatcher.run("lexical", index.mark_backfilled, user_id, started)
+    logger.info(f"Indexed {count} existing memories of {user_id} for lexical search")
+
+async def start_backfill(index: LexicalIndex, memory, dispatcher, user_id: str) -> bool:
+    """Start reading the user's memories into the index in the background, when they are due.
+
+    At most one backfill runs per user. Returns whether the index holds the user's memories
+    at all yet, i.e. whether a lexical search can be answered before the backfill finishes.
+    """
+    synced_at = await dispatcher.run("lexical", index.synced_at, user_id)
+    if synced_at is not None and time.time() - synced_at < index.refresh:
+        return True
+    if user_id not in index._backfills:
+        task = asyncio.create_task(backfill(index, memory, dispatcher, user_id))
+        index._backfills[user_id] = task
+
+        def finished(task):
+            index._backfills.pop(user_id, None)
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(f"Error indexing the memories of {user_id} for lexical search: {task.exception()}")
+
+        task.add_done_callback(finished)
+    return synced_at is not None
+
+async def wait_for_backfill(index: LexicalIndex, user_id: str):
+    """Wait for the user's running backfill, if any, to finish."""
+    task = index._backfills.get(user_id)
+    if task is not None:
+        await asyncio.gather(task, return_exceptions=True)
+
+async def verify(index: LexicalIndex, memory, dispatcher, results: list[dict]) -> list[dict]:
+    """The lexical hits whose memory is still in the vector store, with its current text.
+
+    One bulk fetch per search. Hits deleted elsewhere are dropped from the results and the
+    index, and texts updated elsewhere are re-indexed.
+    """
+    if not results:
+        return results
+    records = await dispatcher.run("lexical", points_getter(memory), [result["id"] for result in results])
+    payloads = {str(record.id): record.payload or {} for record in records}
+    verified = []
+    for result in results:
+        payload = payloads.get(result["id"])
+        if payload is None:
+            await dispatcher.run("lexical", index.delete, result["id"])
+        elif payload.get("data") and payload["data"] != result["memory"]:
+            await dispatcher.run("lexical", index.upsert, result["id"], payload["data"], payload)
+            verified.append({**result, "memory": payload["data"]})
+        else:
+            verified.append(result)
+    return verified
+
+def _after(method, record):
+    """Wrap a vector store method so record(*args, **kwargs) runs once it succeeded.
+
+    For an async store, record's SQLite writes run on a thread rather than the event loop.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            result = await method(*args, **kwargs)
+            await asyncio.to_thread(record, *args, **kwargs)
+            return result
+    else:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            result = method(*args, **kwargs)
+            record(*args, **kwargs)
+            return result
+    return wrapper
+
+def install_lexical_index(memory, index: LexicalIndex):
+    """Mirror the vector store's writes into the index by replacing them on the instance.
+
+    Stores run through a ThreadedAdapter (or the fakes' AsyncFake) are wrapped on the
+    synchronous backend, the way metrics.install_metrics times them.
+    """
+    store = memory.vector_store
+    store = getattr(store, "backend", store)
+
+    def inserted(vectors, payloads=None, ids=None):
+        for memory_id, payload in zip(ids or [], payloads or []):
+            if payload.get("data"):
+                index.upsert(memory_id, payload["data"], payload)
+
+    def updated(vector_id, vector=None, payload=None):
+        if payload and payload.get("data"):
+            index.upsert(vector_id, payload["data"], payload)
+
+    def deleted(vector_id):
+        index.delete(vector_id)
+
+    def deleted_many(vector_ids):
+        for vector_id in vector_ids:
+            index.delete(vector_id)
+
+    for name, record in (("insert", inserted), ("update", updated), ("delete", deleted), ("delete_many", deleted_many)):
+        method = getattr(store, name, None)
+        if callable(method):
+            setattr(store, name, _after(method, record))
+
+def default_search_mode() -> str:
+    mode = os.getenv("MEM0_SEARCH_MODE", "vector").lower()
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"MEM0_SEARCH_MODE must be one of {', '.join(SEARCH_MODES)}")
+    return mode
+
+def get_lexical_index(memory) -> LexicalIndex | None:
+    """Build and install the lexical index unless MEM0_LEXICAL_INDEX=false."""
+    if os.getenv("MEM0_LEXICAL_INDEX", "true").lower() == "false":
+        return None
+    mem0_dir = os.getenv("MEM0_DIR") or os.path.join(os.path.expanduser("~"), ".mem0")
+    index = LexicalIndex(
+        os.getenv("MEM0_LEXICAL_DB") or os.path.join(mem0_dir, "mcp_lexical.db"),
+        refresh=float(os.getenv("MEM0_LEXICAL_REFRESH", "3600")),
+    )
+    install_lexical_index(memory, index)
+    return index
@@ -0,0 +1,630 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+
+import numpy as np
+
+from quantization import QUANTIZERS, approximate_scores, load_quantizer
+
+logger = logging.getLogger(__name__)
+
+# Payload keys mem0 filters on for every call; kept as per-slot integer codes so filtering is a vector compare
+INDEXED_KEYS = ("user_id", "agent_id", "run_id")
+CHUNK_ROWS = 16384
+MIN_CAPACITY = 1024
+
+@dataclass
+class LocalRecord:
+    id: str
+    score: float | None
+    payload: dict
+
+def _normalize(vectors) -> np.ndarray:
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    return array / np.where(norms == 0, 1, norms)
+
+class IVFIndex:
+    """Inverted file index: k-means centroids over the unit vectors, each point assigned to its nearest one.
+
+    A search only scores the points in the `nprobe` clusters closest to the query.
+    """
+
+    def __init__(self, centroids: np.ndarray, nprobe: int):
+        self.centroids = centroids
+        self.nprobe = nprobe
+
+    @classmethod
+    def train(cls, sample: np.ndarray, nlist: int, nprobe: int, iterations: int = 10, seed: int = 0) -> "IVFIndex":
+        """Spherical k-means on a sample of the stored vectors."""
+        rng = np.random.default_rng(seed)
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            # Clusters that lost every member keep their previous centroid
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        return cls(centroids, nprobe)
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(np.asarray(vectors, dtype=np.float32) @ self.centroids.T, axis=1).astype(np.int32)
+
+    def probe(self, query: np.ndarray) -> np.ndarray:
+        scores = self.centroids @ query
+        return np.argpartition(-scores, min(self.nprobe, len(scores)) - 1)[:self.nprobe]
+
+class LocalVectorStore:
+    """In-process vector store with the mem0 vector store interface, for VECTOR_STORE_PROVIDER=local.
+
+    Unit-normalized embeddings live in a memory-mapped float32 (or float16) matrix, one row
+    per slot, and ids and payloads in a SQLite table that maps each id to its slot. Search is
+    an exact cosine scan, or an IVF index once the collection reaches `ivf_min_points`.
+
+    With `quantization` set to int8, binary or pq, a compact code per point is kept next to
+    the full vectors once the collection reaches `quantize_min_points`. Searches score the
+    codes, then re-rank the best `limit * rerank` candidates with their full-precision vectors,
+    so only the codes need to stay in RAM.
+
+    SQLite is the source of truth: a vector is written and flushed to a free slot before the
+    row pointing at it commits, and updates never overwrite a live row in place. After a crash
+    every committed point still has its vector, and any half-written slot is simply unused.
+
+    Searches score outside the lock. Each slot has a generation, bumped when it is freed, so
+    a search drops any slot that was freed or reused while it was being scored. Once inserts
+    grow the collection enough to need a new IVF index or quantizer, it is trained in a
+    background thread and swapped in when ready; searches use the old index and codes, or a
+    flat scan, until then.
+    """
+
+    def __init__(self, path: str, collection_name: str = "mem0", embedding_model_dims: int = 1536,
+                 dtype: str = "float32", index: str = "auto", ivf_min_points: int = 20000, nprobe: int = 8,
+                 quantization: str = "none", rerank: int = 10, quantize_min_points: int = 1000):
+        self.path = path
+        self.collection_name = collection_name
+        self.embedding_model_dims = embedding_model_dims
+        self.dtype = np.dtype(dtype)
+        self.index = index
+        self.ivf_min_points = ivf_min_points
+        self.nprobe = nprobe
+        if quantization != "none" and quantization not in QUANTIZERS:
+            raise ValueError(f"Unknown quantization {quantization}, expected none, int8, binary or pq")
+        self.quantization = quantization
+        self.rerank = max(1, rerank)
+        self.quantize_min_points = quantize_min_points
+        self._lock = threading.RLock()
+        self._training: threading.Thread | None = None
+        self._quantizing: threading.Thread | None = None
+        self.create_col(collection_name, embedding_model_dims)
+
+    # Storage
+
+    def _file(self, suffix: str) -> str:
+        return os.path.join(self.path, f"{self.collection_name}.{suffix}")
+
+    def create_col(self, name: str, vector_size: int = None, distance: str = "cosine"):
+        """Open (creating if needed) the files of a collection and load its slot metadata."""
+        os.makedirs(self.path, exist_ok=True)
+        self.collection_name = name
+        self.embedding_model_dims = vector_size or self.embedding_model_dims
+        self._connection = sqlite3.connect(self._file("db"), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS points (
+                id TEXT PRIMARY KEY,
+                slot INTEGER NOT NULL UNIQUE,
+                cluster INTEGER NOT NULL DEFAULT -1,
+                user_id TEXT,
+                agent_id TEXT,
+                run_id TEXT,
+                payload TEXT NOT NULL
+            )
+        """)
+        self._check_meta()
+
+        rows = self._connection.execute("SELECT slot, cluster, user_id, agent_id, run_id FROM points").fetchall()
+        self._high = max((row[0] for row in rows), default=-1) + 1
+        self._codes: dict[str, dict[str, int]] = {key: {} for key in INDEXED_KEYS}
+        self._vectors = None
+        self._quantizer = None
+        self._quantized = None
+        self._capacity = 0
+        self._live = None
+        self._cluster = None
+        self._generation = None
+        self._owner = {key: None for key in INDEXED_KEYS}
+        self._ensure_capacity(self._high)
+        used = np.zeros(self._high, dtype=bool)
+        for slot, cluster, *owners in rows:
+            used[slot] = True
+            self._live[slot] = True
+            self._cluster[slot] = cluster
+            for key, value in zip(INDEXED_KEYS, owners):
+                self._owner[key][slot] = self._code(key, value)
+        self._free = list(np.flatnonzero(~used)[::-1])
+
+        self._ivf = None
+        self._trained_points = 0
+        if os.path.exists(self._file("centroids.npy")):
+            self._ivf = IVFIndex(np.load(self._file("centroids.npy")), self.nprobe)
+            self._trained_points = int(self._meta("trained_points") or 0)
+        self._load_quantizer()
+        self._maybe_train()
+        self._maybe_quantize()
+
+    @contextmanager
+    def _transaction(self):
+        # The connection is in autocommit mode, so batches need an explicit transaction to commit once
+        self._connection.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def _meta(self, key: str) -> str | None:
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value):
+        self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _check_meta(self):
+        dims, dtype = self._meta("dims"), self._meta("dtype")
+        if dims is None:
+            self._set_meta("dims", self.embedding_model_dims)
+            self._set_meta("dtype", self.dtype.name)
+        elif int(dims) != self.embedding_model_dims or dtype != self.dtype.name:
+            raise ValueError(
+                f"Local vector store {self._file('db')} holds {dims}-dim {dtype} vectors, "
+                f"but {self.embedding_model_dims}-dim {self.dtype.name} was configured"
+            )
+
+    def _code(self, key: str, value) -> int:
+        if value is None:
+            return -1
+        return self._codes[key].setdefault(str(value), len(self._codes[key]))
+
+    def _ensure_capacity(self, needed: int):
+        """Grow the vector file and the per-slot arrays (doubling) so `needed` slots fit."""
+        if needed <= self._capacity and self._vectors is not None:
+            return
+        capacity = max(MIN_CAPACITY, self._capacity)
+        while capacity < needed:
+            capacity *= 2
+        size = capacity * self.embedding_model_dims * self.dtype.itemsize
+        with open(self._file("vectors"), "ab") as handle:
+            if handle.tell() < size:
+                handle.truncate(size)
+        self._vectors = np.memmap(self._file("vectors"), dtype=self.dtype, mode="r+",
+                                  shape=(capacity, self.embedding_model_dims))
+        if self._quantizer is not None:
+            self._quantized = self._open_codes(self._file("codes"), self._quantizer, capacity)
+
+        def grow(array, fill, dtype):
+            grown = np.full(capacity, fill, dtype=dtype)
+            if array is not None:
+                grown[:len(array)] = array
+            return grown
+
+        self._live = grow(self._live, False, bool)
+        self._cluster = grow(self._cluster, -1, np.int32)
+        self._generation = grow(self._generation, 0, np.uint32)
+        self._owner = {key: grow(self._owner[key], -1, np.int32) for key in INDEXED_KEYS}
+        self._capacity = capacity
+
+    @staticmethod
+    def _open_codes(path: str, quantizer, capacity: int) -> np.memmap:
+        size = capacity * quantizer.code_width * np.dtype(quantizer.code_dtype).itemsize
+        with open(path, "ab") as handle:
+            if handle.tell() < size:
+                handle.truncate(size)
+        return np.memmap(path, dtype=quantizer.code_dtype, mode="r+", shape=(capacity, quantizer.code_width))
+
+    def _allocate(self) -> int:
+        if self._free:
+            return int(self._free.pop())
+        self._high += 1
+        return self._high - 1
+
+    # Index
+
+    def _maybe_train(self, background: bool = False):
+        """Train (or retrain, once the collection doubled since) the IVF index when it is enabled."""
+        live = int(self._live[:self._high].sum())
+        if self.index == "flat" or (self.index == "auto" and live < self.ivf_min_points):
+            return
+        if self._ivf is not None and live < 2 * self._trained_points:
+            return
+        if live < 2 or (self._training is not None and self._training.is_alive()):
+            return
+        if not background:
+            self._train()
+            return
+        self._training = threading.Thread(target=self._train, name=f"ivf-{self.collection_name}", daemon=True)
+        self._training.start()
+
+    def _train(self):
+        """Train an IVF index over the live slots and assign every slot to a cluster.
+
+        k-means and the bulk assignment run without the lock, on a snapshot of the slots and
+        their generations; slots inserted or freed meanwhile are assigned under the lock.
+        """
+        try:
+            with self._lock:
+                connection, stored = self._connection, self._vectors
+                slots = np.flatnonzero(self._live[:self._high])
+                generations = self._generation[slots]
+                rng = np.random.default_rng(0)
+                sample = np.asarray(stored[np.sort(rng.choice(slots, size=min(len(slots), 50000), replace=False))],
+                                    dtype=np.float32)
+            nlist = max(1, min(len(sample) // 4, int(np.sqrt(len(slots)))))
+            ivf = IVFIndex.train(sample, nlist, self.nprobe)
+            clusters = np.empty(len(slots), dtype=np.int32)
+            for start in range(0, len(slots), CHUNK_ROWS):
+                clusters[start:start + CHUNK_ROWS] = ivf.assign(stored[slots[start:start + CHUNK_ROWS]])
+
+            with self._lock:
+                if self._connection is not connection:
+                    return
+                unchanged = self._live[slots] & (self._generation[slots] == generations)
+                self._cluster[slots[unchanged]] = clusters[unchanged]
+                assigned = np.zeros(self._high, dtype=bool)
+                assigned[slots[unchanged]] = True
+                changed = np.flatnonzero(self._live[:self._high] & ~assigned)
+                if len(changed):
+                    self._cluster[changed] = ivf.assign(self._vectors[changed])
+                live = np.flatnonzero(self._live[:self._high])
+                with self._transaction():
+                    self._connection.executemany(
+                        "UPDATE points SET cluster = ? WHERE slot = ?",
+                        ((int(self._cluster[slot]), int(slot)) for slot in live),
+                    )
+                    self._set_meta("trained_points", len(live))
+                np.save(self._file("centroids.tmp.npy"), ivf.centroids)
+                os.replace(self._file("centroids.tmp.npy"), self._file("centroids.npy"))
+                self._ivf, self._trained_points = ivf, len(live)
+            logger.info(f"Trained local IVF index with {nlist} clusters over {len(live)} memories")
+        except Exception as e:
+            logger.error(f"Error training the local IVF index: {e}")
+
+    def wait_for_index(self, timeout: float = None):
+        """Wait for background IVF and quantizer training runs, if any are going, to finish."""
+        for thread in (self._training, self._quantizing):
+            if thread is not None:
+                thread.join(timeout)
+
+    def _load_quantizer(self):
+        self._quantized_points = 0
+        if self.quantization == "none" or not os.path.exists(self._file("quantizer.npz")):
+            return
+        with np.load(self._file("quantizer.npz")) as state:
+            if str(state["kind"]) != self.quantization:
+                return
+            self._quantizer = load_quantizer(self.quantization, state)
+            self._quantized_points = int(state["points"])
+        self._quantized = self._open_codes(self._file("codes"), self._quantizer, self._capacity)
+
+    def _maybe_quantize(self, background: bool = False):
+        """Train (or retrain, once the collection doubled since) the quantizer when it is enabled."""
+        if self.quantization == "none":
+            return
+        live = int(self._live[:self._high].sum())
+        if live < self.quantize_min_points:
+            return
+        if self._quantizer is not None and live < 2 * self._quantized_points:
+            return
+        if self._quantizing is not None and self._quantizing.is_alive():
+            return
+        if not background:
+            self._quantize()
+            return
+        self._quantizing = threading.Thread(target=self._quantize, name=f"quantize-{self.collection_name}",
+                                            daemon=True)
+        self._quantizing.start()
+
+    def _quantize(self):
+        """Train a quantizer over the live slots and re-encode every slot.
+
+        Training and encoding run without the lock, into a temporary codes file, on a snapshot
+        of the slots and their generations; slots written meanwhile are encoded under the lock
+        before the files are swapped in. The old quantizer file is removed first, so a crash
+        leaves either the old pair or no quantizer (retrained on open).
+        """
+        try:
+            with self._lock:
+                connection, stored, high = self._connection, self._vectors, self._high
+                live, generations = self._live[:high].copy(), self._generation[:high].copy()
+                slots = np.flatnonzero(live)
+                rng = np.random.default_rng(0)
+                sample = np.asarray(stored[np.sort(rng.choice(slots, size=min(len(slots), 20000), replace=False))],
+                                    dtype=np.float32)
+            quantizer = QUANTIZERS[self.quantization].train(sample)
+            codes = self._open_codes(self._file("codes.tmp"), quantizer, len(stored))
+            for start in range(0, high, CHUNK_ROWS):
+                end = min(start + CHUNK_ROWS, high)
+                codes[start:end] = quantizer.encode(np.asarray(stored[start:end], dtype=np.float32))
+
+            with self._lock:
+                if self._connection is not connection:
+                    return
+                if len(codes) < self._capacity:
+                    codes.flush()
+                    codes = self._open_codes(self._file("codes.tmp"), quantizer, self._capacity)
+                written = np.flatnonzero(self._live[:self._high])
+                old = written[written < high]
+                written = np.concatenate([old[~live[old] | (self._generation[old] != generations[old])],
+                                          written[written >= high]])
+                if len(written):
+                    codes[written] = quantizer.encode(np.asarray(self._vectors[written], dtype=np.float32))
+                codes.flush()
+                points = int(self._live[:self._high].sum())
+                with open(self._file("quantizer.tmp.npz"), "wb") as handle:
+                    np.savez(handle, kind=self.quantization, points=points, **quantizer.state())
+                if os.path.exists(self._file("quantizer.npz")):
+                    os.remove(self._file("quantizer.npz"))
+                os.replace(self._file("codes.tmp"), self._file("codes"))
+                os.replace(self._file("quantizer.tmp.npz"), self._file("quantizer.npz"))
+                self._quantizer, self._quantized_points = quantizer, points
+                self._quantized = self._open_codes(self._file("codes"), quantizer, self._capacity)
+            logger.info(f"Trained {self.quantization} quantizer over {points} memories")
+        except Exception as e:
+            logger.error(f"Error training the {self.quantization} quantizer: {e}")
+
+    # mem0 vector store interface
+
+    def insert(self, vectors: list, payloads: list = None, ids: list = None):
+        """Insert or replace points."""
+        vectors = _normalize(vectors)
+        payloads = payloads or [{} for _ in range(len(vectors))]
+        ids = ids or [str(uuid.uuid4()) for _ in range(len(vectors))]
+        with self._lock:
+            replaced = self._slots_of(ids)
+            slots = [self._allocate() for _ in range(len(vectors))]
+            self._ensure_capacity(max(slots) + 1)
+            self._vectors[slots] = vectors
+            self._vectors.flush()
+            if self._quantizer is not None:
+                self._quantized[slots] = self._quantizer.encode(vectors)
+                self._quantized.flush()
+            clusters = self._ivf.assign(vectors) if self._ivf is not None else np.full(len(slots), -1)
+            with self._transaction():
+                self._connection.executemany(
+                    # Upsert rather than replace, so a rewritten point keeps its rowid and its place in scroll order
+                    "INSERT INTO points (id, slot, cluster, user_id, agent_id, run_id, payload) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET slot = excluded.slot, cluster = excluded.cluster, "
+                    "user_id = excluded.user_id, agent_id = excluded.agent_id, run_id = excluded.run_id, "
+                    "payload = excluded.payload",
+                    [
+                        (str(point_id), slot, int(cluster), *(payload.get(key) for key in INDEXED_KEYS),
+                         json.dumps(payload))
+                        for point_id, slot, cluster, payload in zip(ids, slots, clusters, payloads)
+                    ],
+                )
+            for slot, cluster, payload in zip(slots, clusters, payloads):
+                self._live[slot] = True
+                self._cluster[slot] = cluster
+                for key in INDEXED_KEYS:
+                    self._owner[key][slot] = self._code(key, payload.get(key))
+            self._release(replaced.values())
+            self._maybe_train(background=True)
+            self._maybe_quantize(background=True)
+
+    def _slots_of(self, ids: list) -> dict[str, int]:
+        placeholders = ",".join("?" * len(ids))
+        rows = self._connection.execute(
+            f"SELECT id, slot FROM points WHERE id IN ({placeholders})", [str(point_id) for point_id in ids]
+        ).fetchall()
+        return dict(rows)
+
+    def _release(self, slots):
+        for slot in slots:
+            self._generation[slot] += 1
+            self._live[slot] = False
+            self._cluster[slot] = -1
+            for key in INDEXED_KEYS:
+                self._owner[key][slot] = -1
+            self._free.append(slot)
+
+    def _candidate_mask(self, filters: dict | None, high: int) -> np.ndarray:
+        mask = self._live[:high].copy()
+        other_filters = {}
+        for key, value in (filters or {}).items():
+            if key in INDEXED_KEYS and not isinstance(value, dict):
+                code = self._codes[key].get(str(value))
+                if code is None:
+                    return np.zeros(high, dtype=bool)
+                mask &= self._owner[key][:high] == code
+            else:
+                other_filters[key] = value
+        if other_filters:
+            where, params = self._where(other_filters)
+            slots = [row[0] for row in self._connection.execute(f"SELECT slot FROM points WHERE {where}", params)]
+            allowed = np.zeros(high, dtype=bool)
+            allowed[np.array([slot for slot in slots if slot < high], dtype=np.int64)] = True
+            mask &= allowed
+        return mask
+
+    def _where(self, filters: dict | None) -> tuple[str, list]:
+        """SQL condition for mem0 filters: equality, or {"gte": ..., "lte": ...} ranges."""
+        clauses, params = ["1 = 1"], []
+        for key, value in (filters or {}).items():
+            column, column_params = (key, []) if key in INDEXED_KEYS else ("json_extract(payload, ?)", [f"$.{key}"])
+            if isinstance(value, dict) and "gte" in value and "lte" in value:
+                clauses.append(f"{column} BETWEEN ? AND ?")
+                params.extend([*column_params, value["gte"], value["lte"]])
+            else:
+                clauses.append(f"{column} = ?")
+                params.extend([*column_params, value])
+        return " AND ".join(clauses), params
+
+    def _score(self, vectors: np.ndarray, slots: np.ndarray, high: int, query: np.ndarray) -> np.ndarray:
+        """Cosine scores of the given slots, scanning contiguous chunks when most of the store is selected."""
+        if len(slots) > high // 2:
+            scores = np.empty(high, dtype=np.float32)
+            for start in range(0, high, CHUNK_ROWS):
+                end = min(start + CHUNK_ROWS, high)
+                scores[start:end] = np.asarray(vectors[start:end], dtype=np.float32) @ query
+            return scores[slots]
+        scores = np.empty(len(slots), dtype=np.float32)
+        for start in range(0, len(slots), CHUNK_ROWS):
+            chunk = slots[start:start + CHUNK_ROWS]
+            scores[start:start + len(chunk)] = np.asarray(vectors[chunk], dtype=np.float32) @ query
+        return scores
+
+    def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None) -> list:
+        """Return the `limit` points most similar to the query vector that match the filters."""
+        query_vector = _normalize(vectors)
+        with self._lock:
+            high, stored, ivf = self._high, self._vectors, self._ivf
+            quantizer, quantized = self._quantizer, self._quantized
+            mask = self._candidate_mask(filters, high)
+            if ivf is not None:
+                # Lookup table over cluster ids; the extra last entry stays False for unassigned (-1) slots
+                in_probe = np.zeros(len(ivf.centroids) + 1, dtype=bool)
+                in_probe[ivf.probe(query_vector)] = True
+                probed = mask & in_probe[self._cluster[:high]]
+                # A narrow filter can leave the probed clusters nearly empty; scan every match instead
+                if probed.sum() >= limit:
+                    mask = probed
+            slots = np.flatnonzero(mask)
+            generations = self._generation[slots]
+        if not len(slots):
+            return []
+        shortlist = limit * self.rerank
+        if quantizer is not None and len(slots) > shortlist:
+            # Rank by the compact codes, then re-score only the shortlist with the full-precision vectors
+            approximate = approximate_scores(quantizer, quantized, slots, query_vector)
+            keep = np.sort(np.argpartition(-approximate, shortlist - 1)[:shortlist])
+            slots, generations = slots[keep], generations[keep]
+        scores = self._score(stored, slots, high, query_vector)
+        top = np.argpartition(-scores, min(limit, len(scores)) - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        with self._lock:
+            # A slot freed, and perhaps reused, while it was scored no longer holds the point it was scored for
+            best = {int(slots[i]): float(scores[i]) for i in top if self._generation[slots[i]] == generations[i]}
+            records = self._records("slot", list(best))
+        return sorted(
+            (LocalRecord(record.id, best[slot], record.payload) for slot, record in records.items()),
+            key=lambda record: -record.score,
+        )
+
+    def _records(self, column: str, values: list) -> dict:
+        if not values:
+            return {}
+        placeholders = ",".join("?" * len(values))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {column}, id, payload FROM points WHERE {column} IN ({placeholders})", values
+            ).fetchall()
+        return {key: LocalRecord(point_id, None, json.loads(payload)) for key, point_id, payload in rows}
+
+    def get(self, vector_id) -> LocalRecord | None:
+        return self._records("id", [str(vector_id)]).get(str(vector_id))
+
+    def get_many(self, vector_ids: list) -> list:
+        records = self._records("id", [str(vector_id) for vector_id in vector_ids])
+        return [records[str(vector_id)] for vector_id in vector_ids if str(vector_id) in records]
+
+    def update(self, vector_id, vector: list = None, payload: dict = None):
+        """Replace the vector and/or payload of a point. A new vector goes to a new slot."""
+        existing = self.get(vector_id)
+        if existing is None:
+            raise ValueError(f"Point {vector_id} not found")
+        if vector is None:
+            payload = payload if payload is not None else existing.payload
+            with self._lock:
+                slot = self._slots_of([vector_id])[str(vector_id)]
+                with self._transaction():
+                    self._connection.execute(
+                        "UPDATE points SET user_id = ?, agent_id = ?, run_id = ?, payload = ? WHERE id = ?",
+                        (*(payload.get(key) for key in INDEXED_KEYS), json.dumps(payload), str(vector_id)),
+                    )
+                for key in INDEXED_KEYS:
+                    self._owner[key][slot] = self._code(key, payload.get(key))
+            return
+        self.insert([vector], [payload if payload is not None else existing.payload], [str(vector_id)])
+
+    def delete(self, vector_id):
+        self.delete_many([vector_id])
+
+    def delete_many(self, vector_ids: list):
+        with self._lock:
+            slots = self._slots_of(vector_ids)
+            if not slots:
+                return
+            placeholders = ",".join("?" * len(slots))
+            with self._transaction():
+                self._connection.execute(f"DELETE FROM points WHERE id IN ({placeholders})", list(slots))
+            self._release(slots.values())
+
+    def scroll(self, filters: dict = None, limit: int = 100, offset=None):
+        """Page through points in insertion order. Returns (records, next_offset)."""
+        where, params = self._where(filters)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT rowid, id, payload FROM points WHERE {where} AND rowid > ? ORDER BY rowid LIMIT ?",
+                [*params, offset or 0, limit + 1],
+            ).fetchall()
+        records = [LocalRecord(point_id, None, json.loads(payload)) for _, point_id, payload in rows[:limit]]
+        return records, rows[limit - 1][0] if len(rows) > limit else None
+
+    def list(self, filters: dict = None, limit: int = 100) -> list:
+        records, _ = self.scroll(filters, limit)
+        return [records]
+
+    def list_cols(self) -> list:
+        return [name[:-len(".db")] for name in os.listdir(self.path) if name.endswith(".db")]
+
+    def delete_col(self):
+        self.wait_for_index()
+        with self._lock:
+            self._connection.close()
+            for suffix in ("db", "db-wal", "db-shm", "vectors", "centroids.npy", "codes", "quantizer.npz"):
+                if os.path.exists(self._file(suffix)):
+                    os.remove(self._file(suffix))
+
+    def col_info(self) -> dict:
+        return {
+            "name": self.collection_name,
+            "points": int(self._live[:self._high].sum()),
+            "dims": self.embedding_model_dims,
+            "dtype": self.dtype.name,
+            "index": "ivf" if self._ivf is not None else "flat",
+            "quantization": self._quantizer.kind if self._quantizer is not None else "none",
+        }
+
+    def reset(self):
+        self.delete_col()
+        self.create_col(self.collection_name, self.embedding_model_dims)
+
+def split_local_vector_store(config: dict) -> tuple[dict, LocalVectorStore | None]:
+    """Separate VECTOR_STORE_PROVIDER=local from a Mem0 config dict.
+
+    mem0 only accepts its own providers, so the returned config points it at a throwaway
+    in-memory Qdrant client, and the caller swaps in the returned LocalVectorStore.
+    """
+    if config.get("vector_store", {}).get("provider") != "local":
+        return config, None
+    from qdrant_client import QdrantClient
+
+    settings = config["vector_store"]["config"]
+    placeholder = {
+        "provider": "qdrant",
+        "config": {
+            "collection_name": settings["collection_name"],
+            "embedding_model_dims": settings["embedding_model_dims"],
+            "client": QdrantClient(location=":memory:"),
+        },
+    }
+    return {**config, "vector_store": placeholder}, LocalVectorStore(**settings)
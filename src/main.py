@@ -1,25 +1,298 @@
 from mcp.server.fastmcp import FastMCP, Context
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 from mem0 import Memory
 import asyncio
-import json
+import functools
 import os
+import time
 
-from utils import get_mem0_client
+from utils import get_mem0_client, get_async_mem0_client
+from dispatch import MemoryDispatcher, get_dispatcher
+from async_backend import NativeAsyncMemory
+from ingestion import IngestionQueue, get_ingestion_queue
+from result_cache import SearchResultCache, get_search_cache
+from batch import add_many, delete_many, embed_many, has_embedding_cache
+from pagination import DEFAULT_FIELDS, fetch_page
+from formatting import format_response, memory_lines, relationship_lines
+from tenancy import Tenant, TenantRegistry, get_tenant_registry
+from pooling import get_connection_pools
+from embeddings import shutdown_batchers
+from metrics import CONTENT_TYPE, REGISTRY, install_metrics, instrument_tool, metrics_enabled
+from tracing import configure_tracing, propagate_context_into_mem0, shutdown_tracing, trace_tool
+from fastpath import add_raw, infer_by_default
+from dedup import DedupIndex, get_dedup_index
+from chunking import ChunkSettings, add_conversation, get_chunk_settings
+from graph_query import find_related, graph_backend, node_name
+from entity_index import EntityIndex, get_entity_index
+import stages
+from stages import StageTimeouts, get_stage_timeouts
+from lexical import (SEARCH_MODES, LexicalIndex, default_search_mode, get_lexical_index, start_backfill,
+                     looks_like_identifier, reciprocal_rank_fusion, verify)
+from rerank import Reranker, get_reranker
+from recording import SessionRecorder, get_session_recorder
 
 load_dotenv()
 
-# Default user ID for memory operations - hardcoded for single user
-DEFAULT_USER_ID = "user"
-
 # Create a dataclass for our application context
 @dataclass
 class Mem0Context:
     """Context for the Mem0 MCP server."""
-    mem0_client: Memory
+    mem0_client: Memory | NativeAsyncMemory
+    dispatcher: MemoryDispatcher
+    ingestion: IngestionQueue | None = None
+    search_cache: SearchResultCache | None = None
+    # Which user each call acts for (argument, header or session) and the per-user concurrency caps
+    tenants: TenantRegistry = field(default_factory=TenantRegistry)
+    # With MEM0_RECORD_SESSIONS, every tool call is logged for replay by loadgen.py
+    recorder: SessionRecorder | None = None
+    # Texts each tenant already saved, so repeated saves skip the LLM, embedder and store
+    dedup: DedupIndex | None = None
+    # Conversations longer than chunking.max_chars are extracted in parallel chunks
+    chunking: ChunkSettings | None = None
+    # Entity names of each tenant's graph, so find_relationships resolves partial and misspelled names
+    entities: EntityIndex | None = None
+    # With a graph store, how long searches and saves wait on the vector and graph stages
+    stages: StageTimeouts = field(default_factory=StageTimeouts)
+    # BM25 index of memory texts beside the vector store, for hybrid and lexical searches
+    lexical: LexicalIndex | None = None
+    search_mode: str = "vector"
+    # With MEM0_RERANKER, searches over-fetch candidates and reorder them before cutting to the limit
+    reranker: Reranker | None = None
+
+def summarize_add_result(result) -> dict:
+    """Summarize what a Mem0 add call extracted, for tool responses and ingestion job results."""
+    if isinstance(result, dict) and "results" in result:
+        return {
+            "facts_extracted": len(result["results"]),
+            "relationships_created": len(result.get("relations", {}).get("added_entities", [])),
+            **partial_fields(result),
+        }
+    return {"result": str(result)}
+
+def partial_fields(result) -> dict:
+    """The partial flag and stage errors of a result a stage timed out or failed in, for tool responses."""
+    if isinstance(result, dict) and result.get("partial"):
+        return {"partial": True, "stage_errors": result["stage_errors"]}
+    return {}
+
+async def add_memory(app: Mem0Context, messages: list[dict], tenant: Tenant):
+    """Add messages through Mem0; with a graph store, the graph write runs under its own timeout."""
+    if graph_backend(app.mem0_client) is None:
+        return await app.dispatcher.run("add", app.mem0_client.add, messages, **tenant.scope())
+    return await stages.add(app.mem0_client, app.dispatcher, messages, tenant.scope(), app.stages)
+
+async def search_memory(app: Mem0Context, query: str, tenant: Tenant, limit: int):
+    """Search through Mem0; with a graph store, vector and graph retrieval run under their own timeouts."""
+    if graph_backend(app.mem0_client) is None:
+        return await app.dispatcher.run("search", app.mem0_client.search, query, limit=limit, **tenant.scope())
+    return await stages.search(app.mem0_client, app.dispatcher, query, tenant.scope(), limit, app.stages)
+
+async def add_conversation_text(app: Mem0Context, conversation: str, tenant: Tenant):
+    """Add a conversation through Mem0, in parallel chunks when it is longer than MEM0_CHUNK_CHARS."""
+    if app.chunking and len(conversation) > app.chunking.max_chars:
+        return await add_conversation(app.mem0_client, app.dispatcher, conversation, app.chunking,
+                                      tenant.scope(), app.stages)
+    return await add_memory(app, [{"role": "user", "content": conversation}], tenant)
+
+async def ingest(app: Mem0Context, kind: str, payload: dict) -> dict:
+    """Run a queued save_memory or save_conversation job against the Mem0 client."""
+    # Jobs queued before multi-tenancy only carry a user_id
+    tenant = Tenant(**{key: payload[key] for key in ("user_id", "agent_id", "run_id") if payload.get(key)})
+    if kind == "conversation":
+        result = await add_conversation_text(app, payload["conversation"], tenant)
+    elif payload.get("infer", True):
+        messages = [{"role": "user", "content": payload["text"]}]
+        result = await add_memory(app, messages, tenant)
+    else:
+        messages = [{"role": "user", "content": payload["text"]}]
+        result = await add_raw(app.mem0_client, app.dispatcher, messages, tenant.scope())
+    memories_added(app, tenant, result)
+    return summarize_add_result(result)
+
+def ingest_failed(app: Mem0Context, kind: str, payload: dict):
+    """Release the duplicate claim of a queued save that failed for good, so the text can be saved again."""
+    tenant = Tenant(**{key: payload[key] for key in ("user_id", "agent_id", "run_id") if payload.get(key)})
+    save_failed(app, tenant, payload["conversation"] if kind == "conversation" else payload["text"])
+
+def memories_changed(app: Mem0Context, tenant: Tenant):
+    """Invalidate cached search results after a write for the tenant's user."""
+    if app.search_cache:
+        app.search_cache.invalidate(tenant.user_id)
+
+def memories_removed(app: Mem0Context, tenant: Tenant):
+    """After a delete or update, also let the user save the texts they saved before again."""
+    memories_changed(app, tenant)
+    if app.dedup:
+        app.dedup.forget(tenant.user_id)
+
+def memories_added(app: Mem0Context, tenant: Tenant, *results):
+    """After an add; one whose extraction updated or deleted earlier memories counts as removing them."""
+    events = {item.get("event") for result in results if isinstance(result, dict)
+              for item in result.get("results", []) if isinstance(item, dict)}
+    if events & {"UPDATE", "DELETE"}:
+        memories_removed(app, tenant)
+    else:
+        memories_changed(app, tenant)
+
+def find_duplicate(app: Mem0Context, tenant: Tenant, text: str) -> str | None:
+    """"exact" or "near" when the tenant already saved this text, else None and the text is claimed."""
+    return app.dedup.claim(tenant.user_id, tenant.key, text) if app.dedup else None
+
+def save_failed(app: Mem0Context, tenant: Tenant, text: str):
+    """Release the claim of a text that was not saved, so it is not skipped as a duplicate later."""
+    if app.dedup:
+        app.dedup.release(tenant.user_id, tenant.key, text)
+
+def duplicate_message(text: str, match: str) -> str:
+    return f"Skipped saving memory, already saved ({match} duplicate): {text[:100]}"
+
+async def ensure_owned(app: Mem0Context, tenant: Tenant, memory_id: str):
+    """Raise unless memory_id exists and belongs to the tenant, so tenants cannot touch each other's memories."""
+    memory = await app.dispatcher.run("get", app.mem0_client.get, memory_id)
+    if memory is None or not tenant.owns(memory):
+        raise ValueError(f"Memory with ID {memory_id} not found")
+
+async def search_with_cache(app: Mem0Context, query: str, tenant: Tenant, limit: int):
+    """Run a Mem0 search, answering from the search result cache when possible.
+
+    The cache is tried by exact query text first. On a miss, and only with an embedding cache,
+    the query is embedded to look for a near-identical cached query before running the search;
+    the search's own embed call is then a cache hit. Without one, the probe would double the
+    provider's embedding calls, so only exact repeats are answered.
+    """
+    cache = app.search_cache
+    if not cache:
+        return await search_memory(app, query, tenant, limit)
+
+    cached = cache.get_exact(tenant.user_id, limit, query, scope=tenant.key)
+    if cached is not None:
+        return cached
+
+    generation = cache.generation(tenant.user_id)
+    vector = None
+    if has_embedding_cache(app.mem0_client) and cache.near_matchable(query):
+        vector = await app.dispatcher.run("embed", app.mem0_client.embedding_model.embed, query, "search")
+        cached = cache.get_similar(tenant.user_id, limit, query, vector, scope=tenant.key)
+        if cached is not None:
+            return cached
+
+    cache.miss()
+    memories = await search_memory(app, query, tenant, limit)
+    if not partial_fields(memories):
+        cache.put(tenant.user_id, limit, query, vector, memories, generation, scope=tenant.key)
+    return memories
+
+async def search_lexical(app: Mem0Context, query: str, tenant: Tenant, limit: int) -> list[dict]:
+    """BM25 hits still in the vector store; a few extra are fetched to make up for stale ones."""
+    results = await app.dispatcher.run("lexical", app.lexical.search, query, tenant.scope(), limit + 5)
+    return (await verify(app.lexical, app.mem0_client, app.dispatcher, results))[:limit]
+
+async def search_in_mode(app: Mem0Context, query: str, tenant: Tenant, limit: int, mode: str = ""):
+    """Search by meaning (vector), by words (lexical) or both fused with reciprocal rank fusion (hybrid).
+
+    "auto" searches identifier-like queries such as ticket numbers or hostnames lexically,
+    skipping the embedding call, and everything else hybrid. It falls back to the vector
+    search when there is no lexical index or no lexical match.
+    """
+    mode = (mode or app.search_mode).lower()
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"mode must be one of {', '.join(SEARCH_MODES)}")
+    if mode == "vector" or (mode == "auto" and app.lexical is None):
+        return await search_with_cache(app, query, tenant, limit)
+    if app.lexical is None:
+        raise ValueError(f"{mode} search needs the lexical index, which MEM0_LEXICAL_INDEX=false turned off")
+    if not await start_backfill(app.lexical, app.mem0_client, app.dispatcher, tenant.user_id):
+        # The user's memories are still being indexed; the vector search answers until they are
+        return await search_with_cache(app, query, tenant, limit)
+
+    if mode == "lexical" or (mode == "auto" and looks_like_identifier(query)):
+        results = await search_lexical(app, query, tenant, limit)
+        if results or mode == "lexical":
+            return {"results": results}
+
+    # Fuse deeper rankings than the caller asked for, so a memory ranked low by one search can still make the cut
+    candidates = max(limit * 2, 10)
+    memories, lexical = await asyncio.gather(
+        search_with_cache(app, query, tenant, candidates),
+        search_lexical(app, query, tenant, candidates),
+    )
+    vector = memories["results"] if isinstance(memories, dict) else memories
+    return {**(memories if isinstance(memories, dict) else {}), "results": reciprocal_rank_fusion([vector, lexical], limit)}
+
+async def search_and_rerank(app: Mem0Context, query: str, tenant: Tenant, limit: int, mode: str = "",
+                            rerank: bool | None = None):
+    """search_in_mode, fetching the reranker's candidates and keeping the best `limit` of them when reranking."""
+    if rerank and app.reranker is None:
+        raise ValueError("rerank needs a reranker, which MEM0_RERANKER configures")
+    if app.reranker is None or rerank is False:
+        return await search_in_mode(app, query, tenant, limit, mode)
+    memories = await search_in_mode(app, query, tenant, max(limit, app.reranker.candidates), mode)
+    candidates = memories["results"] if isinstance(memories, dict) else memories
+    reranked = await app.reranker.rerank(query, candidates, limit)
+    return {**(memories if isinstance(memories, dict) else {}), "results": reranked}
+
+def server_metrics(app: Mem0Context):
+    """Scrape-time metrics from the dispatcher, caches, tenants and connection pools."""
+    operations = app.dispatcher.snapshot()["operations"]
+    families = [
+        ("mem0_operation_waiting", "gauge", "Mem0 calls waiting for a concurrency slot.",
+         [({"operation": name}, stats["waiting"]) for name, stats in operations.items()]),
+        ("mem0_operation_in_flight", "gauge", "Mem0 calls running.",
+         [({"operation": name}, stats["in_flight"]) for name, stats in operations.items()]),
+        ("mem0_operation_failed_total", "counter", "Mem0 calls that raised.",
+         [({"operation": name}, stats["failed"]) for name, stats in operations.items()]),
+        ("mem0_operation_wait_seconds_total", "counter", "Time Mem0 calls spent waiting for a slot or worker.",
+         [({"operation": name}, stats["total_wait_seconds"]) for name, stats in operations.items()]),
+    ]
+    tenants = app.tenants.snapshot()
+    families.append(("mem0_tenants_active", "gauge", "Users with tool calls running or waiting.",
+                     [({}, tenants["tenants_active"])]))
+    families.append(("mem0_tenant_throttled_calls_total", "counter", "Tool calls that waited on a per-user limit.",
+                     [({}, tenants["throttled_calls"])]))
+    if app.search_cache:
+        cache = app.search_cache.stats()
+        families.append(("mem0_search_cache_lookups_total", "counter", "Search result cache lookups by outcome.",
+                         [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])]))
+    if app.dedup:
+        dedup = app.dedup.stats()
+        families.append(("mem0_dedup_checks_total", "counter", "Saves checked against the duplicate index.",
+                         [({}, dedup["checked"])]))
+        families.append(("mem0_dedup_duplicates_total", "counter", "Saves skipped as duplicates, by match.",
+                         [({"match": "exact"}, dedup["exact_duplicates"]), ({"match": "near"}, dedup["near_duplicates"])]))
+        families.append(("mem0_dedup_saved_seconds_total", "counter",
+                         "Estimated save time skipped duplicates did not spend.", [({}, dedup["estimated_seconds_saved"])]))
+    if app.entities:
+        entities = app.entities.stats()
+        families.append(("mem0_entity_index_entities", "gauge", "Entity names held by the entity index.",
+                         [({}, entities["entities"])]))
+        families.append(("mem0_entity_index_lookups_total", "counter", "Entity name lookups, by whether a node matched.",
+                         [({"result": "resolved"}, entities["resolved"]),
+                          ({"result": "unresolved"}, entities["lookups"] - entities["resolved"])]))
+        families.append(("mem0_entity_index_merged_total", "counter",
+                         "Entity names written to an existing node of the same name.", [({}, entities["merged_on_write"])]))
+    if app.reranker:
+        rerank = app.reranker.stats()
+        families.append(("mem0_rerank_batches_total", "counter", "Scoring calls made by the reranker.",
+                         [({}, rerank["batches"])]))
+        families.append(("mem0_rerank_searches_total", "counter", "Searches reranked, over all scoring calls.",
+                         [({}, rerank["items"])]))
+    if app.ingestion:
+        families.append(("mem0_ingestion_jobs", "gauge", "Queued save jobs by state.",
+                         [({"state": state}, count) for state, count in app.ingestion.summary().items()]))
+    backends = get_connection_pools().snapshot()["backends"]
+    for key, name, kind, documentation in (
+        ("requests", "mem0_backend_requests_total", "counter", "HTTP requests sent to each backend."),
+        ("connections_opened", "mem0_backend_connections_opened_total", "counter", "New connections opened to each backend."),
+        ("tls_handshakes", "mem0_backend_tls_handshakes_total", "counter", "TLS handshakes with each backend."),
+        ("idle_connections", "mem0_backend_idle_connections", "gauge", "Kept-alive idle connections to each backend."),
+    ):
+        families.append((name, kind, documentation, [({"backend": backend}, stats[key]) for backend, stats in backends.items()]))
+    return families
 
 @asynccontextmanager
 async def mem0_lifespan(server: FastMCP) -> AsyncIterator[Mem0Context]:
@@ -30,19 +303,83 @@ async def mem0_lifespan(server: FastMCP) -> AsyncIterator[Mem0Context]:
         server: The FastMCP server instance
         
     Yields:
-        Mem0Context: The context containing the Mem0 client
+        Mem0Context: The context containing the Mem0 client and the dispatcher that runs its calls
     """
-    # Create and return the Memory client with the helper function in utils.py
-    mem0_client = get_mem0_client()
+    # Calls to the synchronous Memory client run on a bounded worker pool
+    dispatcher = get_dispatcher()
+
+    # Create and return the Memory client with the helper functions in utils.py
+    # MEM0_CLIENT_MODE=async swaps in the async-native client, which the dispatcher awaits directly
+    if os.getenv("MEM0_CLIENT_MODE", "sync") == "async":
+        mem0_client = await get_async_mem0_client(dispatcher)
+    else:
+        mem0_client = get_mem0_client()
+
+    context = Mem0Context(
+        mem0_client=mem0_client,
+        dispatcher=dispatcher,
+        # With MEM0_INGEST_MODE=async, saves are queued to a local SQLite file and written in the background
+        ingestion=get_ingestion_queue(),
+        search_cache=get_search_cache(),
+        tenants=get_tenant_registry(),
+        recorder=get_session_recorder(),
+        dedup=get_dedup_index(),
+        chunking=get_chunk_settings(),
+        entities=get_entity_index(mem0_client),
+        stages=get_stage_timeouts(),
+        lexical=get_lexical_index(mem0_client),
+        search_mode=default_search_mode(),
+        reranker=get_reranker(dispatcher),
+    )
+    tracing = configure_tracing()
+    if tracing:
+        propagate_context_into_mem0()
+    if metrics_enabled() or tracing:
+        # Stage timings and spans for the LLM, embedder, vector store, graph and Cypher calls behind each tool
+        install_metrics(mem0_client)
+    if metrics_enabled():
+        REGISTRY.add_collector("server", functools.partial(server_metrics, context))
+    ingestion = context.ingestion
+    if ingestion:
+        await ingestion.start(functools.partial(ingest, context), functools.partial(ingest_failed, context))
     
     try:
-        yield Mem0Context(mem0_client=mem0_client)
+        yield context
     finally:
-        # No explicit cleanup needed for the Mem0 client
-        pass
+        if ingestion:
+            await ingestion.stop()
+        # Let running store calls finish before the resources they use are closed
+        await asyncio.to_thread(dispatcher.shutdown)
+        if isinstance(mem0_client, NativeAsyncMemory):
+            await mem0_client.close()
+        REGISTRY.remove_collector("server")
+        if context.recorder:
+            context.recorder.close()
+        if context.lexical:
+            context.lexical.close()
+        shutdown_batchers()
+        get_connection_pools().close()
+        shutdown_tracing()
+
+class Mem0MCP(FastMCP):
+    """FastMCP with a hook around every tool call, used to record sessions for replay."""
+
+    async def call_tool(self, name: str, arguments: dict):
+        request_context = self.get_context().request_context
+        recorder = request_context.lifespan_context.recorder
+        if recorder is None:
+            return await super().call_tool(name, arguments)
+        entry = recorder.start(request_context)
+        error = True
+        try:
+            result = await super().call_tool(name, arguments)
+            error = any(getattr(content, "text", "").startswith("Error") for content in result)
+            return result
+        finally:
+            recorder.finish(entry, name, arguments, error)
 
 # Initialize FastMCP server with the Mem0 client as context
-mcp = FastMCP(
+mcp = Mem0MCP(
     "mcp-mem0",
     description="MCP server for long term memory storage and retrieval with Mem0",
     lifespan=mem0_lifespan,
@@ -51,98 +388,239 @@ mcp = FastMCP(
 )        
 
 @mcp.tool()
-async def save_memory(ctx: Context, text: str) -> str:
+@instrument_tool
+@trace_tool
+async def save_memory(ctx: Context, text: str, user_id: str = "", infer: bool | None = None) -> str:
     """Save information to your long-term memory.
 
     This tool is designed to store any type of information that might be useful in the future.
     The content will be processed and indexed for later retrieval through semantic search.
+    When the server queues writes, this returns a job ID right away; check it with get_ingestion_status.
 
     Args:
         ctx: The MCP server provided context which includes the Mem0 client
         text: The content to store in memory, including any relevant details and context
+        user_id: The user to save the memory for. Leave empty for the user of this connection.
+        infer: Set to false to store the text verbatim, without LLM fact extraction. Much faster for
+            facts that are already short and self-contained. Leave empty for the server default.
     """
     try:
-        mem0_client = ctx.request_context.lifespan_context.mem0_client
-        messages = [{"role": "user", "content": text}]
-        result = mem0_client.add(messages, user_id=DEFAULT_USER_ID)
-        return f"Successfully saved memory: {text[:100]}..." if len(text) > 100 else f"Successfully saved memory: {text}"
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        infer = infer_by_default() if infer is None else infer
+        match = find_duplicate(app, tenant, text)
+        if match:
+            return duplicate_message(text, match)
+        if app.ingestion:
+            job_id = await asyncio.to_thread(
+                app.ingestion.enqueue, "memory", {"text": text, "infer": infer, **tenant.scope()})
+            return format_response({"status": "queued", "job_id": job_id})
+
+        started = time.perf_counter()
+        try:
+            async with app.tenants.limit(tenant):
+                messages = [{"role": "user", "content": text}]
+                if infer:
+                    result = await add_memory(app, messages, tenant)
+                else:
+                    result = await add_raw(app.mem0_client, app.dispatcher, messages, tenant.scope())
+                memories_added(app, tenant, result)
+        except Exception:
+            save_failed(app, tenant, text)
+            raise
+        if app.dedup:
+            app.dedup.observe_save(time.perf_counter() - started)
+        message = f"Successfully saved memory: {text[:100]}..." if len(text) > 100 else f"Successfully saved memory: {text}"
+        for stage, error in partial_fields(result).get("stage_errors", {}).items():
+            message += f" ({stage} stage {error})"
+        return message
     except Exception as e:
         return f"Error saving memory: {str(e)}"
 
 @mcp.tool()
-async def save_conversation(ctx: Context, conversation: str) -> str:
+@instrument_tool
+@trace_tool
+async def save_conversation(ctx: Context, conversation: str, user_id: str = "") -> str:
     """Save an entire conversation to memory with automatic fact extraction and relationship building.
 
     This tool processes full conversations and extracts meaningful information automatically.
     It handles the conversation format internally and builds both vector and graph memories.
     
     Use this instead of save_memory when you have full conversation context to process.
+    When the server queues writes, this returns a job ID right away; check it with get_ingestion_status.
 
     Args:
         ctx: The MCP server provided context which includes the Mem0 client
         conversation: The conversation text to process (can be multi-turn dialogue)
+        user_id: The user to save the conversation for. Leave empty for the user of this connection.
     """
     try:
-        mem0_client = ctx.request_context.lifespan_context.mem0_client
-        
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        match = find_duplicate(app, tenant, conversation)
+        if match:
+            return format_response({"status": "duplicate", "match": match,
+                                    "message": "This conversation was already saved; nothing was extracted"})
+        if app.ingestion:
+            job_id = await asyncio.to_thread(
+                app.ingestion.enqueue, "conversation", {"conversation": conversation, **tenant.scope()})
+            return format_response({"status": "queued", "job_id": job_id})
+
         # mem0 can handle raw conversation text and will extract facts automatically
-        result = mem0_client.add(conversation, user_id=DEFAULT_USER_ID)
+        started = time.perf_counter()
+        try:
+            async with app.tenants.limit(tenant):
+                result = await add_conversation_text(app, conversation, tenant)
+                memories_added(app, tenant, result)
+        except Exception:
+            save_failed(app, tenant, conversation)
+            raise
+        if app.dedup:
+            app.dedup.observe_save(time.perf_counter() - started)
         
         # Extract information about what was processed
-        if isinstance(result, dict) and "results" in result:
-            facts_count = len(result["results"])
-            relations_added = len(result.get("relations", {}).get("added_entities", []))
+        summary = summarize_add_result(result)
+        if "facts_extracted" in summary:
+            facts_count = summary["facts_extracted"]
+            relations_added = summary["relationships_created"]
             
-            return json.dumps({
+            response = {
                 "status": "success",
                 "facts_extracted": facts_count,
                 "relationships_created": relations_added,
                 "message": f"Processed conversation and extracted {facts_count} facts with {relations_added} relationships"
-            }, indent=2)
+            }
+            if "chunks" in result:
+                response["chunks"] = result["chunks"]
+                response["writes"] = result["writes"]
+            return format_response(response)
         else:
-            return json.dumps({
+            return format_response({
                 "status": "success", 
                 "message": "Conversation processed successfully",
-                "result": str(result)
-            }, indent=2)
+                "result": summary["result"]
+            })
             
     except Exception as e:
         return f"Error processing conversation: {str(e)}"
 
 @mcp.tool()
-async def get_all_memories(ctx: Context) -> str:
-    """Get all stored memories for the user.
+@instrument_tool
+@trace_tool
+async def save_memories(ctx: Context, texts: list[str], user_id: str = "", infer: bool | None = None) -> str:
+    """Save several pieces of information to memory in one call.
+
+    Use this instead of calling save_memory repeatedly when you have many facts to store.
+    Each text is processed like save_memory and gets its own result, so one failure does not affect the rest.
+
+    Args:
+        ctx: The MCP server provided context which includes the Mem0 client
+        texts: The pieces of content to store, one memory per entry
+        user_id: The user to save the memories for. Leave empty for the user of this connection.
+        infer: Set to false to store each text verbatim, without LLM fact extraction. Leave empty for the server default.
+    """
+    try:
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        infer = infer_by_default() if infer is None else infer
+        # Duplicates, of earlier saves or of another text in this call, are answered without saving
+        duplicates = {i: match for i, text in enumerate(texts) if (match := find_duplicate(app, tenant, text))}
+        new = [i for i in range(len(texts)) if i not in duplicates]
+        items = [{"index": i, "status": "duplicate", "match": match} for i, match in duplicates.items()]
+        if app.ingestion:
+            job_ids = await asyncio.to_thread(
+                app.ingestion.enqueue_many, "memory",
+                [{"text": texts[i], "infer": infer, **tenant.scope()} for i in new])
+            items.extend({"index": i, "status": "queued", "job_id": job_id} for i, job_id in zip(new, job_ids))
+            return format_response(sorted(items, key=lambda item: item["index"]))
+
+        started = time.perf_counter()
+        try:
+            async with app.tenants.limit(tenant):
+                results = await add_many(app.mem0_client, app.dispatcher, [texts[i] for i in new], tenant.scope(),
+                                         infer=infer)
+                memories_added(app, tenant, *results)
+        except Exception:
+            for i in new:
+                save_failed(app, tenant, texts[i])
+            raise
+
+        for i, result in zip(new, results):
+            if isinstance(result, Exception):
+                save_failed(app, tenant, texts[i])
+                items.append({"index": i, "status": "error", "error": str(result)})
+            else:
+                items.append({"index": i, "status": "success", **summarize_add_result(result)})
+        if app.dedup and new:
+            app.dedup.observe_save((time.perf_counter() - started) / len(new))
+        return format_response(sorted(items, key=lambda item: item["index"]))
+    except Exception as e:
+        return f"Error saving memories: {str(e)}"
+
+@mcp.tool()
+@instrument_tool
+@trace_tool
+async def get_ingestion_status(ctx: Context, job_id: str = "") -> str:
+    """Check the progress of memories queued by save_memory or save_conversation.
+
+    Only needed when those tools returned a job ID instead of saving immediately.
+
+    Args:
+        ctx: The MCP server provided context which includes the ingestion queue
+        job_id: The job ID returned by save_memory or save_conversation. Leave empty for queue totals.
+    """
+    try:
+        ingestion = ctx.request_context.lifespan_context.ingestion
+        if not ingestion:
+            return format_response({"status": "disabled", "message": "Memories are saved immediately; there is no ingestion queue"})
+
+        if not job_id:
+            return format_response({"jobs": await asyncio.to_thread(ingestion.summary)})
+
+        status = await asyncio.to_thread(ingestion.status, job_id)
+        if status is None:
+            return f"Error checking ingestion status: unknown job ID {job_id}"
+        return format_response(status)
+    except Exception as e:
+        return f"Error checking ingestion status: {str(e)}"
+
+@mcp.tool()
+@instrument_tool
+@trace_tool
+async def get_all_memories(ctx: Context, cursor: str = "", page_size: int = 100, fields: list[str] | None = None,
+                           user_id: str = "") -> str:
+    """Get the stored memories for the user, one page at a time.
     
     Call this tool when you need complete context of all previously memories.
+    If the response has a next_cursor, call again with that cursor to get the next page.
 
     Args:
         ctx: The MCP server provided context which includes the Mem0 client
+        cursor: The next_cursor from the previous page. Leave empty for the first page.
+        page_size: Number of memories per page (default: 100, maximum: 500)
+        fields: Memory fields to return (default: id, memory, created_at, updated_at). Also available: hash, metadata
+        user_id: The user whose memories are listed. Leave empty for the user of this connection.
 
-    Returns a JSON formatted list of all stored memories, including their IDs, content,
-    and creation timestamps. Memory IDs can be used with delete_memory and update_memory tools.
+    Returns a JSON object with the page of memories, including their IDs, content,
+    and creation timestamps, and the cursor of the next page (null on the last page).
+    Memory IDs can be used with delete_memory and update_memory tools.
     """
     try:
-        mem0_client = ctx.request_context.lifespan_context.mem0_client
-        memories = mem0_client.get_all(user_id=DEFAULT_USER_ID)
-        
-        if isinstance(memories, dict) and "results" in memories:
-            # Return full memory objects with IDs for delete/update operations
-            formatted_memories = []
-            for memory in memories["results"]:
-                formatted_memories.append({
-                    "id": memory.get("id"),
-                    "memory": memory.get("memory"),
-                    "created_at": memory.get("created_at"),
-                    "updated_at": memory.get("updated_at")
-                })
-            return json.dumps(formatted_memories, indent=2)
-        else:
-            return json.dumps(memories, indent=2)
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        async with app.tenants.limit(tenant):
+            memories, next_cursor = await fetch_page(
+                app.mem0_client, app.dispatcher, tenant.scope(), cursor, page_size, fields or DEFAULT_FIELDS
+            )
+        return format_response({"memories": memories, "next_cursor": next_cursor})
     except Exception as e:
         return f"Error retrieving memories: {str(e)}"
 
 @mcp.tool()
-async def search_memories(ctx: Context, query: str, limit: int = 3) -> str:
+@instrument_tool
+@trace_tool
+async def search_memories(ctx: Context, query: str, limit: int = 3, user_id: str = "", mode: str = "",
+                          rerank: bool | None = None) -> str:
     """Search memories using semantic search.
 
     This tool should be called to find relevant information from your memory. Results are ranked by relevance.
@@ -152,20 +630,72 @@ async def search_memories(ctx: Context, query: str, limit: int = 3) -> str:
         ctx: The MCP server provided context which includes the Mem0 client
         query: Search query string describing what you're looking for. Can be natural language.
         limit: Maximum number of results to return (default: 3)
+        user_id: The user whose memories are searched. Leave empty for the user of this connection.
+        mode: "vector" (by meaning), "lexical" (by exact words: ticket numbers, hostnames, API names),
+            "hybrid" (both) or "auto" (lexical for identifiers, hybrid otherwise). Leave empty for the server default.
+        rerank: Reorder a larger set of candidates by how well they answer the query before taking the top
+            results. Leave empty to rerank whenever the server has a reranker.
     """
     try:
-        mem0_client = ctx.request_context.lifespan_context.mem0_client
-        memories = mem0_client.search(query, user_id=DEFAULT_USER_ID, limit=limit)
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        async with app.tenants.limit(tenant):
+            memories = await search_and_rerank(app, query, tenant, limit, mode, rerank)
         if isinstance(memories, dict) and "results" in memories:
             flattened_memories = [memory["memory"] for memory in memories["results"]]
         else:
             flattened_memories = memories
-        return json.dumps(flattened_memories, indent=2)
+        return format_response(flattened_memories, lines=memory_lines)
     except Exception as e:
         return f"Error searching memories: {str(e)}"
 
 @mcp.tool()
-async def delete_memory(ctx: Context, memory_id: str) -> str:
+@instrument_tool
+@trace_tool
+async def search_memories_batch(ctx: Context, queries: list[str], limit: int = 3, user_id: str = "",
+                                mode: str = "", rerank: bool | None = None) -> str:
+    """Run several semantic searches in one call.
+
+    Use this instead of calling search_memories repeatedly when you need to look up several things at once.
+    Returns one entry per query, in the same order, each with its own results or error.
+
+    Args:
+        ctx: The MCP server provided context which includes the Mem0 client
+        queries: The search queries, each describing what you're looking for in natural language
+        limit: Maximum number of results to return per query (default: 3)
+        user_id: The user whose memories are searched. Leave empty for the user of this connection.
+        mode: The search mode of every query, as for search_memories. Leave empty for the server default.
+        rerank: Whether to rerank each query's candidates, as for search_memories.
+    """
+    try:
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        async with app.tenants.limit(tenant):
+            if has_embedding_cache(app.mem0_client) and (mode or app.search_mode) != "lexical":
+                # One provider request for every query; the searches below then hit the embedding cache
+                await embed_many(app.mem0_client, app.dispatcher, list(dict.fromkeys(queries)))
+
+            results = await asyncio.gather(
+                *(search_and_rerank(app, query, tenant, limit, mode, rerank) for query in queries),
+                return_exceptions=True
+            )
+
+        items = []
+        for query, memories in zip(queries, results):
+            if isinstance(memories, Exception):
+                items.append({"query": query, "error": str(memories)})
+            elif isinstance(memories, dict) and "results" in memories:
+                items.append({"query": query, "results": [memory["memory"] for memory in memories["results"]]})
+            else:
+                items.append({"query": query, "results": memories})
+        return format_response(items)
+    except Exception as e:
+        return f"Error searching memories: {str(e)}"
+
+@mcp.tool()
+@instrument_tool
+@trace_tool
+async def delete_memory(ctx: Context, memory_id: str, user_id: str = "") -> str:
     """Delete a specific memory by its ID.
 
     Use this tool to remove memories that are no longer relevant or accurate.
@@ -174,16 +704,52 @@ async def delete_memory(ctx: Context, memory_id: str) -> str:
     Args:
         ctx: The MCP server provided context which includes the Mem0 client
         memory_id: The unique identifier of the memory to delete
+        user_id: The user the memory belongs to. Leave empty for the user of this connection.
     """
     try:
-        mem0_client = ctx.request_context.lifespan_context.mem0_client
-        result = mem0_client.delete(memory_id, user_id=DEFAULT_USER_ID)
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        async with app.tenants.limit(tenant):
+            await ensure_owned(app, tenant, memory_id)
+            result = await app.dispatcher.run("delete", app.mem0_client.delete, memory_id)
+            memories_removed(app, tenant)
         return f"Successfully deleted memory with ID: {memory_id}"
     except Exception as e:
         return f"Error deleting memory {memory_id}: {str(e)}"
 
 @mcp.tool()
-async def update_memory(ctx: Context, memory_id: str, new_content: str) -> str:
+@instrument_tool
+@trace_tool
+async def delete_memories(ctx: Context, memory_ids: list[str], user_id: str = "") -> str:
+    """Delete several memories by their IDs in one call.
+
+    Use this instead of calling delete_memory repeatedly when cleaning up many memories.
+    Returns one entry per ID saying whether it was deleted.
+
+    Args:
+        ctx: The MCP server provided context which includes the Mem0 client
+        memory_ids: The unique identifiers of the memories to delete
+        user_id: The user the memories belong to. Leave empty for the user of this connection.
+    """
+    try:
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        async with app.tenants.limit(tenant):
+            results = await delete_many(app.mem0_client, app.dispatcher, memory_ids, owner=tenant)
+            memories_removed(app, tenant)
+
+        return format_response([
+            {"id": memory_id, "status": "error", "error": str(result)} if isinstance(result, Exception)
+            else {"id": memory_id, "status": "deleted"}
+            for memory_id, result in zip(memory_ids, results)
+        ])
+    except Exception as e:
+        return f"Error deleting memories: {str(e)}"
+
+@mcp.tool()
+@instrument_tool
+@trace_tool
+async def update_memory(ctx: Context, memory_id: str, new_content: str, user_id: str = "") -> str:
     """Update an existing memory with new content.
 
     Use this tool to modify or correct existing memories while preserving their ID.
@@ -193,16 +759,24 @@ async def update_memory(ctx: Context, memory_id: str, new_content: str) -> str:
         ctx: The MCP server provided context which includes the Mem0 client
         memory_id: The unique identifier of the memory to update
         new_content: The new content to replace the existing memory
+        user_id: The user the memory belongs to. Leave empty for the user of this connection.
     """
     try:
-        mem0_client = ctx.request_context.lifespan_context.mem0_client
-        result = mem0_client.update(memory_id, new_content, user_id=DEFAULT_USER_ID)
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+        async with app.tenants.limit(tenant):
+            await ensure_owned(app, tenant, memory_id)
+            result = await app.dispatcher.run("update", app.mem0_client.update, memory_id, new_content)
+            memories_removed(app, tenant)
         return f"Successfully updated memory {memory_id} with: {new_content[:100]}..." if len(new_content) > 100 else f"Successfully updated memory {memory_id} with: {new_content}"
     except Exception as e:
         return f"Error updating memory {memory_id}: {str(e)}"
 
 @mcp.tool()
-async def find_relationships(ctx: Context, entity: str) -> str:
+@instrument_tool
+@trace_tool
+async def find_relationships(ctx: Context, entity: str, user_id: str = "", depth: int = 1, limit: int = 50,
+                             relationship_types: list[str] | None = None) -> str:
     """Find all relationships and connections for a specific entity (person, organization, etc.).
 
     This tool leverages the graph database to discover how entities are connected.
@@ -211,18 +785,51 @@ async def find_relationships(ctx: Context, entity: str) -> str:
     Args:
         ctx: The MCP server provided context which includes the Mem0 client
         entity: The name of the person, organization, or concept to find relationships for
+        user_id: The user whose memories are searched. Leave empty for the user of this connection.
+        depth: How many hops away from the entity to follow relationships (1 to 3, default: 1)
+        limit: Maximum number of relationships to return, nearest first (default: 50, maximum: 500)
+        relationship_types: Only follow these relationships, e.g. ["works_at", "manages"]. Leave empty for all.
     """
     try:
-        mem0_client = ctx.request_context.lifespan_context.mem0_client
-        
-        # Search for memories containing the entity
-        search_results = mem0_client.search(entity, user_id=DEFAULT_USER_ID, limit=10)
+        app = ctx.request_context.lifespan_context
+        tenant = app.tenants.resolve(ctx, user_id)
+
+        # With a graph store, walk the graph from the entity's node in one query
+        graph = graph_backend(app.mem0_client)
+        if graph is not None:
+            name, matches = entity, []
+            async with app.tenants.limit(tenant):
+                if app.entities:
+                    # Resolve "Acme" or "Alcie" to the node they mean; only the first call per tenant reads the graph
+                    if not app.entities.is_loaded(tenant.scope()):
+                        await app.dispatcher.run("graph", app.entities.load, graph, tenant.scope())
+                    matches = app.entities.lookup(tenant.scope(), entity)
+                    name = matches[0] if matches else entity
+                relationships, truncated = await app.dispatcher.run(
+                    "graph", find_related, graph, name, tenant.scope(), depth, limit, relationship_types
+                )
+            if relationships:
+                response = {
+                    "entity": entity,
+                    "relationships": relationships,
+                    "count": len(relationships),
+                    "truncated": truncated,
+                }
+                if matches and matches[0] != node_name(entity):
+                    response["resolved_entity"] = matches[0]
+                if len(matches) > 1:
+                    response["other_matches"] = matches[1:]
+                return format_response(response, lines=relationship_lines)
+
+        # No graph, or no node with that exact name: search for memories containing the entity
+        async with app.tenants.limit(tenant):
+            search_results = await search_memory(app, entity, tenant, 10)
         
         relationships = []
         if isinstance(search_results, dict) and "relations" in search_results:
             # Extract relationships from search results
             relations = search_results.get("relations", [])
-            entity_lower = entity.lower().replace(" ", "_")
+            entity_lower = node_name(entity)
             
             for relation in relations:
                 source = relation.get("source", "")
@@ -238,11 +845,12 @@ async def find_relationships(ctx: Context, entity: str) -> str:
                     })
         
         if relationships:
-            return json.dumps({
+            return format_response({
                 "entity": entity,
                 "relationships": relationships,
-                "count": len(relationships)
-            }, indent=2)
+                "count": len(relationships),
+                **partial_fields(search_results),
+            }, lines=relationship_lines)
         else:
             # Fallback: search for mentions in memory content
             memories = search_results.get("results", []) if isinstance(search_results, dict) else search_results
@@ -254,15 +862,38 @@ async def find_relationships(ctx: Context, entity: str) -> str:
                     if entity.lower() in memory_text.lower():
                         related_memories.append(memory_text)
             
-            return json.dumps({
+            return format_response({
                 "entity": entity,
                 "related_memories": related_memories,
-                "note": "No structured relationships found, showing related memories instead"
-            }, indent=2)
+                "note": "No structured relationships found, showing related memories instead",
+                **partial_fields(search_results),
+            }, lines=relationship_lines)
             
     except Exception as e:
         return f"Error finding relationships for {entity}: {str(e)}"
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint, served next to the SSE transport."""
+    if not metrics_enabled():
+        return PlainTextResponse("Metrics are disabled (MEM0_METRICS=false)\n", status_code=404)
+    # Rendering reads the SQLite-backed queue and caches
+    return PlainTextResponse(await asyncio.to_thread(REGISTRY.render), media_type=CONTENT_TYPE)
+
+@mcp.resource("mem0://stats/dedup")
+def dedup_stats() -> str:
+    """Saves checked against the duplicate index, duplicates skipped (exact and near) and the estimated time saved."""
+    ctx = mcp.get_context()
+    dedup = ctx.request_context.lifespan_context.dedup
+    if not dedup:
+        return format_response({"status": "disabled"})
+    return format_response(dedup.stats())
+
+@mcp.resource("mem0://stats/connections")
+def connection_stats() -> str:
+    """Connection pool settings and per-backend counters: requests, new connections, TLS handshakes and idle connections."""
+    return format_response(get_connection_pools().snapshot())
+
 async def main():
     transport = os.getenv("TRANSPORT", "sse")
     if transport == 'sse':
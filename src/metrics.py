@@ -0,0 +1,320 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+import functools
+import inspect
+import math
+import os
+import threading
+import time
+
+from tracing import span, tracing_enabled
+
+# Seconds; spans cache hits (sub-millisecond) up to slow LLM extraction calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# The methods timed on each Memory component, by stage name
+STAGE_METHODS = {
+    "llm": ("generate_response",),
+    "embedding": ("embed", "embed_batch"),
+    "vector_store": ("search", "insert", "update", "delete", "get", "list"),
+    # _add_entities is where save_memory's raw mode (fastpath.py) writes relations
+    "graph": ("add", "search", "get_all", "delete_all", "_add_entities"),
+    "cypher": ("query",),
+}
+
+class Metric:
+    """A metric family: one value (or histogram) per combination of label values."""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._series: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """The series for these label values, created on first use. Cache it on hot paths."""
+        series = self._series.get(values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def _label_text(self, values, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, series in sorted(self._series.items()):
+            lines.extend(self._render_series(values, series))
+        return lines
+
+class _Value:
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self.lock:
+            self.value -= amount
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_series(self):
+        return _Value()
+
+    def _render_series(self, values, series):
+        return [f"{self.name}{self._label_text(values)} {_number(series.value)}"]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+class _Buckets:
+    __slots__ = ("counts", "sum", "lock")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def _new_series(self):
+        return _Buckets(len(self.buckets) + 1)
+
+    def observe(self, series: _Buckets, seconds: float):
+        index = bisect_left(self.buckets, seconds)
+        with series.lock:
+            series.counts[index] += 1
+            series.sum += seconds
+
+    def _render_series(self, values, series):
+        with series.lock:
+            counts, total = list(series.counts), series.sum
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, math.inf), counts):
+            cumulative += count
+            le = "+Inf" if bound == math.inf else repr(bound)
+            label_text = self._label_text(values, f'le="{le}"')
+            lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_text(values)} {_number(total)}")
+        lines.append(f"{self.name}_count{self._label_text(values)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Holds the server's metrics and renders them in the Prometheus text format.
+
+    Collectors are callables run at scrape time that return (name, kind, help, samples)
+    tuples, with samples a list of (labels dict, value). They export state that other
+    components already track (dispatcher queues, caches, connection pools) without
+    adding work to the request path.
+    """
+
+    def __init__(self):
+        self._metrics: list[Metric] = []
+        self._collectors: dict[str, object] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, key: str, collector):
+        """Register (or replace) the collector stored under key."""
+        self._collectors[key] = collector
+
+    def remove_collector(self, key: str):
+        self._collectors.pop(key, None)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in list(self._collectors.values()):
+            for name, kind, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_text = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{name}{{{label_text}}} {_number(value)}" if label_text else f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+REGISTRY = MetricsRegistry()
+TOOL_CALLS = REGISTRY.counter("mem0_tool_calls_total", "MCP tool calls by tool and outcome.", ("tool", "status"))
+TOOL_IN_FLIGHT = REGISTRY.gauge("mem0_tool_in_flight", "MCP tool calls currently running.", ("tool",))
+TOOL_DURATION = REGISTRY.histogram("mem0_tool_duration_seconds", "MCP tool call latency.", ("tool",))
+STAGE_DURATION = REGISTRY.histogram(
+    "mem0_stage_duration_seconds",
+    "Latency of the backend calls inside Mem0 operations (LLM, embedding, vector store, graph, Cypher, serialization).",
+    ("stage", "method"),
+)
+STAGE_IN_FLIGHT = REGISTRY.gauge("mem0_stage_in_flight", "Backend calls currently running, by stage.", ("stage", "method"))
+STAGE_ERRORS = REGISTRY.counter("mem0_stage_errors_total", "Backend calls that raised, by stage.", ("stage", "method"))
+
+def metrics_enabled() -> bool:
+    """Whether to time Memory stages and serve /metrics (MEM0_METRICS, defaults to true)."""
+    return os.getenv("MEM0_METRICS", "true").lower() in ("true", "1", "yes")
+
+def instrument_tool(fn):
+    """Record latency, in-flight calls and outcomes of an MCP tool.
+
+    Tools report failures as "Error ..." strings rather than raising, so those count as errors too.
+    """
+    tool = fn.__name__
+    duration, in_flight = TOOL_DURATION.labels(tool), TOOL_IN_FLIGHT.labels(tool)
+    succeeded, failed = TOOL_CALLS.labels(tool, "ok"), TOOL_CALLS.labels(tool, "error")
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        in_flight.inc()
+        outcome = failed
+        try:
+            result = await fn(*args, **kwargs)
+            if not (isinstance(result, str) and result.startswith("Error")):
+                outcome = succeeded
+            return result
+        finally:
+            in_flight.dec()
+            TOOL_DURATION.observe(duration, time.perf_counter() - started)
+            outcome.inc()
+
+    return wrapper
+
+@contextmanager
+def stage(name: str, method: str):
+    """Time a block as one backend call of the given stage."""
+    duration, in_flight = STAGE_DURATION.labels(name, method), STAGE_IN_FLIGHT.labels(name, method)
+    started = time.perf_counter()
+    in_flight.inc()
+    try:
+        with span(f"mem0.{name} {method}", {"mem0.stage": name, "mem0.method": method}):
+            yield
+    except Exception:
+        STAGE_ERRORS.labels(name, method).inc()
+        raise
+    finally:
+        in_flight.dec()
+        STAGE_DURATION.observe(duration, time.perf_counter() - started)
+
+def timed_stage(name: str, method: str | None = None, describe=None):
+    """Decorator timing a sync or async function as one backend call of a stage.
+
+    The call also becomes a child span of the current trace when tracing is on;
+    describe(args, kwargs) can add span attributes, such as the Cypher statement.
+    """
+    def decorate(fn):
+        label = method or fn.__name__
+        duration, in_flight = STAGE_DURATION.labels(name, label), STAGE_IN_FLIGHT.labels(name, label)
+        errors = STAGE_ERRORS.labels(name, label)
+        span_name, static_attributes = f"mem0.{name} {label}", {"mem0.stage": name, "mem0.method": label}
+        perf_counter = time.perf_counter
+
+        def attributes(args, kwargs):
+            if describe is None or not tracing_enabled():
+                return static_attributes
+            return {**static_attributes, **describe(args, kwargs)}
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = perf_counter()
+                in_flight.inc()
+                try:
+                    with span(span_name, attributes(args, kwargs)):
+                        return await fn(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    in_flight.dec()
+                    STAGE_DURATION.observe(duration, perf_counter() - started)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            in_flight.inc()
+            try:
+                with span(span_name, attributes(args, kwargs)):
+                    return fn(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                in_flight.dec()
+                STAGE_DURATION.observe(duration, perf_counter() - started)
+        return wrapper
+    return decorate
+
+def _describe_cypher(args, kwargs) -> dict:
+    statement = args[0] if args else kwargs.get("query", "")
+    return {"db.system": "neo4j", "db.statement": " ".join(str(statement).split())[:2000]}
+
+def instrument_component(component, name: str, methods, describe=None):
+    """Time the given methods of a Memory component by replacing them on the instance."""
+    for method in methods:
+        bound = getattr(component, method, None)
+        if callable(bound) and not getattr(bound, "_mem0_stage", False):
+            wrapped = timed_stage(name, method, describe)(bound)
+            wrapped._mem0_stage = True
+            setattr(component, method, wrapped)
+    return component
+
+def install_metrics(memory):
+    """Time the LLM, embedding, vector store, graph and Cypher calls of a Memory or NativeAsyncMemory client.
+
+    Backends run through a ThreadedAdapter are timed on the worker thread, so their stage
+    time excludes the wait for a free worker (the dispatcher reports that separately).
+    """
+    from async_backend import ThreadedAdapter
+
+    components = {"llm": "llm", "embedding": "embedding_model", "vector_store": "vector_store", "graph": "graph"}
+    for name, attribute in components.items():
+        component = getattr(memory, attribute, None)
+        if isinstance(component, ThreadedAdapter):
+            component = component.backend
+        if component is None:
+            continue
+        instrument_component(component, name, STAGE_METHODS[name])
+        if name == "graph":
+            # The graph memory makes its own entity extraction and embedding calls, and the Neo4j queries
+            for inner, inner_name in (("llm", "llm"), ("embedding_model", "embedding"), ("graph", "cypher")):
+                if getattr(component, inner, None) is not None:
+                    instrument_component(getattr(component, inner), inner_name, STAGE_METHODS[inner_name],
+                                         _describe_cypher if inner_name == "cypher" else None)
+    return memory
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+import base64
+import json
+
+from mem0.vector_stores.qdrant import Qdrant
+
+from async_backend import _format_memory
+
+DEFAULT_FIELDS = ("id", "memory", "created_at", "updated_at")
+MAX_PAGE_SIZE = 500
+# Stores with neither a cursor nor a table to page through are listed whole, up to this many memories
+UNPAGED_LIMIT = 10000
+
+@dataclass
+class _Record:
+    id: str
+    payload: dict
+
+def encode_cursor(offset) -> str | None:
+    """Turn a vector store offset into the opaque cursor handed to clients."""
+    if offset is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode()
+
+def decode_cursor(cursor: str):
+    """Return the vector store offset encoded in a cursor, or None for the first page."""
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))["offset"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+async def _scroll(memory, dispatcher, filters: dict, limit: int, offset):
+    """Read one page of raw records and the offset of the next page (None at the end)."""
+    vector_store = memory.vector_store
+    if isinstance(vector_store, Qdrant):
+        return await dispatcher.run(
+            "get_all", vector_store.client.scroll,
+            collection_name=vector_store.collection_name,
+            scroll_filter=vector_store._create_filter(filters) if filters else None,
+            limit=limit,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False,
+        )
+    if hasattr(vector_store, "scroll"):
+        return await dispatcher.run("get_all", vector_store.scroll, filters=filters, limit=limit, offset=offset)
+    if hasattr(getattr(vector_store, "collection", None), "table"):
+        return await dispatcher.run("get_all", _scroll_table, vector_store.collection, filters, limit, offset)
+
+    # Any other store is not paginated: one list call returns every memory as a single page
+    listed = await dispatcher.run("get_all", vector_store.list, filters=filters, limit=UNPAGED_LIMIT)
+    records = listed[0] if isinstance(listed, (tuple, list)) and len(listed) > 0 else listed
+    return records, None
+
+def _scroll_table(collection, filters: dict, limit: int, after):
+    """Keyset page of a vecs (Supabase) collection: the rows after id `after`, in id order.
+
+    vecs only lists by similarity to a query vector, so the table is read directly.
+    """
+    from sqlalchemy import select
+
+    table = collection.table
+    query = select(table.c.id, table.c.metadata).order_by(table.c.id).limit(limit + 1)
+    if filters:
+        query = query.where(table.c.metadata.contains(filters))
+    if after is not None:
+        query = query.where(table.c.id > after)
+    with collection.client.Session() as session:
+        rows = session.execute(query).fetchall()
+    records = [_Record(id=str(row[0]), payload=row[1]) for row in rows[:limit]]
+    return records, records[-1].id if len(rows) > limit else None
+
+def project(memory: dict, fields) -> dict:
+    """Keep only the requested fields of a formatted memory."""
+    return {field: memory.get(field) for field in fields}
+
+async def fetch_page(memory, dispatcher, scope: dict, cursor: str = "", page_size: int = 100,
+                     fields=DEFAULT_FIELDS) -> tuple[list[dict], str | None]:
+    """Return one page of a tenant's memories and the cursor for the next page.
+
+    Args:
+        memory: The Mem0 client (mem0.Memory or NativeAsyncMemory)
+        dispatcher: The MemoryDispatcher that runs the vector store calls
+        scope: The user_id (and agent_id/run_id) whose memories are listed
+        cursor: The cursor returned with the previous page, or empty for the first page
+        page_size: Number of memories per page, capped at MAX_PAGE_SIZE
+        fields: The memory fields to return
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    records, next_offset = await _scroll(memory, dispatcher, scope, page_size, decode_cursor(cursor))
+    return [project(_format_memory(record), fields) for record in records], encode_cursor(next_offset)
+
+async def iter_memories(memory, dispatcher, scope: dict, page_size: int = 100, fields=DEFAULT_FIELDS):
+    """Yield every memory of a tenant, holding at most one page in memory at a time."""
+    cursor = ""
+    while True:
+        page, cursor = await fetch_page(memory, dispatcher, scope, cursor, page_size, fields)
+        for item in page:
+            yield item
+        if cursor is None:
+            return
@@ -0,0 +1,287 @@
+from dataclasses import asdict, dataclass
+import logging
+import os
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PoolSettings:
+    """Connection settings shared by every backend client."""
+    max_connections: int = 100
+    max_keepalive: int = 20
+    keepalive_expiry: float = 120.0
+    connect_timeout: float = 5.0
+    timeout: float = 60.0
+    http2: bool = False
+    qdrant_grpc: bool = False
+    qdrant_grpc_port: int = 6334
+    neo4j_pool_size: int = 50
+    neo4j_acquisition_timeout: float = 30.0
+    neo4j_max_lifetime: float = 3600.0
+
+@dataclass
+class PoolStats:
+    """Counters for one backend's HTTP connection pool."""
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+    connect_seconds: float = 0.0
+    tls_seconds: float = 0.0
+
+class _ConnectionTracer:
+    """httpcore trace callback counting new connections and TLS handshakes and the time they take."""
+
+    def __init__(self, stats: PoolStats, lock: threading.Lock):
+        self.stats = stats
+        self.lock = lock
+        self._started: dict[str, float] = {}
+
+    def __call__(self, event: str, info: dict):
+        step, _, phase = event.rpartition(".")
+        if step not in ("connection.connect_tcp", "connection.start_tls"):
+            return
+        if phase == "started":
+            self._started[step] = time.perf_counter()
+            return
+        elapsed = time.perf_counter() - self._started.pop(step, time.perf_counter())
+        if phase != "complete":
+            return
+        with self.lock:
+            if step == "connection.connect_tcp":
+                self.stats.connections_opened += 1
+                self.stats.connect_seconds += elapsed
+            else:
+                self.stats.tls_handshakes += 1
+                self.stats.tls_seconds += elapsed
+
+class _AsyncConnectionTracer(_ConnectionTracer):
+    async def __call__(self, event: str, info: dict):
+        super().__call__(event, info)
+
+class TracedTransport(httpx.HTTPTransport):
+    """A pooled HTTP transport that records connection setup in a PoolStats."""
+
+    def __init__(self, stats: PoolStats, lock: threading.Lock, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+        self.lock = lock
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.stats.requests += 1
+        request.extensions = {**request.extensions, "trace": _ConnectionTracer(self.stats, self.lock)}
+        return super().handle_request(request)
+
+class AsyncTracedTransport(httpx.AsyncHTTPTransport):
+    """The asyncio counterpart of TracedTransport."""
+
+    def __init__(self, stats: PoolStats, lock: threading.Lock, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+        self.lock = lock
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.stats.requests += 1
+        request.extensions = {**request.extensions, "trace": _AsyncConnectionTracer(self.stats, self.lock)}
+        return await super().handle_async_request(request)
+
+class ConnectionPools:
+    """One place that sizes, times out and keeps alive the connections of every backend.
+
+    Each backend (llm, embedder, qdrant, ...) gets its own pooled transport so its metrics
+    can be told apart, and clients for the same backend share it. Keep-alive connections
+    are reused across tool calls, so a search only pays for TCP and TLS setup when the pool
+    has no idle connection left.
+    """
+
+    def __init__(self, settings: PoolSettings):
+        self.settings = settings
+        self._stats: dict[str, PoolStats] = {}
+        self._transports: dict[tuple[str, bool], httpx.BaseTransport | httpx.AsyncBaseTransport] = {}
+        self._lock = threading.Lock()
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.settings.max_connections,
+            max_keepalive_connections=self.settings.max_keepalive,
+            keepalive_expiry=self.settings.keepalive_expiry,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.settings.timeout, connect=self.settings.connect_timeout)
+
+    def _http2(self) -> bool:
+        if not self.settings.http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("MEM0_HTTP2 is set but the h2 package is missing; using HTTP/1.1")
+            return False
+        return True
+
+    def transport(self, backend: str, asynchronous: bool = False):
+        """The shared pooled transport of a backend, created on first use."""
+        with self._lock:
+            key = (backend, asynchronous)
+            if key not in self._transports:
+                stats = self._stats.setdefault(backend, PoolStats())
+                transport_class = AsyncTracedTransport if asynchronous else TracedTransport
+                self._transports[key] = transport_class(stats, self._lock, limits=self.limits(), http2=self._http2())
+            return self._transports[key]
+
+    def http_client(self, backend: str, **kwargs) -> httpx.Client:
+        return httpx.Client(transport=self.transport(backend), timeout=self.timeout(), **kwargs)
+
+    def async_http_client(self, backend: str, **kwargs) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=self.transport(backend, asynchronous=True), timeout=self.timeout(), **kwargs)
+
+    def pool_client(self, client, backend: str, asynchronous: bool = False):
+        """Return an equivalent LLM or embedder SDK client that uses the backend's pooled transport.
+
+        OpenAI-compatible clients (OpenAI, OpenRouter, Gemini) are copied with a pooled
+        http_client; Ollama clients are rebuilt on the same host. Other clients are returned as is.
+        """
+        import openai
+
+        if isinstance(client, (openai.OpenAI, openai.AsyncOpenAI)):
+            http_client = self.async_http_client(backend) if asynchronous else self.http_client(backend)
+            return client.with_options(http_client=http_client, timeout=self.timeout())
+        try:
+            import ollama
+        except ImportError:
+            return client
+        if isinstance(client, (ollama.Client, ollama.AsyncClient)):
+            return type(client)(
+                host=str(client._client.base_url),
+                transport=self.transport(backend, asynchronous),
+                timeout=self.timeout(),
+            )
+        return client
+
+    def qdrant_kwargs(self, asynchronous: bool = False) -> dict:
+        """Extra QdrantClient / AsyncQdrantClient arguments: pooled REST transport, or gRPC when enabled."""
+        if self.settings.qdrant_grpc:
+            return {
+                "prefer_grpc": True,
+                "grpc_port": self.settings.qdrant_grpc_port,
+                "timeout": int(self.settings.timeout),
+                # Ping idle channels so a quiet server does not find its connection dropped by a proxy
+                "grpc_options": {
+                    "grpc.keepalive_time_ms": int(self.settings.keepalive_expiry * 1000),
+                    "grpc.keepalive_permit_without_calls": 1,
+                },
+            }
+        # qdrant-client disables keep-alive for localhost unless it is given limits explicitly
+        return {
+            "transport": self.transport("qdrant", asynchronous),
+            "limits": self.limits(),
+            "http2": self._http2(),
+            "timeout": int(self.settings.timeout),
+        }
+
+    def neo4j_driver_config(self) -> dict:
+        """Keyword arguments for neo4j.GraphDatabase.driver."""
+        return {
+            "max_connection_pool_size": self.settings.neo4j_pool_size,
+            "connection_acquisition_timeout": self.settings.neo4j_acquisition_timeout,
+            "max_connection_lifetime": self.settings.neo4j_max_lifetime,
+            "connection_timeout": self.settings.connect_timeout,
+            "keep_alive": True,
+        }
+
+    def qdrant_client(self, config: dict, asynchronous: bool = False):
+        """A QdrantClient (or AsyncQdrantClient) for mem0's Qdrant config that uses these pool settings."""
+        from qdrant_client import AsyncQdrantClient, QdrantClient
+
+        params = {key: config[key] for key in ("url", "host", "port", "api_key") if config.get(key)}
+        client_class = AsyncQdrantClient if asynchronous else QdrantClient
+        return client_class(**params, **self.qdrant_kwargs(asynchronous))
+
+    def pool_memory(self, memory):
+        """Move a mem0 Memory's LLM, embedder, Qdrant and Neo4j clients onto the shared pools."""
+        for backend, component in (("llm", memory.llm), ("embedder", memory.embedding_model)):
+            if hasattr(component, "client"):
+                component.client = self.pool_client(component.client, backend)
+        if memory.config.vector_store.provider == "qdrant" and hasattr(memory.vector_store, "client"):
+            old_client = memory.vector_store.client
+            memory.vector_store.client = self.qdrant_client(memory.config.vector_store.config.model_dump())
+            old_client.close()
+        if getattr(memory, "graph", None) is not None:
+            self.pool_graph(memory.graph)
+        return memory
+
+    def pool_graph(self, graph_memory):
+        """Give mem0's graph memory a Neo4j driver and LLM/embedder clients sized by these settings."""
+        graph = graph_memory.graph
+        driver = getattr(graph, "_driver", None)
+        if driver is not None:
+            import neo4j
+
+            config = graph_memory.config.graph_store.config
+            graph._driver = neo4j.GraphDatabase.driver(
+                config.url, auth=(config.username, config.password),
+                notifications_min_severity="OFF", **self.neo4j_driver_config(),
+            )
+            driver.close()
+        for backend, component in (("llm", graph_memory.llm), ("embedder", graph_memory.embedding_model)):
+            if hasattr(component, "client"):
+                component.client = self.pool_client(component.client, backend)
+        return graph_memory
+
+    def snapshot(self) -> dict:
+        """Per-backend request and connection setup counters, with open and idle connection counts."""
+        with self._lock:
+            stats = {backend: asdict(backend_stats) for backend, backend_stats in self._stats.items()}
+            transports = list(self._transports.items())
+        for (backend, _), transport in transports:
+            connections = getattr(getattr(transport, "_pool", None), "connections", [])
+            entry = stats[backend]
+            entry["open_connections"] = entry.get("open_connections", 0) + len(connections)
+            entry["idle_connections"] = entry.get("idle_connections", 0) + sum(
+                connection.is_idle() for connection in connections
+            )
+        for entry in stats.values():
+            requests = entry["requests"]
+            # Share of requests that had to open a new connection instead of reusing a kept-alive one
+            entry["new_connection_rate"] = entry["connections_opened"] / requests if requests else 0.0
+        return {"settings": asdict(self.settings), "backends": stats}
+
+    def close(self):
+        """Close the pooled sync connections; async ones are closed with the clients that own them."""
+        with self._lock:
+            transports, self._transports = self._transports, {}
+        for (_, asynchronous), transport in transports.items():
+            if not asynchronous:
+                transport.close()
+
+def get_pool_settings() -> PoolSettings:
+    """Read the pooling settings from the environment."""
+    defaults = PoolSettings()
+    return PoolSettings(
+        max_connections=int(os.getenv("MEM0_HTTP_MAX_CONNECTIONS", defaults.max_connections)),
+        max_keepalive=int(os.getenv("MEM0_HTTP_MAX_KEEPALIVE", defaults.max_keepalive)),
+        keepalive_expiry=float(os.getenv("MEM0_HTTP_KEEPALIVE_EXPIRY", defaults.keepalive_expiry)),
+        connect_timeout=float(os.getenv("MEM0_HTTP_CONNECT_TIMEOUT", defaults.connect_timeout)),
+        timeout=float(os.getenv("MEM0_HTTP_TIMEOUT", defaults.timeout)),
+        http2=os.getenv("MEM0_HTTP2", "false").lower() in ("true", "1", "yes"),
+        qdrant_grpc=os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("true", "1", "yes"),
+        qdrant_grpc_port=int(os.getenv("QDRANT_GRPC_PORT", defaults.qdrant_grpc_port)),
+        neo4j_pool_size=int(os.getenv("NEO4J_MAX_POOL_SIZE", defaults.neo4j_pool_size)),
+        neo4j_acquisition_timeout=float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", defaults.neo4j_acquisition_timeout)),
+        neo4j_max_lifetime=float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", defaults.neo4j_max_lifetime)),
+    )
+
+_pools: ConnectionPools | None = None
+
+def get_connection_pools() -> ConnectionPools:
+    """The process-wide ConnectionPools, built from the environment on first use."""
+    global _pools
+    if _pools is None:
+        _pools = ConnectionPools(get_pool_settings())
+    return _pools
@@ -0,0 +1,180 @@
+import os
+
+import numpy as np
+
+QUANTIZATION_MODES = ("none", "int8", "binary", "pq")
+# Small enough that the float copy of a chunk of codes stays in cache
+CHUNK_ROWS = 1024
+# Set bits of every byte value, for numpy before 2.0, which has no bitwise_count
+BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+def get_quantization_settings() -> tuple[str, int]:
+    """Read the vector quantization mode and the re-ranking oversampling factor from the environment."""
+    mode = os.getenv("VECTOR_STORE_QUANTIZATION", "none")
+    if mode not in QUANTIZATION_MODES:
+        mode = "none"
+    return mode, int(os.getenv("VECTOR_STORE_RERANK", "10"))
+
+class ScalarQuantizer:
+    """int8 scalar quantization with a per-dimension range learned from a sample (4x smaller)."""
+
+    kind = "int8"
+
+    def __init__(self, low: np.ndarray, scale: np.ndarray):
+        self.low = low.astype(np.float32)
+        self.scale = scale.astype(np.float32)
+        self.code_width, self.code_dtype = len(low), np.int8
+
+    @classmethod
+    def train(cls, sample: np.ndarray) -> "ScalarQuantizer":
+        # Clip the extreme 0.1% so a few outliers do not waste the 256 levels
+        low = np.quantile(sample, 0.001, axis=0)
+        high = np.quantile(sample, 0.999, axis=0)
+        return cls(low, np.maximum(high - low, 1e-6) / 255)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        levels = np.clip(np.rint((vectors - self.low) / self.scale), 0, 255)
+        return (levels - 128).astype(np.int8)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        # x ≈ low + (code + 128) * scale, so q·x ≈ q·low + (q * scale)·(code + 128)
+        weighted = query * self.scale
+        offset = float(query @ self.low) + 128 * float(weighted.sum())
+        return codes.astype(np.float32) @ weighted + offset
+
+    def state(self) -> dict:
+        return {"low": self.low, "scale": self.scale}
+
+class BinaryQuantizer:
+    """One sign bit per dimension (32x smaller), compared by Hamming distance."""
+
+    kind = "binary"
+
+    def __init__(self, dims: int):
+        self.dims = dims
+        # Packed bits are padded to whole 64-bit words so distances are computed a word at a time
+        self.code_width, self.code_dtype = (dims + 63) // 64 * 8, np.uint8
+
+    @classmethod
+    def train(cls, sample: np.ndarray) -> "BinaryQuantizer":
+        return cls(sample.shape[1])
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        bits = np.packbits(np.asarray(vectors) > 0, axis=1)
+        codes = np.zeros((len(bits), self.code_width), dtype=np.uint8)
+        codes[:, :bits.shape[1]] = bits
+        return codes
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        query_codes = self.encode(query[None, :])
+        if hasattr(np, "bitwise_count"):
+            words = np.ascontiguousarray(codes).view(np.uint64)
+            distance = np.bitwise_count(words ^ query_codes.view(np.uint64)).sum(axis=1, dtype=np.int32)
+        else:
+            distance = BYTE_POPCOUNT[codes ^ query_codes].sum(axis=1, dtype=np.int32)
+        return (self.dims - 2 * distance).astype(np.float32)
+
+    def state(self) -> dict:
+        return {"dims": np.array(self.dims)}
+
+class ProductQuantizer:
+    """Product quantization: 256 k-means centroids per 8-dimension subvector, one byte each (32x smaller)."""
+
+    kind = "pq"
+    subvector_dims = 8
+
+    def __init__(self, centroids: np.ndarray, dims: int):
+        self.centroids = centroids.astype(np.float32)
+        self.dims = dims
+        self.code_width, self.code_dtype = len(centroids), np.uint8
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        padded = self.code_width * self.subvector_dims
+        if vectors.shape[1] < padded:
+            vectors = np.pad(vectors, ((0, 0), (0, padded - vectors.shape[1])))
+        return vectors.reshape(len(vectors), -1, self.subvector_dims)
+
+    @classmethod
+    def train(cls, sample: np.ndarray, iterations: int = 8, seed: int = 0) -> "ProductQuantizer":
+        rng = np.random.default_rng(seed)
+        # About 40 points per centroid is enough for stable codebooks
+        if len(sample) > 40 * 256:
+            sample = sample[rng.choice(len(sample), size=40 * 256, replace=False)]
+        dims = sample.shape[1]
+        subspaces = (dims + cls.subvector_dims - 1) // cls.subvector_dims
+        padded = np.pad(sample, ((0, 0), (0, subspaces * cls.subvector_dims - dims)))
+        split = padded.reshape(len(sample), subspaces, cls.subvector_dims)
+        clusters = min(256, len(sample))
+        centroids = np.zeros((subspaces, 256, cls.subvector_dims), dtype=np.float32)
+        for subspace in range(subspaces):
+            points = np.ascontiguousarray(split[:, subspace, :])
+            centers = points[rng.choice(len(points), size=clusters, replace=False)].copy()
+            for _ in range(iterations):
+                # |p|² is the same for every centroid, so it is left out of the argmin
+                distances = (centers ** 2).sum(1)[None, :] - 2 * points @ centers.T
+                assignments = np.argmin(distances, axis=1)
+                sums = np.stack([np.bincount(assignments, weights=points[:, dim], minlength=clusters)
+                                 for dim in range(cls.subvector_dims)], axis=1)
+                counts = np.bincount(assignments, minlength=clusters)[:, None]
+                centers = np.where(counts > 0, sums / np.maximum(counts, 1), centers).astype(np.float32)
+            centroids[subspace, :clusters] = centers
+        return cls(centroids, dims)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        split = self._split(vectors)
+        codes = np.empty((len(split), self.code_width), dtype=np.uint8)
+        for subspace in range(self.code_width):
+            points, centers = np.ascontiguousarray(split[:, subspace, :]), self.centroids[subspace]
+            distances = (centers ** 2).sum(1)[None, :] - 2 * points @ centers.T
+            codes[:, subspace] = np.argmin(distances, axis=1)
+        return codes
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        # Asymmetric distance: the query stays exact, each code byte looks up a precomputed partial dot product
+        table = np.einsum("skd,sd->sk", self.centroids, self._split(query[None, :])[0])
+        offsets = np.arange(self.code_width, dtype=np.intp) * 256
+        return np.take(table.ravel(), codes + offsets).sum(axis=1)
+
+    def state(self) -> dict:
+        return {"centroids": self.centroids, "dims": np.array(self.dims)}
+
+QUANTIZERS = {quantizer.kind: quantizer for quantizer in (ScalarQuantizer, BinaryQuantizer, ProductQuantizer)}
+
+def load_quantizer(kind: str, state: dict):
+    """Rebuild a trained quantizer from the arrays returned by its state()."""
+    if kind == "int8":
+        return ScalarQuantizer(state["low"], state["scale"])
+    if kind == "binary":
+        return BinaryQuantizer(int(state["dims"]))
+    return ProductQuantizer(state["centroids"], int(state["dims"]))
+
+def approximate_scores(quantizer, codes: np.ndarray, slots: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Score the given slots from their codes, a chunk at a time."""
+    scores = np.empty(len(slots), dtype=np.float32)
+    for start in range(0, len(slots), CHUNK_ROWS):
+        chunk = slots[start:start + CHUNK_ROWS]
+        scores[start:start + len(chunk)] = quantizer.scores(codes[chunk], query)
+    return scores
+
+def qdrant_quantization_config(mode: str):
+    """The Qdrant collection setting for a quantization mode, or None for "none"."""
+    from qdrant_client import models
+
+    if mode == "int8":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if mode == "binary":
+        return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+    if mode == "pq":
+        return models.ProductQuantization(
+            product=models.ProductQuantizationConfig(compression=models.CompressionRatio.X32, always_ram=True)
+        )
+    return None
+
+def apply_qdrant_quantization(client, collection_name: str, mode: str):
+    """Enable quantization on an existing Qdrant collection; Qdrant re-scores with the original vectors."""
+    quantization_config = qdrant_quantization_config(mode)
+    if quantization_config is not None:
+        client.update_collection(collection_name=collection_name, quantization_config=quantization_config)
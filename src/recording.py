@@ -0,0 +1,69 @@
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+
+from tenancy import TENANT_HEADERS
+
+class SessionRecorder:
+    """Appends every tool call the server receives to a JSON lines file, for replay by loadgen.py.
+
+    Each line holds the MCP session it came from, its start time relative to the session's
+    first call, the tool name and arguments, the tenant headers of the connection, and how
+    long the call took. Arguments are recorded as sent, memory text included, so treat the
+    file like the memories themselves.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.calls = 0
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+        # session object -> (recorded session ID, time of its first call); weak so closed sessions drop out
+        self._sessions = weakref.WeakKeyDictionary()
+
+    def start(self, request_context) -> dict:
+        """Note the start of a call; pass the returned dict to finish()."""
+        now = time.time()
+        session = getattr(request_context, "session", None)
+        if session is None:
+            session_id, started = "unknown", now
+        else:
+            session_id, started = self._sessions.setdefault(session, (uuid.uuid4().hex[:12], now))
+        headers = getattr(getattr(request_context, "request", None), "headers", None) or {}
+        return {
+            "session": session_id,
+            "offset": round(now - started, 4),
+            "headers": {header: headers[header] for header in TENANT_HEADERS.values() if headers.get(header)},
+            "_started": time.perf_counter(),
+        }
+
+    def finish(self, entry: dict, tool: str, arguments: dict, error: bool):
+        """Write the completed call."""
+        record = {
+            "session": entry["session"],
+            "offset": entry["offset"],
+            "tool": tool,
+            "arguments": arguments,
+            "headers": entry["headers"],
+            "duration_ms": round((time.perf_counter() - entry["_started"]) * 1000, 3),
+            "error": error,
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.calls += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def get_session_recorder() -> SessionRecorder | None:
+    """Build the recorder when MEM0_RECORD_SESSIONS names a file."""
+    path = os.getenv("MEM0_RECORD_SESSIONS")
+    if not path:
+        return None
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return SessionRecorder(path)
@@ -0,0 +1,124 @@
+import math
+import os
+import re
+
+from embeddings import AsyncMicroBatcher
+
+RERANKERS = ("none", "overlap", "cross-encoder")
+DEFAULT_CROSS_ENCODER = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+TERM = re.compile(r"[^\W_]+")
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "do", "does", "did", "what", "which", "who", "whom", "where",
+    "when", "how", "why", "of", "in", "on", "at", "to", "for", "with", "and", "or", "my", "me", "i", "about", "by",
+}
+
+def stem(term: str) -> str:
+    """A crude suffix stripper, enough for "live"/"lives"/"living"/"lived" to meet."""
+    for suffix in ("ing", "ed", "s"):
+        if term.endswith(suffix) and not term.endswith("ss") and len(term) - len(suffix) >= 3:
+            term = term[:-len(suffix)]
+            break
+    return term[:-1] if term.endswith("e") and len(term) > 3 else term
+
+def terms(text: str) -> list[str]:
+    return [stem(term) for term in TERM.findall(text.casefold()) if term not in STOPWORDS]
+
+class OverlapScorer:
+    """Scores candidates by the query terms they contain, weighted by how rare each term is among them.
+
+    The candidates stand in for the corpus when computing BM25-style IDF, so terms every
+    candidate shares (the reason they were all retrieved) count for little, and the terms
+    that single one out count for most. Query word pairs found side by side score extra.
+    Pure Python, no model, well under a millisecond for a few dozen candidates.
+    """
+
+    def score_many(self, requests: list[tuple[str, list[str]]]) -> list[list[float]]:
+        return [self.score(query, texts) for query, texts in requests]
+
+    def score(self, query: str, texts: list[str]) -> list[float]:
+        query_terms = list(dict.fromkeys(terms(query)))
+        if not query_terms or not texts:
+            return [0.0] * len(texts)
+        documents = [terms(text) for text in texts]
+        present = [set(document) for document in documents]
+        idf = {
+            term: math.log(1 + (len(texts) - df + 0.5) / (df + 0.5))
+            for term in query_terms
+            for df in [sum(term in document for document in present)]
+        }
+        total = sum(idf.values()) or 1.0
+        pairs = list(zip(query_terms, query_terms[1:]))
+        scores = []
+        for document, words in zip(documents, present):
+            score = sum(idf[term] for term in query_terms if term in words)
+            adjacent = set(zip(document, document[1:]))
+            score += 0.5 * sum(idf[first] + idf[second] for first, second in pairs if (first, second) in adjacent)
+            scores.append(score / total)
+        return scores
+
+class CrossEncoderScorer:
+    """Scores (query, memory) pairs with a small sentence-transformers cross-encoder on the CPU."""
+
+    def __init__(self, model_name: str = DEFAULT_CROSS_ENCODER):
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            raise ImportError("MEM0_RERANKER=cross-encoder needs sentence-transformers: pip install sentence-transformers")
+        self.model = CrossEncoder(model_name, device="cpu")
+
+    def score_many(self, requests: list[tuple[str, list[str]]]) -> list[list[float]]:
+        # One forward pass over the pairs of every query in the batch
+        pairs = [(query, text) for query, texts in requests for text in texts]
+        flat = [float(score) for score in self.model.predict(pairs)] if pairs else []
+        scores, start = [], 0
+        for _, texts in requests:
+            scores.append(flat[start:start + len(texts)])
+            start += len(texts)
+        return scores
+
+class Reranker:
+    """Reorders over-fetched search candidates, batching the scoring of concurrent searches.
+
+    Searches running at the same moment are scored together: their requests are collected
+    for up to `window` seconds (or `max_batch` requests) and scored in one call on the
+    dispatcher's worker pool, so a cross-encoder runs one forward pass for all of them.
+    """
+
+    def __init__(self, scorer, dispatcher, candidates: int = 20, window: float = 0.002, max_batch: int = 32):
+        self.scorer = scorer
+        self.dispatcher = dispatcher
+        self.candidates = candidates
+        self.batcher = AsyncMicroBatcher(self._score_batch, window, max_batch)
+
+    async def _score_batch(self, requests):
+        return await self.dispatcher.run("rerank", self.scorer.score_many, requests)
+
+    async def rerank(self, query: str, memories: list[dict], limit: int) -> list[dict]:
+        """The `limit` best memories by rerank score; ties keep their retrieval order."""
+        if not memories:
+            return []
+        scores = await self.batcher.submit((query, [memory["memory"] for memory in memories]))
+        ranked = sorted(zip(memories, scores), key=lambda pair: -pair[1])
+        return [{**memory, "rerank_score": round(score, 4)} for memory, score in ranked[:limit]]
+
+    def stats(self) -> dict:
+        return {"candidates": self.candidates, **self.batcher.stats()}
+
+def get_reranker(dispatcher) -> Reranker | None:
+    """Build the reranker named by MEM0_RERANKER (none, overlap or cross-encoder); None when off."""
+    name = os.getenv("MEM0_RERANKER", "none").lower()
+    if name not in RERANKERS:
+        raise ValueError(f"MEM0_RERANKER must be one of {', '.join(RERANKERS)}")
+    if name == "none":
+        return None
+    if name == "overlap":
+        scorer = OverlapScorer()
+    else:
+        scorer = CrossEncoderScorer(os.getenv("MEM0_RERANK_MODEL", DEFAULT_CROSS_ENCODER))
+    return Reranker(
+        scorer,
+        dispatcher,
+        candidates=int(os.getenv("MEM0_RERANK_CANDIDATES", "20")),
+        window=float(os.getenv("MEM0_RERANK_BATCH_WINDOW_MS", "2")) / 1000,
+        max_batch=int(os.getenv("MEM0_RERANK_MAX_BATCH", "32")),
+    )
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import os
+import threading
+import time
+
+import numpy as np
+
+from dedup import NUMBER
+from embeddings import normalize_text
+from lexical import looks_like_identifier
+
+@dataclass
+class CachedSearch:
+    query: str
+    vector: np.ndarray | None
+    numbers: tuple[str, ...]
+    generation: int
+    result: object
+    created_at: float
+
+class SearchResultCache:
+    """Caches search_memories results until the user's memories change.
+
+    Entries are partitioned by (user_id, scope, limit), where scope narrows a user's searches
+    to an agent or run. A lookup first tries the normalized query text, then the nearest
+    cached query embedding above `threshold` cosine similarity, among cached queries with the
+    same numbers; identifier queries only ever match exactly. Every write for a user bumps
+    that user's generation counter, which invalidates all of their cached results at once.
+    At most `max_partitions` partitions are kept, least recently used first out, so many
+    tenants share a bounded cache without evicting each other's entries inside a partition.
+    """
+
+    def __init__(self, threshold: float = 0.97, ttl: float = 300.0, max_entries: int = 256,
+                 max_partitions: int = 1024):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_partitions = max_partitions
+        self.hits = 0
+        self.misses = 0
+        self._generations: dict[str, int] = {}
+        self._partitions: OrderedDict[tuple[str, str, int], OrderedDict[str, CachedSearch]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def generation(self, user_id: str) -> int:
+        return self._generations.get(user_id, 0)
+
+    def invalidate(self, user_id: str):
+        """Called after any write for user_id; drops every cached result for that user."""
+        with self._lock:
+            self._generations[user_id] = self.generation(user_id) + 1
+            for key in [key for key in self._partitions if key[0] == user_id]:
+                del self._partitions[key]
+
+    def _live(self, entry: CachedSearch, user_id: str, now: float) -> bool:
+        return entry.generation == self.generation(user_id) and now - entry.created_at < self.ttl
+
+    def _partition(self, user_id: str, scope: str, limit: int) -> OrderedDict | None:
+        partition = self._partitions.get((user_id, scope, limit))
+        if partition is not None:
+            self._partitions.move_to_end((user_id, scope, limit))
+        return partition
+
+    def get_exact(self, user_id: str, limit: int, query: str, scope: str = ""):
+        """Return the cached result for this exact (normalized) query, or None."""
+        with self._lock:
+            partition = self._partition(user_id, scope, limit)
+            entry = partition.get(normalize_text(query)) if partition else None
+            if entry is not None and self._live(entry, user_id, time.time()):
+                partition.move_to_end(entry.query)
+                self.hits += 1
+                return entry.result
+        return None
+
+    @staticmethod
+    def near_matchable(query: str) -> bool:
+        """Whether a query may be answered by a similar one: "ticket 1234" and "ticket 1235" embed alike."""
+        return not looks_like_identifier(query)
+
+    def get_similar(self, user_id: str, limit: int, query: str, vector, scope: str = "") -> object | None:
+        """Return the result of the most similar cached query above the threshold, or None.
+
+        Only cached queries with the same numbers as this one are compared, and identifier
+        queries are never answered this way.
+        """
+        if not self.near_matchable(query):
+            return None
+        query_vector = _unit(vector)
+        numbers = _numbers(query)
+        now = time.time()
+        with self._lock:
+            partition = self._partition(user_id, scope, limit)
+            candidates = [
+                entry for entry in (partition or {}).values()
+                if entry.vector is not None and entry.numbers == numbers and self._live(entry, user_id, now)
+            ]
+            if candidates:
+                similarities = np.stack([entry.vector for entry in candidates]) @ query_vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    partition.move_to_end(candidates[best].query)
+                    self.hits += 1
+                    return candidates[best].result
+        return None
+
+    def miss(self):
+        """Count a search the cache could not answer, by exact or similar query."""
+        with self._lock:
+            self.misses += 1
+
+    def put(self, user_id: str, limit: int, query: str, vector, result, generation: int, scope: str = ""):
+        """Cache a result computed while the user's generation was `generation`."""
+        with self._lock:
+            if generation != self.generation(user_id):
+                # A write landed while the search was running, so the result may already be stale
+                return
+            partition = self._partition(user_id, scope, limit)
+            if partition is None:
+                partition = self._partitions[(user_id, scope, limit)] = OrderedDict()
+                while len(self._partitions) > self.max_partitions:
+                    self._partitions.popitem(last=False)
+            key = normalize_text(query)
+            partition[key] = CachedSearch(
+                query=key,
+                vector=_unit(vector) if vector is not None else None,
+                numbers=_numbers(query),
+                generation=generation,
+                result=result,
+                created_at=time.time(),
+            )
+            partition.move_to_end(key)
+            while len(partition) > self.max_entries:
+                partition.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / lookups if lookups else 0.0}
+
+def _numbers(query: str) -> tuple[str, ...]:
+    return tuple(sorted(NUMBER.findall(query)))
+
+def _unit(vector) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+def get_search_cache() -> SearchResultCache | None:
+    """Build the search result cache unless MEM0_SEARCH_CACHE=false."""
+    if os.getenv("MEM0_SEARCH_CACHE", "true").lower() not in ("true", "1", "yes"):
+        return None
+    return SearchResultCache(
+        threshold=float(os.getenv("MEM0_SEARCH_CACHE_THRESHOLD", "0.97")),
+        ttl=float(os.getenv("MEM0_SEARCH_CACHE_TTL", "300")),
+        max_entries=int(os.getenv("MEM0_SEARCH_CACHE_MAX_ENTRIES", "256")),
+        max_partitions=int(os.getenv("MEM0_SEARCH_CACHE_MAX_PARTITIONS", "1024")),
+    )
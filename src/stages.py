@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+import asyncio
+import logging
+import os
+
+from mem0.memory.main import _build_filters_and_metadata
+
+from graph_query import graph_backend
+
+logger = logging.getLogger(__name__)
+
+# Stages still running after their call moved on; held so they are not garbage collected mid-write
+_late_stages: set[asyncio.Task] = set()
+
+@dataclass
+class StageTimeouts:
+    """Seconds the vector and graph stages of a call may take before it goes on without them (None waits)."""
+    # Searches only: a save cannot succeed without its vector write
+    vector: float | None = None
+    graph: float | None = None
+
+def _finished_late(name: str):
+    def done(task: asyncio.Task):
+        _late_stages.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"The {name} stage failed after its call returned: {task.exception()}")
+    return done
+
+async def run_stage(name: str, coroutine, timeout: float | None, errors: dict, required: bool = False):
+    """Await one stage of a call, or record in errors why it gave no result and return None.
+
+    A stage that times out is left running, so a graph write still lands and the
+    dispatcher's accounting stays right. A required stage raises instead.
+    """
+    task = asyncio.ensure_future(coroutine)
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        _late_stages.add(task)
+        task.add_done_callback(_finished_late(name))
+        if required:
+            raise TimeoutError(f"The {name} stage timed out after {timeout:g}s")
+        errors[name] = f"timed out after {timeout:g}s"
+    except Exception as e:
+        if required:
+            raise
+        logger.error(f"The {name} stage failed: {e}")
+        errors[name] = f"failed: {e}"
+    return None
+
+def _merged(results, relations, errors: dict) -> dict:
+    merged = {"results": results, "relations": relations if relations is not None else []}
+    if errors:
+        # The call answered without a stage; callers should not cache or count on the missing part
+        merged["partial"] = True
+        merged["stage_errors"] = errors
+    return merged
+
+async def search(memory, dispatcher, query: str, scope: dict, limit: int, timeouts: StageTimeouts) -> dict:
+    """Memory.search with the vector and graph retrieval awaited side by side, each under its timeout.
+
+    Returns Memory.search's result. When the graph stage times out or fails, the vector
+    results come back alone with "partial" set and the reason under "stage_errors";
+    a failing vector stage fails the search.
+    """
+    _, filters = _build_filters_and_metadata(**scope)
+    errors = {}
+    results, relations = await asyncio.gather(
+        run_stage("vector", dispatcher.run("search", memory._search_vector_store, query, dict(filters), limit, None),
+                  timeouts.vector, errors, required=True),
+        run_stage("graph", dispatcher.run("graph", graph_backend(memory).search, query, dict(filters), limit),
+                  timeouts.graph, errors),
+    )
+    return _merged(results, relations, errors)
+
+async def add(memory, dispatcher, messages: list[dict], scope: dict, timeouts: StageTimeouts) -> dict:
+    """Memory.add with the vector and graph writes awaited side by side, the graph one under its timeout.
+
+    A graph write that times out keeps running and the call returns the vector result
+    with "partial" set; one that fails is logged and reported the same way.
+    """
+    metadata, filters = _build_filters_and_metadata(input_metadata=None, **scope)
+    data = "\n".join(message["content"] for message in messages if "content" in message and message["role"] != "system")
+    graph_filters = {**filters, "user_id": filters.get("user_id") or "user"}
+    errors = {}
+    results, relations = await asyncio.gather(
+        run_stage("vector", dispatcher.run("add", memory._add_to_vector_store, messages, metadata, filters, True),
+                  None, errors, required=True),
+        run_stage("graph", dispatcher.run("graph", graph_backend(memory).add, data, graph_filters),
+                  timeouts.graph, errors),
+    )
+    return _merged(results, relations, errors)
+
+def get_stage_timeouts() -> StageTimeouts:
+    """Read MEM0_VECTOR_TIMEOUT and MEM0_GRAPH_TIMEOUT (seconds, 0 or unset to wait)."""
+    def seconds(name):
+        value = float(os.getenv(name, "0") or 0)
+        return value if value > 0 else None
+    return StageTimeouts(vector=seconds("MEM0_VECTOR_TIMEOUT"), graph=seconds("MEM0_GRAPH_TIMEOUT"))
@@ -0,0 +1,144 @@
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+import asyncio
+import os
+import re
+import weakref
+
+# HTTP headers a gateway or client can set to pick the tenant of every call on a connection
+TENANT_HEADERS = {"user_id": "x-mem0-user-id", "agent_id": "x-mem0-agent-id", "run_id": "x-mem0-run-id"}
+TENANT_SOURCES = ("header", "argument", "session")
+# The tool argument lets any caller act for any user, so it is only trusted when configured
+DEFAULT_TENANT_SOURCES = ("header", "session")
+ID_PATTERN = re.compile(r"^[\w.@:+-]{1,128}$")
+
+@dataclass(frozen=True)
+class Tenant:
+    """The user, and optionally the agent and run, a tool call reads and writes memories for."""
+    user_id: str
+    agent_id: str | None = None
+    run_id: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Partition key for caches: the user ID alone, or user/agent/run when narrower."""
+        if not self.agent_id and not self.run_id:
+            return self.user_id
+        return f"{self.user_id}/{self.agent_id or ''}/{self.run_id or ''}"
+
+    def scope(self) -> dict:
+        """The user_id/agent_id/run_id keyword arguments and filters for Mem0 calls."""
+        return {key: value for key, value in asdict(self).items() if value}
+
+    def owns(self, memory: dict) -> bool:
+        """Whether a formatted memory or a vector store payload belongs to this tenant."""
+        return all(memory.get(key) == value for key, value in self.scope().items())
+
+@dataclass
+class TenantSlot:
+    semaphore: asyncio.Semaphore
+    users: int = 0
+
+@dataclass
+class TenantStats:
+    active: int = 0
+    peak_active: int = 0
+    throttled: int = 0
+
+class TenantRegistry:
+    """Decides which tenant each tool call acts for and caps how much of the server one tenant can use.
+
+    The identity comes from the first of these listed in `sources` that provides one:
+    - header: the X-Mem0-User-Id / X-Mem0-Agent-Id / X-Mem0-Run-Id headers of the HTTP request
+    - argument: the user_id argument of the tool, trusted only when listed
+    - session: the identity the MCP session last sent through one of the above
+    and falls back to `default_user_id`. A user_id argument naming anyone but the resolved
+    user is refused rather than obeyed, so it can never override a gateway's header. Every tenant shares the Mem0 client and its connections;
+    `max_concurrency` bounds the tool calls one user can have running at once (0 for no limit).
+    """
+
+    def __init__(self, default_user_id: str = "user", sources=DEFAULT_TENANT_SOURCES, max_concurrency: int = 4):
+        self.default_user_id = default_user_id
+        self.sources = tuple(sources)
+        self.max_concurrency = max_concurrency
+        self.stats = TenantStats()
+        self._slots: dict[str, TenantSlot] = {}
+        # Keyed weakly so a closed session's binding goes away with it
+        self._sessions = weakref.WeakKeyDictionary()
+
+    def resolve(self, ctx, user_id: str = "") -> Tenant:
+        """Return the tenant of a tool call.
+
+        Args:
+            ctx: The MCP server provided context
+            user_id: The user_id tool argument, empty when not given
+        """
+        session = getattr(ctx.request_context, "session", None)
+        header = _from_headers(getattr(ctx.request_context, "request", None)) if "header" in self.sources else None
+        tenant = header
+        if tenant is None and user_id and "argument" in self.sources:
+            tenant = Tenant(user_id=user_id)
+        if tenant is None and "session" in self.sources and session is not None:
+            tenant = self._sessions.get(session)
+        tenant = tenant or Tenant(user_id=self.default_user_id)
+        if user_id and user_id != tenant.user_id:
+            raise PermissionError(f"user_id {user_id!r} is not the user of this connection; "
+                                  "add argument to MEM0_TENANT_SOURCES to let callers pick their user")
+        for value in (tenant.user_id, tenant.agent_id, tenant.run_id):
+            if value is not None and not ID_PATTERN.match(value):
+                raise ValueError(f"Invalid tenant ID: {value!r}")
+        if "session" in self.sources and session is not None:
+            self._sessions[session] = tenant
+        return tenant
+
+    @asynccontextmanager
+    async def limit(self, tenant: Tenant):
+        """Hold one of the tenant's concurrency slots for the duration of a tool call.
+
+        Slots are created on first use and dropped once idle, so thousands of mostly idle
+        tenants cost nothing between calls.
+        """
+        if not self.max_concurrency:
+            yield
+            return
+        slot = self._slots.get(tenant.user_id)
+        if slot is None:
+            slot = self._slots[tenant.user_id] = TenantSlot(asyncio.Semaphore(self.max_concurrency))
+        slot.users += 1
+        if slot.semaphore.locked():
+            self.stats.throttled += 1
+        try:
+            async with slot.semaphore:
+                self.stats.active += 1
+                self.stats.peak_active = max(self.stats.peak_active, self.stats.active)
+                try:
+                    yield
+                finally:
+                    self.stats.active -= 1
+        finally:
+            slot.users -= 1
+            if slot.users == 0:
+                del self._slots[tenant.user_id]
+
+    def snapshot(self) -> dict:
+        return {
+            "tenants_active": len(self._slots),
+            "calls_running": self.stats.active,
+            "peak_calls_running": self.stats.peak_active,
+            "throttled_calls": self.stats.throttled,
+        }
+
+def _from_headers(request) -> Tenant | None:
+    headers = getattr(request, "headers", None)
+    if not headers or not headers.get(TENANT_HEADERS["user_id"]):
+        return None
+    return Tenant(**{key: headers.get(header) or None for key, header in TENANT_HEADERS.items()})
+
+def get_tenant_registry() -> TenantRegistry:
+    """Build the TenantRegistry from MEM0_DEFAULT_USER_ID, MEM0_TENANT_SOURCES and MEM0_TENANT_CONCURRENCY."""
+    sources = [source.strip() for source in os.getenv("MEM0_TENANT_SOURCES", ",".join(DEFAULT_TENANT_SOURCES)).split(",")]
+    return TenantRegistry(
+        default_user_id=os.getenv("MEM0_DEFAULT_USER_ID", "user"),
+        sources=[source for source in sources if source in TENANT_SOURCES],
+        max_concurrency=int(os.getenv("MEM0_TENANT_CONCURRENCY", "4")),
+    )
@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+import concurrent.futures
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+from types import SimpleNamespace
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (BatchSpanProcessor, ConsoleSpanExporter, SpanExporter,
+                                                SpanExportResult)
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+except ImportError:
+    # Tracing is optional; without opentelemetry-sdk every span below is a no-op
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+TRACING_EXPORTERS = ("none", "otlp", "console", "file")
+_NO_SPAN = nullcontext()
+_tracer = None
+_provider = None
+
+if trace is not None:
+    class JsonLinesSpanExporter(SpanExporter):
+        """Appends finished spans to a file, one JSON object per line, for offline analysis."""
+
+        def __init__(self, path: str):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def export(self, spans) -> "SpanExportResult":
+            lines = [json.dumps(json.loads(span.to_json()), separators=(",", ":")) for span in spans]
+            with self._lock, open(self.path, "a", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            pass
+
+def _otlp_exporter():
+    """The OTLP exporter for OTEL_EXPORTER_OTLP_PROTOCOL (grpc or http/protobuf)."""
+    if os.getenv("OTEL_EXPORTER_OTLP_PROTOCOL", "grpc") == "grpc":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    else:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    # Endpoint, headers and timeouts come from the standard OTEL_EXPORTER_OTLP_* variables
+    return OTLPSpanExporter()
+
+def configure_tracing() -> bool:
+    """Set up span export from the environment. Returns whether tracing is on.
+
+    MEM0_TRACING picks the exporter (none, otlp, console or file, written to MEM0_TRACING_FILE)
+    and MEM0_TRACING_SAMPLE_RATIO the share of tool calls traced. Sampling is decided once per
+    tool call, so a sampled call keeps every span beneath it.
+    """
+    global _tracer, _provider
+    if _tracer is not None:
+        return True
+    exporter_name = os.getenv("MEM0_TRACING", "none").lower()
+    if exporter_name in ("", "none", "false"):
+        return False
+    if exporter_name not in TRACING_EXPORTERS:
+        raise ValueError(f"MEM0_TRACING must be one of {', '.join(TRACING_EXPORTERS)}, got {exporter_name!r}")
+    if trace is None:
+        logger.warning("MEM0_TRACING=%s but opentelemetry-sdk is not installed; tracing is off", exporter_name)
+        return False
+
+    if exporter_name == "otlp":
+        exporter = _otlp_exporter()
+    elif exporter_name == "console":
+        exporter = ConsoleSpanExporter()
+    else:
+        mem0_dir = os.getenv("MEM0_DIR") or os.path.join(os.path.expanduser("~"), ".mem0")
+        exporter = JsonLinesSpanExporter(os.getenv("MEM0_TRACING_FILE") or os.path.join(mem0_dir, "traces.jsonl"))
+
+    ratio = float(os.getenv("MEM0_TRACING_SAMPLE_RATIO", "1.0"))
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", "mcp-mem0")}),
+        sampler=ParentBased(TraceIdRatioBased(ratio)),
+    )
+    # Spans are exported off the request path, in batches
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer("mcp-mem0")
+    return True
+
+def shutdown_tracing():
+    """Flush buffered spans and stop exporting."""
+    global _tracer, _provider
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = _provider = None
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+def span(name: str, attributes: dict | None = None):
+    """A child span of the current one, or a no-op context manager when tracing is off."""
+    if _tracer is None:
+        return _NO_SPAN
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+def trace_tool(fn):
+    """Open the root span of an MCP tool call; every backend span of the call nests under it."""
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _tracer is None:
+            return await fn(*args, **kwargs)
+        with _tracer.start_as_current_span(f"mcp.tool {tool}", kind=trace.SpanKind.SERVER,
+                                           attributes={"mcp.tool.name": tool}) as current:
+            result = await fn(*args, **kwargs)
+            if isinstance(result, str) and result.startswith("Error"):
+                # Tools report failures as strings, so mark the span failed by hand
+                current.set_status(trace.Status(trace.StatusCode.ERROR, result[:200]))
+            return result
+
+    return wrapper
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """A ThreadPoolExecutor whose tasks run in a copy of the submitting thread's context."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def propagate_context_into_mem0():
+    """Make mem0.Memory's internal thread pools carry the current span into their worker threads.
+
+    Memory.add, search and get_all run the vector store and graph halves on a fresh
+    ThreadPoolExecutor, which would otherwise start every LLM, embedding and Cypher span
+    beneath them as a separate trace.
+    """
+    import mem0.memory.main as mem0_main
+
+    futures = SimpleNamespace(**{**vars(concurrent.futures), "ThreadPoolExecutor": ContextThreadPoolExecutor})
+    mem0_main.concurrent = SimpleNamespace(futures=futures)
@@ -1,6 +1,11 @@
 from mem0 import Memory
 import os
 
+from embeddings import install_embedding_pipeline
+from local_store import split_local_vector_store
+from pooling import get_connection_pools
+from quantization import apply_qdrant_quantization, get_quantization_settings
+
 # Custom instructions for memory processing
 # These aren't being used right now but Mem0 does support adding custom prompting
 # for handling memory retrieval and processing.
@@ -14,7 +19,19 @@ Extract the Following Information:
 - Source: Record where this information came from when applicable.
 """
 
-def get_mem0_client():
+def get_embedding_dims(llm_provider: str | None) -> int:
+    """Vector size for the configured embedding model; EMBEDDING_DIMS overrides the per-model default."""
+    if os.getenv('EMBEDDING_DIMS'):
+        return int(os.getenv('EMBEDDING_DIMS'))
+    embedding_model = os.getenv('EMBEDDING_MODEL_CHOICE', '')
+    if 'embedding-001' in embedding_model:  # Google Gemini embedding model
+        return 768
+    if llm_provider == "openai":
+        return 1536
+    return 768  # Default for other providers
+
+def get_mem0_config():
+    """Build the Mem0 config dict shared by the sync and async clients from the environment."""
     # Get LLM provider and configuration
     llm_provider = os.getenv('LLM_PROVIDER')
     llm_api_key = os.getenv('LLM_API_KEY')
@@ -69,7 +86,8 @@ def get_mem0_client():
             "provider": "openai",
             "config": {
                 "model": embedding_model or "text-embedding-3-small",
-                "embedding_dims": 1536  # Default for text-embedding-3-small
+                # Default for text-embedding-3-small, which can also return shorter vectors
+                "embedding_dims": int(os.getenv('EMBEDDING_DIMS') or 1536)
             }
         }
         
@@ -82,7 +100,7 @@ def get_mem0_client():
             "provider": "ollama",
             "config": {
                 "model": embedding_model or "nomic-embed-text",
-                "embedding_dims": 768  # Default for nomic-embed-text
+                "embedding_dims": int(os.getenv('EMBEDDING_DIMS') or 768)  # Default for nomic-embed-text
             }
         }
         
@@ -96,15 +114,7 @@ def get_mem0_client():
     
     if vector_store_provider == 'qdrant':
         qdrant_host = os.getenv('QDRANT_HOST', 'localhost')
-        # Determine embedding dimensions based on the actual embedding model
-        embedding_model = os.getenv('EMBEDDING_MODEL_CHOICE', '')
-        if 'embedding-001' in embedding_model:  # Google Gemini embedding model
-            embedding_dims = 768
-        elif llm_provider == "openai":
-            embedding_dims = 1536
-        else:
-            embedding_dims = 768  # Default for other providers
-            
+        embedding_dims = get_embedding_dims(llm_provider)
         qdrant_config = {
             "collection_name": os.getenv('QDRANT_COLLECTION', 'mem0_memories'),
             "embedding_model_dims": embedding_dims
@@ -127,16 +137,26 @@ def get_mem0_client():
         qdrant_api_key = os.getenv('QDRANT_API_KEY')
         if qdrant_api_key:
             config["vector_store"]["config"]["api_key"] = qdrant_api_key
+    elif vector_store_provider == 'local':
+        embedding_dims = get_embedding_dims(llm_provider)
+
+        # In-process store from local_store.py, swapped in after mem0 builds the client
+        quantization, rerank = get_quantization_settings()
+        mem0_dir = os.getenv('MEM0_DIR') or os.path.join(os.path.expanduser('~'), '.mem0')
+        config["vector_store"] = {
+            "provider": "local",
+            "config": {
+                "path": os.getenv('LOCAL_STORE_PATH') or os.path.join(mem0_dir, 'local_store'),
+                "collection_name": "mem0_memories",
+                "embedding_model_dims": embedding_dims,
+                "dtype": os.getenv('LOCAL_STORE_DTYPE', 'float32'),
+                "index": os.getenv('LOCAL_STORE_INDEX', 'auto'),
+                "quantization": quantization,
+                "rerank": rerank,
+            }
+        }
     else:
-        # Determine embedding dimensions based on the actual embedding model
-        embedding_model = os.getenv('EMBEDDING_MODEL_CHOICE', '')
-        if 'embedding-001' in embedding_model:  # Google Gemini embedding model
-            embedding_dims = 768
-        elif llm_provider == "openai":
-            embedding_dims = 1536
-        else:
-            embedding_dims = 768  # Default for other providers
-            
+        embedding_dims = get_embedding_dims(llm_provider)
         # Default to Supabase for backward compatibility
         config["vector_store"] = {
             "provider": "supabase",
@@ -204,13 +224,37 @@ Output: [
             "config": {
                 "url": neo4j_url,
                 "username": neo4j_username,
-                "password": neo4j_password
+                "password": neo4j_password,
+                # Label every entity __Entity__ so mem0 indexes nodes by name and user_id
+                "base_label": os.getenv('NEO4J_BASE_LABEL', 'false').lower() == 'true'
             }
             # Temporarily removing custom_prompt to test basic functionality
             # "custom_prompt": standardized_graph_prompt
         }
 
     # config["custom_fact_extraction_prompt"] = CUSTOM_INSTRUCTIONS
-    
-    # Create and return the Memory client
-    return Memory.from_config(config)
\ No newline at end of file
+
+    return config
+
+def get_mem0_client():
+    # Create and return the Memory client, with embed calls routed through the batching wrapper
+    config, local_store = split_local_vector_store(get_mem0_config())
+    memory = get_connection_pools().pool_memory(Memory.from_config(config))
+    if local_store:
+        memory.vector_store = local_store
+    elif config["vector_store"]["provider"] == "qdrant":
+        apply_qdrant_quantization(memory.vector_store.client, memory.vector_store.collection_name,
+                                  get_quantization_settings()[0])
+    return install_embedding_pipeline(memory)
+
+async def get_async_mem0_client(dispatcher):
+    """Create the async-native client used when MEM0_CLIENT_MODE=async.
+
+    Args:
+        dispatcher: The MemoryDispatcher used for the backends that have no async driver
+    """
+    from async_backend import build_async_memory
+
+    memory = build_async_memory(get_mem0_config(), dispatcher)
+    await memory.initialize()
+    return memory
\ No newline at end of file
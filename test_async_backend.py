@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Equivalence tests for the sync (mem0.Memory) and async-native client modes using in-process fakes
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import build_fake_memory, build_fake_async_memory
+
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}T[\d:.]+[+-]\d{2}:\d{2}")
+# Both modes must fail on the same calls, but the exception text comes from different code
+ERROR_PATTERN = re.compile(r"^(Error [^:]*):.*$", re.S)
+
+def make_context(mem0_client):
+    """Build the object the tools read from ctx.request_context.lifespan_context"""
+    lifespan_context = main.Mem0Context(mem0_client=mem0_client, dispatcher=MemoryDispatcher(4))
+    return SimpleNamespace(request_context=SimpleNamespace(lifespan_context=lifespan_context))
+
+def normalize(output: str) -> str:
+    """Replace the values that legitimately differ between runs (IDs, timestamps, error details)"""
+    output = TIMESTAMP_PATTERN.sub("<timestamp>", UUID_PATTERN.sub("<id>", output))
+    return ERROR_PATTERN.sub(r"\1", output)
+
+def sorted_listing(output: str) -> str:
+    """A get_all_memories page with its memories sorted by text.
+
+    Memories saved concurrently are listed in whichever order their writes finished, which
+    differs from run to run, so listings are compared as sets.
+    """
+    if output.startswith("Error"):
+        return output
+    page = json.loads(output)
+    return json.dumps({**page, "memories": sorted(page["memories"], key=lambda memory: memory["memory"])})
+
+def ids_by_text(output: str) -> dict[str, str]:
+    return {memory["memory"]: memory["id"] for memory in json.loads(output)["memories"]}
+
+async def walk_pages(ctx, page_size: int, fields=None) -> str:
+    """Every memory reached by following next_cursor from the first page, sorted by text, and the page count"""
+    memories, cursor, pages = [], "", 0
+    while cursor is not None:
+        page = json.loads(await main.get_all_memories(ctx, cursor=cursor, page_size=page_size, fields=fields))
+        memories.extend(page["memories"])
+        cursor, pages = page["next_cursor"], pages + 1
+    return json.dumps({"pages": pages, "memories": sorted(memories, key=lambda memory: memory["memory"])})
+
+async def run_session(mem0_client) -> list[str]:
+    """Drive every tool through the same sequence of calls and collect the outputs"""
+    ctx = make_context(mem0_client)
+    outputs = [
+        await main.save_memory(ctx, "Alice works at Acme. Alice lives in Paris."),
+        await main.save_conversation(ctx, "user: Bob manages the data team\nassistant: Noted. Bob reports to Alice."),
+        await main.save_memory(ctx, "Alice works at Acme."),
+        await main.search_memories(ctx, "Where does Alice work", limit=2),
+        sorted_listing(await main.get_all_memories(ctx)),
+        await main.find_relationships(ctx, "Bob"),
+    ]
+    ids = ids_by_text(outputs[4])
+    outputs.append(await main.update_memory(ctx, ids["Alice works at Acme"], "Alice works at Initech"))
+    outputs.append(await main.delete_memory(ctx, ids["Alice lives in Paris"]))
+    outputs.append(sorted_listing(await main.get_all_memories(ctx)))
+    outputs.append(await main.delete_memory(ctx, "00000000-0000-0000-0000-000000000000"))
+    outputs.append(await main.save_memories(ctx, ["Carol works at Globex.", "Dave lives in Oslo. Dave likes skiing."]))
+    outputs.append(await main.search_memories_batch(ctx, ["Where does Carol work", "What does Dave like"], limit=2))
+    ids = ids_by_text(await main.get_all_memories(ctx))
+    outputs.append(await main.delete_memories(ctx, [ids["Noted"], "00000000-0000-0000-0000-000000000000"]))
+    outputs.append(sorted_listing(await main.get_all_memories(ctx)))
+    outputs.append(await walk_pages(ctx, page_size=2, fields=["memory"]))
+    outputs.append(await walk_pages(ctx, page_size=3))
+    outputs.append(await main.get_all_memories(ctx, cursor="not-a-cursor"))
+    ctx.request_context.lifespan_context.dispatcher.shutdown()
+    return [normalize(output) for output in outputs]
+
+def test_tool_outputs_match():
+    """Both client modes return the same tool outputs for the same session"""
+    sync_outputs = asyncio.run(run_session(build_fake_memory()))
+    async_outputs = asyncio.run(run_session(build_fake_async_memory()))
+    for sync_output, async_output in zip(sync_outputs, async_outputs):
+        assert sync_output == async_output, f"\nsync:  {sync_output}\nasync: {async_output}"
+
+def test_pages_cover_every_memory_once():
+    """Following next_cursor visits each memory exactly once, in both client modes"""
+    async def walk(mem0_client):
+        ctx = make_context(mem0_client)
+        await main.save_memories(ctx, [f"Fact number {i}" for i in range(7)])
+        seen, cursor = [], ""
+        while cursor is not None:
+            page = json.loads(await main.get_all_memories(ctx, cursor=cursor, page_size=3))
+            seen.extend(memory["memory"] for memory in page["memories"])
+            cursor = page["next_cursor"]
+        ctx.request_context.lifespan_context.dispatcher.shutdown()
+        return seen
+
+    for mem0_client in (build_fake_memory(), build_fake_async_memory()):
+        seen = asyncio.run(walk(mem0_client))
+        assert sorted(seen) == sorted(f"Fact number {i}" for i in range(7))
+
+def test_async_client_runs_without_threads():
+    """The async client is awaited on the event loop, not handed to the worker pool"""
+    async def session():
+        ctx = make_context(build_fake_async_memory())
+        await asyncio.gather(*(main.save_memory(ctx, f"Fact number {i}") for i in range(50)))
+        snapshot = ctx.request_context.lifespan_context.dispatcher.snapshot()
+        executor_threads = len(ctx.request_context.lifespan_context.dispatcher.executor._threads)
+        ctx.request_context.lifespan_context.dispatcher.shutdown()
+        return snapshot, executor_threads
+
+    snapshot, executor_threads = asyncio.run(session())
+    assert snapshot["operations"]["add"]["completed"] == 50
+    assert executor_threads == 0
+
+def test_history_writes_stay_off_the_loop():
+    """The async client writes its SQLite history rows on a worker thread, not the event loop's"""
+    async def session():
+        mem0_client = build_fake_async_memory()
+        ctx = make_context(mem0_client)
+        threads, add_history = [], mem0_client.db.add_history
+        mem0_client.db.add_history = lambda *args, **kwargs: (threads.append(threading.get_ident()),
+                                                              add_history(*args, **kwargs))
+        await main.save_memory(ctx, "Alice works at Acme.", infer=False)
+        [memory] = json.loads(await main.get_all_memories(ctx))["memories"]
+        await main.update_memory(ctx, memory["id"], "Alice works at Initech.")
+        await main.delete_memory(ctx, memory["id"])
+        history = mem0_client.db.get_history(memory["id"])
+        ctx.request_context.lifespan_context.dispatcher.shutdown()
+        return threads, history
+
+    threads, history = asyncio.run(session())
+    assert len(threads) == 3 and threading.get_ident() not in threads
+    assert sorted(row["event"] for row in history) == ["ADD", "DELETE", "UPDATE"]
+
+if __name__ == "__main__":
+    print("📋 Sync/Async Client Equivalence Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_tool_outputs_match, test_pages_cover_every_memory_once, test_async_client_runs_without_threads,
+                 test_history_writes_stay_off_the_loop):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch tools: save_memories, search_memories_batch and delete_memories
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from embeddings import CachingEmbedder, EmbeddingCache
+from fakes import FakeEmbedder, SlowEmbedder, build_fake_memory
+
+class BrokenEmbedder(FakeEmbedder):
+    """Fails to embed any text mentioning "broken", as a provider rejecting one input would"""
+
+    def embed(self, text, memory_action=None):
+        if "broken" in text:
+            raise RuntimeError("input rejected")
+        return super().embed(text, memory_action)
+
+def make_context(app, user_id: str = "u1"):
+    return SimpleNamespace(request_context=SimpleNamespace(
+        lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": user_id}), session=None
+    ))
+
+def test_save_memories_reports_each_item():
+    """Every text gets its own result in order; a failing one does not stop the others"""
+    async def session():
+        app = main.Mem0Context(mem0_client=build_fake_memory(embedder=BrokenEmbedder()), dispatcher=MemoryDispatcher(8))
+        ctx = make_context(app)
+        items = json.loads(await main.save_memories(
+            ctx, ["Alice works at Acme.", "This one is broken.", "Bob lives in Oslo."], infer=False))
+        stored = json.loads(await main.get_all_memories(ctx))["memories"]
+        app.dispatcher.shutdown()
+        return items, stored
+
+    items, stored = asyncio.run(session())
+    assert [item["index"] for item in items] == [0, 1, 2]
+    assert [item["status"] for item in items] == ["success", "error", "success"]
+    assert items[1]["error"] == "input rejected" and items[0]["facts_extracted"] == 1
+    assert sorted(memory["memory"] for memory in stored) == ["Alice works at Acme.", "Bob lives in Oslo."]
+
+def test_search_batch_embeds_every_query_in_one_request():
+    """Queries are embedded in one provider round trip and answered in the order they were asked"""
+    async def session(path):
+        embedder = SlowEmbedder(latency=0.01)
+        cache = EmbeddingCache(os.path.join(path, "embeddings.db"), max_entries=100, model="fake", dims=64)
+        app = main.Mem0Context(mem0_client=build_fake_memory(embedder=CachingEmbedder(embedder, cache)),
+                               dispatcher=MemoryDispatcher(8))
+        ctx = make_context(app)
+        await main.save_memories(ctx, ["Alice works at Acme.", "Bob lives in Oslo.", "Carol plays chess."],
+                                 infer=False)
+        before = embedder.round_trips
+        items = json.loads(await main.search_memories_batch(
+            ctx, ["Where does Alice work", "Where does Bob live", "What does Carol play", "Where does Alice work"],
+            limit=1, mode="vector"))
+        app.dispatcher.shutdown()
+        return items, embedder.round_trips - before
+
+    with tempfile.TemporaryDirectory() as path:
+        items, round_trips = asyncio.run(session(path))
+    assert round_trips == 1
+    assert [item["query"] for item in items] == [
+        "Where does Alice work", "Where does Bob live", "What does Carol play", "Where does Alice work"]
+    assert [item["results"] for item in items] == [
+        ["Alice works at Acme."], ["Bob lives in Oslo."], ["Carol plays chess."], ["Alice works at Acme."]]
+
+def test_delete_memories_reports_each_id():
+    """Own memories are deleted; unknown IDs and other users' memories are reported and left alone"""
+    async def session():
+        app = main.Mem0Context(mem0_client=build_fake_memory(), dispatcher=MemoryDispatcher(8))
+        mine, theirs = make_context(app, "u1"), make_context(app, "u2")
+        await main.save_memories(mine, ["Alice works at Acme.", "Bob lives in Oslo."], infer=False)
+        await main.save_memory(theirs, "Dave likes tea.", infer=False)
+        own = [memory["id"] for memory in json.loads(await main.get_all_memories(mine))["memories"]]
+        other = json.loads(await main.get_all_memories(theirs))["memories"][0]["id"]
+
+        items = json.loads(await main.delete_memories(mine, [own[0], "missing", other, own[1]]))
+        left = [json.loads(await main.get_all_memories(ctx))["memories"] for ctx in (mine, theirs)]
+        app.dispatcher.shutdown()
+        return own, items, left
+
+    own, items, left = asyncio.run(session())
+    assert [item["status"] for item in items] == ["deleted", "error", "error", "deleted"]
+    assert [items[0]["id"], items[3]["id"]] == own
+    assert left[0] == [] and [memory["memory"] for memory in left[1]] == ["Dave likes tea."]
+
+if __name__ == "__main__":
+    print("📋 Batch Tools Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_save_memories_reports_each_item, test_search_batch_embeds_every_query_in_one_request,
+                 test_delete_memories_reports_each_id):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the tool benchmark harness and its stand-in backends
+"""
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import benchmark_tools
+
+def test_every_tool_runs_cleanly_on_the_stand_ins():
+    """A small case of every tool completes without tool errors in both client modes"""
+    logging.disable(logging.WARNING)
+    try:
+        for mode in ("sync", "async"):
+            results = asyncio.run(benchmark_tools.run_case(mode, corpus=60, concurrency=4, requests=20, warmup=2,
+                                                           search_cache=False, seed=0))
+            assert [result["tool"] for result in results] == list(benchmark_tools.TOOLS)
+            assert all(result["errors"] == 0 for result in results), results
+            assert all(result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"] for result in results)
+    finally:
+        logging.disable(logging.NOTSET)
+
+def test_regressions_are_reported():
+    """Slower p95, lower throughput and new errors are flagged; noise under the thresholds is not"""
+    case = {"client": "sync", "tool": "search_memories", "corpus": 1000, "concurrency": 8,
+            "p95_ms": 10.0, "throughput": 500.0, "errors": 0}
+    baseline = {"results": [case]}
+    assert benchmark_tools.compare([{**case, "p95_ms": 11.0, "throughput": 450.0}], baseline, 0.25, 0.5) == []
+    assert benchmark_tools.compare([{**case, "p95_ms": 0.4}], {"results": [{**case, "p95_ms": 0.1}]}, 0.25, 0.5) == []
+    regressions = benchmark_tools.compare([{**case, "p95_ms": 20.0, "throughput": 200.0, "errors": 3}], baseline, 0.25, 0.5)
+    assert len(regressions) == 3
+
+if __name__ == "__main__":
+    print("📋 Benchmark Harness Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_every_tool_runs_cleanly_on_the_stand_ins, test_regressions_are_reported):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for splitting long conversations into chunks processed in parallel by save_conversation
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import chunking
+import main
+from chunking import ChunkSettings, add_conversation, chunk_conversation, merge_facts, split_turns
+from dispatch import MemoryDispatcher
+from fakes import FakeGraph, FakeLLM, build_fake_async_memory, build_fake_memory
+
+def transcript(turns: int) -> str:
+    lines = []
+    for i in range(turns):
+        lines.append(f"user: My colleague Person{i} moved to City{i}.")
+        lines.append(f"assistant: Noted, Person{i} now lives in City{i}.\nAnything else about Person{i}?")
+    return "\n".join(lines)
+
+def test_chunks_follow_turns():
+    conversation = transcript(20)
+    turns = split_turns(conversation)
+    assert len(turns) == 40 and turns[1].count("\n") == 1
+    chunks = chunk_conversation(conversation, max_chars=400, overlap_turns=1)
+    assert len(chunks) > 1 and all(len(chunk) <= 400 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        # Chunks start on a turn, with the last turn of the previous chunk repeated
+        assert chunk.startswith(("user:", "assistant:"))
+        assert previous.endswith(chunk.split("\nuser:")[0].split("\nassistant:")[0])
+    # Every turn is in some chunk
+    assert all(any(turn in chunk for chunk in chunks) for turn in turns)
+
+    # A turn longer than a chunk is split between sentences
+    long_turn = "user: " + " ".join(f"Sentence number {i} is here." for i in range(50))
+    pieces = chunk_conversation(long_turn, max_chars=200, overlap_turns=0)
+    assert len(pieces) > 1 and all(len(piece) <= 200 for piece in pieces)
+    assert all(piece.endswith(".") for piece in pieces)
+
+def test_merge_facts():
+    merged = merge_facts([["Lives in Oslo", "Works at Acme"], ["lives in oslo.", "Works at Acme Corp", "Likes tea"]], 0.8)
+    assert merged == ["Lives in Oslo", "Works at Acme", "Works at Acme Corp", "Likes tea"]
+    assert merge_facts([["Works at the Acme office in Oslo"], ["Works at Acme office in Oslo"]], 0.8) == [
+        "Works at the Acme office in Oslo"
+    ]
+
+def test_long_conversation_in_parallel():
+    """A long transcript is extracted chunk by chunk in parallel and each fact is stored once"""
+    conversation = transcript(40)
+    for build in (build_fake_memory, build_fake_async_memory):
+        llm = FakeLLM(latency=0.05)
+        app = main.Mem0Context(mem0_client=build(llm=llm), dispatcher=MemoryDispatcher(16),
+                               chunking=ChunkSettings(max_chars=500, concurrency=8, facts_per_write=200))
+        ctx = SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+        ))
+
+        started = time.perf_counter()
+        response = json.loads(asyncio.run(main.save_conversation(ctx, conversation, "u1")))
+        elapsed = time.perf_counter() - started
+        memories = json.loads(asyncio.run(main.get_all_memories(ctx, user_id="u1", page_size=500)))["memories"]
+        app.dispatcher.shutdown()
+
+        chunks = response["chunks"]
+        assert chunks > 8
+        # One extraction per chunk, then one update call for the merged facts
+        assert llm.calls == chunks + 1
+        if build is build_fake_memory:
+            # Chunks run 8 at a time instead of one after another (the async fakes sleep on the event loop)
+            assert elapsed < (chunks + 1) * 0.05 * 0.6
+        texts = [memory["memory"] for memory in memories]
+        assert len(texts) == len(set(texts)) == response["facts_extracted"]
+        assert any("Person39" in text for text in texts) and any("Person0 " in text for text in texts)
+
+def test_groups_are_written_one_at_a_time():
+    """Merged facts are written group after group, so each mem0 update sees what the previous one stored"""
+    llm = FakeLLM(latency=0.01)
+    memory, dispatcher = build_fake_memory(llm=llm), MemoryDispatcher(16)
+    settings = ChunkSettings(max_chars=500, concurrency=8, facts_per_write=10)
+    writing, overlapped, stored = [], [], []
+    update_memories = chunking.update_memories
+
+    async def update(memory, dispatcher, facts, metadata, filters):
+        overlapped.append(bool(writing))
+        stored.append(len(memory.get_all(user_id="u1", limit=1000)["results"]))
+        writing.append(facts)
+        try:
+            return await update_memories(memory, dispatcher, facts, metadata, filters)
+        finally:
+            writing.pop()
+
+    chunking.update_memories = update
+    try:
+        result = asyncio.run(add_conversation(memory, dispatcher, transcript(40), settings, {"user_id": "u1"}))
+    finally:
+        chunking.update_memories = update_memories
+    dispatcher.shutdown()
+
+    assert result["writes"] > 1 and len(overlapped) == result["writes"] and not any(overlapped)
+    assert stored == [10 * i for i in range(result["writes"])]
+    # The merged facts skip mem0's extraction and go straight to its update step
+    assert llm.calls == result["chunks"] + result["writes"]
+    assert len(memory.get_all(user_id="u1", limit=1000)["results"]) == len(result["results"])
+
+def test_groups_reach_the_graph():
+    """With a graph store, each group of merged facts is also added to the graph"""
+    for build in (build_fake_memory, build_fake_async_memory):
+        graph = FakeGraph()
+        app = main.Mem0Context(mem0_client=build(graph=graph), dispatcher=MemoryDispatcher(16),
+                               chunking=ChunkSettings(max_chars=500, concurrency=8, facts_per_write=10))
+        ctx = SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+        ))
+        response = json.loads(asyncio.run(main.save_conversation(ctx, transcript(40), "u1")))
+        app.dispatcher.shutdown()
+        assert response["writes"] > 1 and "partial" not in response
+        assert response["relationships_created"] == len(graph.relations["u1"]) > 0
+
+if __name__ == "__main__":
+    print("📋 Conversation Chunking Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_chunks_follow_turns, test_merge_facts, test_long_conversation_in_parallel,
+                 test_groups_are_written_one_at_a_time, test_groups_reach_the_graph):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the duplicate index in front of save_memory, save_memories and save_conversation
+"""
+import asyncio
+import functools
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dedup import DedupIndex
+from dispatch import MemoryDispatcher
+from fakes import FakeLLM, StubMemory, build_fake_memory
+from ingestion import IngestionQueue
+
+CONVERSATION = " ".join(
+    f"user: On day {day} I reviewed the deployment checklist with the platform team and we agreed on the rollout."
+    for day in range(1, 8)
+)
+
+def test_exact_and_near_duplicates():
+    index = DedupIndex(max_distance=3, max_entries=3)
+    assert index.claim("u1", "u1", "Alice works at Acme.") is None
+    assert index.claim("u1", "u1", "  alice WORKS at acme") == "exact"
+    # Another tenant has its own index
+    assert index.claim("u2", "u2", "Alice works at Acme.") is None
+
+    assert index.claim("u1", "u1", CONVERSATION) is None
+    assert index.claim("u1", "u1", CONVERSATION.replace("reviewed", "checked", 1)) == "near"
+    # Same wording but a different number is a different fact
+    assert index.claim("u1", "u1", CONVERSATION.replace("day 7", "day 9")) is None
+
+    index.release("u1", "u1", "Alice works at Acme.")
+    assert index.claim("u1", "u1", "Alice works at Acme.") is None
+    # Only the 3 most recent texts are kept
+    assert index.claim("u1", "u1", "Bob lives in Oslo.") is None
+    assert index.claim("u1", "u1", CONVERSATION) is None
+
+    index.forget("u1")
+    assert index.claim("u1", "u1", "Bob lives in Oslo.") is None
+    stats = index.stats()
+    assert (stats["exact_duplicates"], stats["near_duplicates"], stats["checked"]) == (1, 1, 10)
+
+def test_tools_skip_duplicates():
+    """A repeated save makes no LLM call, and deleting a memory lets its text be saved again"""
+    llm = FakeLLM()
+    app = main.Mem0Context(mem0_client=build_fake_memory(llm=llm), dispatcher=MemoryDispatcher(4), dedup=DedupIndex())
+    ctx = SimpleNamespace(request_context=SimpleNamespace(
+        lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+    ))
+
+    async def session():
+        await main.save_memory(ctx, "Alice works at Acme.", "u1")
+        calls = llm.calls
+        repeated = await main.save_memory(ctx, "alice works at acme", "u1")
+        assert repeated.startswith("Skipped saving memory") and llm.calls == calls
+
+        batch = json.loads(await main.save_memories(ctx, ["Bob lives in Oslo.", "Alice works at Acme.", "bob lives in oslo"], "u1"))
+        assert [item["status"] for item in batch] == ["success", "duplicate", "duplicate"]
+
+        conversation = json.loads(await main.save_conversation(ctx, CONVERSATION, "u1"))
+        assert conversation["status"] == "success"
+        again = json.loads(await main.save_conversation(ctx, CONVERSATION + " assistant: Noted.", "u1"))
+        assert again == {"status": "duplicate", "match": "near",
+                         "message": "This conversation was already saved; nothing was extracted"}
+
+        memories = json.loads(await main.get_all_memories(ctx, user_id="u1"))["memories"]
+        alice = next(memory["id"] for memory in memories if memory["memory"] == "Alice works at Acme")
+        await main.delete_memory(ctx, alice, "u1")
+        saved = await main.save_memory(ctx, "Alice works at Acme.", "u1")
+        assert saved.startswith("Successfully saved memory")
+
+    asyncio.run(session())
+    app.dispatcher.shutdown()
+    stats = app.dedup.stats()
+    assert stats["duplicates"] == 4 and stats["estimated_seconds_saved"] > 0
+
+class SupersedingMemory(StubMemory):
+    """Reports a save mentioning a move as an update of an earlier memory, as mem0's inferred add does"""
+
+    def __init__(self, failing: str = ""):
+        super().__init__()
+        self.failing = failing
+
+    def add(self, messages, user_id=None, **kwargs):
+        text = "\n".join(m["content"] for m in messages)
+        if self.failing and self.failing in text:
+            raise RuntimeError("provider unavailable")
+        result = super().add(messages, user_id=user_id, **kwargs)
+        if "moved" in text:
+            result["results"][0]["event"] = "UPDATE"
+        return result
+
+def make_context(app):
+    return SimpleNamespace(request_context=SimpleNamespace(
+        lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+    ))
+
+def test_superseding_save_frees_earlier_texts():
+    """An add that updated or deleted an earlier memory lets that memory's text be saved again"""
+    app = main.Mem0Context(mem0_client=SupersedingMemory(), dispatcher=MemoryDispatcher(4), dedup=DedupIndex())
+    ctx = make_context(app)
+
+    async def session():
+        assert (await main.save_memory(ctx, "Alice lives in Oslo.")).startswith("Successfully saved memory")
+        assert (await main.save_memory(ctx, "Alice lives in Oslo.")).startswith("Skipped saving memory")
+        assert (await main.save_memory(ctx, "Alice moved to Bergen.")).startswith("Successfully saved memory")
+        return await main.save_memory(ctx, "Alice lives in Oslo.")
+
+    saved = asyncio.run(session())
+    app.dispatcher.shutdown()
+    assert saved.startswith("Successfully saved memory")
+
+def test_failed_queued_save_releases_its_text():
+    """A queued save that fails its last attempt is not answered as a duplicate afterwards"""
+    async def session(path):
+        app = main.Mem0Context(mem0_client=SupersedingMemory(failing="Acme"), dispatcher=MemoryDispatcher(4),
+                               dedup=DedupIndex(), ingestion=IngestionQueue(path, workers=1, max_attempts=2,
+                                                                            retry_delay=0.01))
+        await app.ingestion.start(functools.partial(main.ingest, app), functools.partial(main.ingest_failed, app))
+        ctx = make_context(app)
+        responses = []
+        for _ in range(2):
+            responses.append(json.loads(await main.save_memory(ctx, "Alice works at Acme.")))
+            while app.ingestion.status(responses[-1]["job_id"])["status"] != "failed":
+                await asyncio.sleep(0.01)
+        await app.ingestion.stop()
+        app.dispatcher.shutdown()
+        return responses
+
+    with tempfile.TemporaryDirectory() as path:
+        responses = asyncio.run(session(os.path.join(path, "jobs.db")))
+    assert [response["status"] for response in responses] == ["queued", "queued"]
+
+if __name__ == "__main__":
+    print("📋 Duplicate Index Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_exact_and_near_duplicates, test_tools_skip_duplicates, test_superseding_save_frees_earlier_texts,
+                 test_failed_queued_save_releases_its_text):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-operation limits of the MemoryDispatcher
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from dispatch import MemoryDispatcher, parse_operation_limits
+
+class Concurrency:
+    """Records how many calls run at once, from worker threads or the event loop."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def leave(self):
+        with self.lock:
+            self.current -= 1
+
+def test_operation_limit_caps_concurrent_calls():
+    """No more calls of an operation run at once than its limit, sync or async, and the rest wait"""
+    async def session():
+        dispatcher = MemoryDispatcher(16, {"add": 2})
+        sync_calls, async_calls = Concurrency(), Concurrency()
+
+        def blocking():
+            sync_calls.enter()
+            time.sleep(0.02)
+            sync_calls.leave()
+
+        async def coroutine():
+            async_calls.enter()
+            await asyncio.sleep(0.02)
+            async_calls.leave()
+
+        await asyncio.gather(*(dispatcher.run("add", blocking) for _ in range(10)))
+        await asyncio.gather(*(dispatcher.run("add", coroutine) for _ in range(10)))
+        stats = dispatcher.snapshot()["operations"]["add"]
+        dispatcher.shutdown()
+        return sync_calls.peak, async_calls.peak, stats
+
+    sync_peak, async_peak, stats = asyncio.run(session())
+    assert sync_peak == async_peak == 2
+    assert stats["limit"] == 2 and stats["completed"] == 20 and stats["in_flight"] == stats["waiting"] == 0
+    assert stats["max_waiting"] >= 8
+
+def test_saturated_operation_does_not_block_others():
+    """Searches go through while every add slot is taken"""
+    async def session():
+        dispatcher = MemoryDispatcher(16, {"add": 1})
+        release = threading.Event()
+        add = asyncio.ensure_future(dispatcher.run("add", release.wait, 5))
+        queued = asyncio.ensure_future(dispatcher.run("add", lambda: "second add"))
+        await asyncio.sleep(0.05)
+        search = await asyncio.wait_for(dispatcher.run("search", lambda: "search"), timeout=1)
+        waiting = dispatcher.snapshot()["operations"]["add"]["waiting"]
+        release.set()
+        results = await asyncio.gather(add, queued)
+        dispatcher.shutdown()
+        return search, waiting, results
+
+    search, waiting, results = asyncio.run(session())
+    assert search == "search" and waiting == 1
+    assert results == [True, "second add"]
+
+def test_failures_release_their_slot():
+    """A failing call raises to its caller, is counted, and frees its slot for the next call"""
+    async def session():
+        dispatcher = MemoryDispatcher(4, {"delete": 1})
+
+        def fail():
+            raise RuntimeError("store unavailable")
+
+        errors = await asyncio.gather(*(dispatcher.run("delete", fail) for _ in range(3)), return_exceptions=True)
+        after = await dispatcher.run("delete", lambda: "ok")
+        stats = dispatcher.snapshot()["operations"]["delete"]
+        dispatcher.shutdown()
+        return errors, after, stats
+
+    errors, after, stats = asyncio.run(session())
+    assert all(isinstance(error, RuntimeError) for error in errors) and after == "ok"
+    assert stats["failed"] == 3 and stats["completed"] == 1 and stats["in_flight"] == 0
+
+def test_cancelled_callers_keep_the_slot_until_the_thread_finishes():
+    """A caller that stops waiting does not free its slot while its call still runs on a worker thread"""
+    async def session():
+        dispatcher = MemoryDispatcher(4, {"add": 1})
+        release, calls = threading.Event(), Concurrency()
+
+        def blocking():
+            calls.enter()
+            release.wait(5)
+            calls.leave()
+
+        try:
+            await asyncio.wait_for(dispatcher.run("add", blocking), timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        held = dict(dispatcher.snapshot()["operations"]["add"])
+        second = asyncio.ensure_future(dispatcher.run("add", blocking))
+        await asyncio.sleep(0.05)
+        release.set()
+        await second
+        stats = dispatcher.snapshot()["operations"]["add"]
+        await asyncio.to_thread(dispatcher.shutdown)
+        return held, calls.peak, stats
+
+    held, peak, stats = asyncio.run(session())
+    assert held["in_flight"] == 1 and held["completed"] == 0
+    assert peak == 1
+    assert stats["completed"] == 2 and stats["in_flight"] == 0
+
+def test_parse_operation_limits():
+    """MEM0_OPERATION_LIMITS is read as name=limit pairs, ignoring blanks"""
+    assert parse_operation_limits("search=16, add=4,,") == {"search": 16, "add": 4}
+    assert parse_operation_limits("") == {}
+    assert MemoryDispatcher(8, {"add": 1}).operation_limits["search"] == 16
+
+if __name__ == "__main__":
+    print("📋 Dispatcher Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_operation_limit_caps_concurrent_calls, test_saturated_operation_does_not_block_others,
+                 test_failures_release_their_slot, test_cancelled_callers_keep_the_slot_until_the_thread_finishes,
+                 test_parse_operation_limits):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
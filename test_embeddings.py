@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for the embedding micro-batchers
+"""
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from embeddings import AsyncMicroBatcher, BatchingEmbedder, CachingEmbedder, EmbeddingCache, MicroBatcher
+from fakes import FakeEmbedder, SlowEmbedder
+
+def test_concurrent_embeds_share_round_trips():
+    """Concurrent embed calls are sent as a few batches, and each caller gets the vector of its own text"""
+    embedder = SlowEmbedder(latency=0.02)
+    batching = BatchingEmbedder(embedder, window=0.01, max_batch=16)
+    texts = [f"Person{i} works at Org{i % 7}" for i in range(64)]
+    with ThreadPoolExecutor(64) as pool:
+        vectors = list(pool.map(batching.embed, texts))
+    stats = batching.batcher.stats()
+    batching.batcher.shutdown()
+
+    expected = FakeEmbedder()
+    assert vectors == [expected.embed(text) for text in texts]
+    assert stats["items"] == 64 and embedder.round_trips == stats["batches"] <= 8
+    assert stats["average_batch_size"] >= 8
+
+def test_async_batches_respect_max_batch():
+    """The async batcher answers every caller in order and never sends more than max_batch items at once"""
+    sizes = []
+
+    async def double(items):
+        sizes.append(len(items))
+        await asyncio.sleep(0.01)
+        return [item * 2 for item in items]
+
+    async def session():
+        batcher = AsyncMicroBatcher(double, window=0.01, max_batch=8)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(50)))
+
+    assert asyncio.run(session()) == [i * 2 for i in range(50)]
+    assert max(sizes) <= 8 and sum(sizes) == 50 and len(sizes) <= 10
+
+def test_short_batch_fails_every_caller():
+    """A batch call returning fewer results than items fails all its callers instead of leaving some waiting"""
+    batcher = MicroBatcher(lambda items: items[:-1], window=0.05, max_batch=4)
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(batcher.submit, i) for i in range(4)]
+        errors = [future.exception(timeout=5) for future in futures]
+    batcher.shutdown()
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+    async def short(items):
+        return items[:-1]
+
+    async def session():
+        batcher = AsyncMicroBatcher(short, window=0.05, max_batch=4)
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(i) for i in range(4)), return_exceptions=True), timeout=5
+        )
+
+    assert all(isinstance(error, RuntimeError) for error in asyncio.run(session()))
+
+def test_shutdown_flushes_and_stops_the_collector():
+    """Shutting a batcher down answers what is pending, stops its thread and refuses new items"""
+    batcher = MicroBatcher(lambda items: [item * 2 for item in items], window=5.0, max_batch=64)
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(batcher.submit, i) for i in range(2)]
+        while len(batcher._pending) < 2:
+            time.sleep(0.001)
+        batcher.shutdown()
+        assert [future.result(timeout=5) for future in futures] == [0, 2]
+    assert not batcher._collector.is_alive()
+    try:
+        batcher.submit(3)
+        assert False, "a shut down batcher accepted an item"
+    except RuntimeError:
+        pass
+
+def test_cache_evicts_least_recently_used():
+    """Past max_entries the cache evicts the entries used longest ago, counting hits as uses"""
+    with tempfile.TemporaryDirectory() as path:
+        cache = EmbeddingCache(os.path.join(path, "embeddings.db"), max_entries=10, model="fake", dims=2)
+        old = [f"old {i}" for i in range(10)]
+        cache.put_many(old, [[float(i), 0.0] for i in range(10)])
+        time.sleep(0.01)
+        assert cache.get_many(old[:3]) == [[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]]
+        time.sleep(0.01)
+        cache.put_many([f"new {i}" for i in range(5)], [[0.0, float(i)] for i in range(5)])
+
+        kept = cache.get_many(old)
+        assert kept[:3] == [[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]]
+        assert kept[3:].count(None) == 6
+        assert cache.stats()["entries"] == 9 and None not in cache.get_many([f"new {i}" for i in range(5)])
+
+def test_cache_keys_and_model_fingerprint():
+    """Texts differing only in whitespace share an entry, and a new model or dimension starts an empty cache"""
+    with tempfile.TemporaryDirectory() as path:
+        file = os.path.join(path, "embeddings.db")
+        embedder = FakeEmbedder()
+        cached = CachingEmbedder(embedder, EmbeddingCache(file, max_entries=100, model="fake", dims=64))
+        assert cached.embed("Alice  works\nat Acme") == cached.embed("Alice works at Acme")
+        assert embedder.calls == 1
+
+        assert EmbeddingCache(file, max_entries=100, model="fake", dims=64).get_many(["Alice works at Acme"])[0]
+        for model, dims in (("other", 64), ("fake", 32)):
+            reopened = EmbeddingCache(file, max_entries=100, model=model, dims=dims)
+            assert reopened.get_many(["Alice works at Acme"]) == [None] and reopened.stats()["entries"] == 0
+
+if __name__ == "__main__":
+    print("📋 Embedding Batcher Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_concurrent_embeds_share_round_trips, test_async_batches_respect_max_batch,
+                 test_short_batch_fails_every_caller, test_shutdown_flushes_and_stops_the_collector,
+                 test_cache_evicts_least_recently_used, test_cache_keys_and_model_fingerprint):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
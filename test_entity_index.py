@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process index of graph entity names
+"""
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from entity_index import EntityIndex, alias_key, get_entity_index
+from fakes import FakeGraph, build_fake_async_memory, build_fake_memory
+
+def test_lookup_resolves_partial_and_misspelled_names():
+    index = EntityIndex()
+    index.observe({"user_id": "u1"}, ["alice_smith", "bob_smith", "acme_corp", "berlin", "project_a"])
+    index.observe({"user_id": "u2"}, ["alice_jones"])
+    u1 = {"user_id": "u1"}
+    assert alias_key("The Acme-Corp's") == "acme_corp"
+    assert index.lookup(u1, "Alice Smith") == ["alice_smith"]
+    assert index.lookup(u1, "the Acme Corp.") == ["acme_corp"]
+    assert index.lookup(u1, "Smith") == ["bob_smith", "alice_smith"]
+    assert index.lookup(u1, "ali") == ["alice_smith"]
+    assert index.lookup(u1, "Berlinn") == ["berlin"]
+    assert index.lookup(u1, "Alice Smtih") == ["alice_smith"]
+    # Too short for a typo to be safely told from another word, and other users' names stay hidden
+    assert index.lookup(u1, "zed") == [] and index.lookup(u1, "jones") == []
+    assert index.lookup({"user_id": "u1", "agent_id": "a1"}, "alice") == []
+    assert index.stats()["entities"] == 6
+
+def test_graph_writes_keep_the_index_current():
+    graph = FakeGraph()
+    graph.add("Alice works at Acme Corp.", {"user_id": "u1"})
+    memory = build_fake_memory(graph=graph)
+    index = get_entity_index(memory)
+
+    # The first write loads what the graph already held, then merges new spellings of known entities
+    graph.add("Bob works at the Acme Corp.", {"user_id": "u1"})
+    assert ("bob", "works_at", "acme_corp") in graph.relations["u1"]
+    assert "the_acme_corp" not in graph.entity_names({"user_id": "u1"})
+    assert index.lookup({"user_id": "u1"}, "bob") == ["bob"] and index.stats()["merged_on_write"] == 1
+    # Project A and Project B are one typo apart but stay separate nodes
+    graph.add("Carol works on Project A. Carol works on Project B.", {"user_id": "u1"})
+    assert {"project_a", "project_b"} <= set(graph.entity_names({"user_id": "u1"}))
+
+    graph.delete_all({"user_id": "u1"})
+    assert not index.is_loaded({"user_id": "u1"}) and index.lookup({"user_id": "u1"}, "bob") == []
+
+def test_find_relationships_resolves_the_entity():
+    for build in (build_fake_memory, build_fake_async_memory):
+        graph = FakeGraph()
+        graph.add("Alice works at Acme Corp. Bob works at Acme Corp.", {"user_id": "u1"})
+        memory = build(graph=graph)
+        app = main.Mem0Context(mem0_client=memory, dispatcher=MemoryDispatcher(4), entities=get_entity_index(memory))
+        ctx = SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+        ))
+
+        async def session():
+            response = json.loads(await main.find_relationships(ctx, "Alise", "u1"))
+            assert response["resolved_entity"] == "alice" and response["count"] == 1
+            response = json.loads(await main.find_relationships(ctx, "Acme", "u1"))
+            assert response["resolved_entity"] == "acme_corp" and response["count"] == 2
+            response = json.loads(await main.find_relationships(ctx, "alice", "u1"))
+            assert "resolved_entity" not in response
+
+        asyncio.run(session())
+        assert app.entities.stats()["lookups"] == 3
+        app.dispatcher.shutdown()
+
+if __name__ == "__main__":
+    print("📋 Entity Index Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_lookup_resolves_partial_and_misspelled_names, test_graph_writes_keep_the_index_current,
+                 test_find_relationships_resolves_the_entity):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
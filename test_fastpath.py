@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the LLM-free raw mode of save_memory and its local relation extractor
+"""
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import FakeGraph, FakeLLM, build_fake_async_memory, build_fake_memory
+from fastpath import extract_relations
+
+def make_context(mem0_client):
+    app = main.Mem0Context(mem0_client=mem0_client, dispatcher=MemoryDispatcher(4))
+    return SimpleNamespace(request_context=SimpleNamespace(
+        lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+    ))
+
+def test_extract_relations():
+    relations, types = extract_relations("Alice works at Acme. I live in Berlin and Bob and Carol met in Paris", "u1")
+    assert relations == [
+        {"source": "alice", "relationship": "works_at", "destination": "acme"},
+        {"source": "u1", "relationship": "live_in", "destination": "berlin"},
+        {"source": "carol", "relationship": "met_in", "destination": "paris"},
+    ]
+    assert types["u1"] == "person" and types["acme"] == "entity"
+    assert extract_relations("The weather was nice today", "u1") == ([], {})
+
+def test_raw_save_skips_the_llm():
+    """infer=False stores the text verbatim and still adds its relations to the graph"""
+    for build in (build_fake_memory, build_fake_async_memory):
+        llm, graph = FakeLLM(), FakeGraph()
+        ctx = make_context(build(llm=llm, graph=graph))
+
+        async def session():
+            saved = await main.save_memory(ctx, "Dana works at Initech. She likes tea.", "u1", infer=False)
+            batch = await main.save_memories(ctx, ["Eve lives in Oslo.", "Frank manages Eve."], "u1", infer=False)
+            page = await main.get_all_memories(ctx, user_id="u1")
+            return saved, batch, page
+
+        saved, batch, page = asyncio.run(session())
+        ctx.request_context.lifespan_context.dispatcher.shutdown()
+        assert saved.startswith("Successfully saved memory")
+        assert [(item["facts_extracted"], item["relationships_created"]) for item in json.loads(batch)] == [(1, 1), (1, 1)]
+        assert llm.calls == 0
+        # Stored as sent, one memory per save instead of one per extracted fact
+        assert "Dana works at Initech. She likes tea." in page
+        assert sorted(graph.get_all({"user_id": "u1"}), key=lambda r: r["source"]) == [
+            {"source": "dana", "relationship": "works_at", "target": "initech"},
+            {"source": "eve", "relationship": "lives_in", "target": "oslo"},
+            {"source": "frank", "relationship": "manages", "target": "eve"},
+        ]
+
+def test_server_default_and_queued_jobs():
+    """MEM0_INFER=false makes raw mode the default, and queued jobs keep the mode they were saved with"""
+    llm = FakeLLM()
+    ctx = make_context(build_fake_memory(llm=llm))
+    app = ctx.request_context.lifespan_context
+    os.environ["MEM0_INFER"] = "false"
+    try:
+        asyncio.run(main.save_memory(ctx, "Grace uses Python.", "u1"))
+        assert llm.calls == 0
+        asyncio.run(main.save_memory(ctx, "Heidi uses Rust.", "u1", infer=True))
+        assert llm.calls == 2
+    finally:
+        os.environ.pop("MEM0_INFER")
+
+    result = asyncio.run(main.ingest(app, "memory", {"text": "Ivan uses Go.", "user_id": "u1", "infer": False}))
+    assert result["facts_extracted"] == 1 and llm.calls == 2
+    app.dispatcher.shutdown()
+
+if __name__ == "__main__":
+    print("📋 Raw Save Mode Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_extract_relations, test_raw_save_skips_the_llm, test_server_default_and_queued_jobs):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
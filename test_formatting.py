@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for tool response formats and the response size cap
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from formatting import format_response, memory_lines
+
+def formatted(data, style: str, max_bytes: int, lines=None) -> str:
+    os.environ["MEM0_RESPONSE_FORMAT"], os.environ["MEM0_MAX_RESPONSE_BYTES"] = style, str(max_bytes)
+    try:
+        return format_response(data, lines)
+    finally:
+        del os.environ["MEM0_RESPONSE_FORMAT"], os.environ["MEM0_MAX_RESPONSE_BYTES"]
+
+def test_list_responses_stay_lists_within_the_cap():
+    """A long list is cut at an item boundary, stays a list and ends with a truncation notice"""
+    memories = [f"Memory {i}: Zoë met Person{i} in Zürich" for i in range(100)]
+    for style, max_bytes in (("compact", 500), ("pretty", 700), ("compact", 10000)):
+        output = formatted(memories, style, max_bytes)
+        assert len(output.encode()) <= max_bytes, style
+        data = json.loads(output)
+        assert isinstance(data, list)
+        if max_bytes < 10000:
+            *kept, notice = data
+            assert kept == memories[:len(kept)] and kept
+            assert notice == {"truncated": {"returned": len(kept), "total": 100}}
+            # One more item would not have fit
+            longer = [*memories[:len(kept) + 1], {"truncated": {"returned": len(kept) + 1, "total": 100}}]
+            assert len(formatted(longer, style, 0).encode()) > max_bytes
+        else:
+            assert data == memories
+
+def test_object_responses_cut_their_longest_list():
+    """An object keeps its other fields and its longest list is cut, with the counts alongside"""
+    response = {"status": "ok", "relationships": [{"source": "alice", "target": f"org{i}"} for i in range(50)],
+                "other_matches": ["acme", "acme corp"]}
+    output = formatted(response, "compact", 400)
+    data = json.loads(output)
+    assert len(output.encode()) <= 400
+    assert data["status"] == "ok" and data["other_matches"] == ["acme", "acme corp"]
+    assert data["relationships"] == response["relationships"][:len(data["relationships"])]
+    assert data["truncated"] == {"returned": len(data["relationships"]), "total": 50}
+
+def test_notice_alone_when_nothing_fits():
+    """When even the emptied response is over the cap, only the notice is sent"""
+    response = {"status": "x" * 500, "results": [1, 2, 3]}
+    assert json.loads(formatted(response, "compact", 100)) == {"truncated": {"returned": 0, "total": 3}}
+    assert json.loads(formatted(["x" * 500], "compact", 60)) == [{"truncated": {"returned": 0, "total": 1}}]
+
+def test_line_responses_end_with_a_notice():
+    """The lines format drops whole lines and says how many were shown"""
+    memories = [f"Memory {i}\nwith a line break" for i in range(40)]
+    output = formatted(memories, "lines", 200, memory_lines)
+    *kept, notice = output.split("\n")
+    assert len(output.encode()) <= 200
+    assert kept == [memory.replace("\n", " ") for memory in memories[:len(kept)]]
+    assert notice == f"[truncated: {len(kept)} of 40 shown]"
+    assert formatted(memories[:2], "lines", 200, memory_lines).split("\n") == [
+        "Memory 0 with a line break", "Memory 1 with a line break"]
+
+if __name__ == "__main__":
+    print("📋 Response Formatting Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_list_responses_stay_lists_within_the_cap, test_object_responses_cut_their_longest_list,
+                 test_notice_alone_when_nothing_fits, test_line_responses_end_with_a_notice):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for find_relationships walking the graph directly instead of going through a vector search
+"""
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import FakeGraph, build_fake_async_memory, build_fake_memory
+from graph_query import find_related
+
+FACTS = "Alice works at Acme. Bob works at Acme. Bob manages Carol. Carol lives in Oslo. Dave knows Erin."
+
+class RecordingNeo4j:
+    """Stands in for langchain's Neo4jGraph, remembering the Cypher it is sent"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def query(self, cypher, params=None):
+        self.calls.append((cypher, params))
+        return self.rows
+
+def test_cypher_round_trip():
+    rows = [{"source": "alice", "relationship": "works_at", "target": "acme", "hops": 1},
+            {"source": "bob", "relationship": "works_at", "target": "acme", "hops": 2}]
+    graph = SimpleNamespace(graph=RecordingNeo4j(rows), node_label=":`__Entity__`")
+    relationships, truncated = find_related(graph, "Alice", {"user_id": "u1", "agent_id": "a1"}, depth=2, limit=1,
+                                            relationship_types=["Works At"])
+    assert relationships == rows[:1] and truncated
+    [(cypher, params)] = graph.graph.calls
+    assert params == {"name": "alice", "user_id": "u1", "types": ["works_at"], "limit": 2, "agent_id": "a1"}
+    assert "MATCH (start :`__Entity__` {name: $name, user_id: $user_id, agent_id: $agent_id})" in cypher
+    assert "-[rels*1..2]-" in cypher and "n.agent_id = $agent_id" in cypher
+
+    for depth, limit in ((0, 10), (4, 10), (1, 0), (1, 501)):
+        try:
+            find_related(graph, "Alice", {"user_id": "u1"}, depth=depth, limit=limit)
+            assert False, "out of range arguments must be rejected"
+        except ValueError:
+            pass
+
+def test_find_relationships_walks_the_graph():
+    for build in (build_fake_memory, build_fake_async_memory):
+        graph = FakeGraph()
+        graph.add(FACTS, {"user_id": "u1"})
+        graph.add("Alice works at Initech.", {"user_id": "u2"})
+        app = main.Mem0Context(mem0_client=build(graph=graph), dispatcher=MemoryDispatcher(4))
+        ctx = SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+        ))
+
+        async def relationships(entity, **kwargs):
+            return json.loads(await main.find_relationships(ctx, entity, "u1", **kwargs))
+
+        async def session():
+            one_hop = await relationships("Alice")
+            assert one_hop["relationships"] == [{"source": "alice", "relationship": "works_at", "target": "acme", "hops": 1}]
+            two_hops = await relationships("alice", depth=2)
+            assert [(r["source"], r["hops"]) for r in two_hops["relationships"]] == [("alice", 1), ("bob", 2)]
+            three_hops = await relationships("Alice", depth=3, relationship_types=["works_at", "manages"])
+            assert [r["target"] for r in three_hops["relationships"]] == ["acme", "acme", "carol"]
+            limited = await relationships("Alice", depth=3, limit=2)
+            assert limited["count"] == 2 and limited["truncated"]
+            # Unknown entities fall back to searching memory text
+            assert "related_memories" in await relationships("Zed")
+            assert (await main.find_relationships(ctx, "Alice", "u1", depth=9)).startswith("Error")
+
+        asyncio.run(session())
+        app.dispatcher.shutdown()
+
+if __name__ == "__main__":
+    print("📋 Graph Relationships Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_cypher_round_trip, test_find_relationships_walks_the_graph):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind ingestion queue: retries, replay after a crash and pruning
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from ingestion import IngestionQueue
+
+logging.getLogger("ingestion").setLevel(logging.CRITICAL)
+
+async def wait_for_status(queue: IngestionQueue, job_id: str, status: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while (job := queue.status(job_id))["status"] != status:
+        assert time.monotonic() < deadline, f"job stayed {job['status']}, expected {status}"
+        await asyncio.sleep(0.01)
+    return job
+
+def test_failed_attempts_are_retried_then_given_up():
+    """A job is retried after a failure, and once it fails its last attempt on_failed is told"""
+    async def session(path):
+        queue = IngestionQueue(path, workers=2, max_attempts=3, retry_delay=0.01)
+        attempts, given_up = {}, []
+
+        async def handler(kind, payload):
+            attempts[payload["text"]] = attempts.get(payload["text"], 0) + 1
+            if payload["text"] == "broken" or attempts[payload["text"]] == 1:
+                raise RuntimeError("LLM unavailable")
+            return {"facts_extracted": 1}
+
+        await queue.start(handler, lambda kind, payload: given_up.append(payload["text"]))
+        flaky = queue.enqueue("memory", {"text": "flaky"})
+        broken = queue.enqueue("memory", {"text": "broken"})
+        done = await wait_for_status(queue, flaky, "done")
+        failed = await wait_for_status(queue, broken, "failed")
+        summary = queue.summary()
+        await queue.stop()
+        return done, failed, given_up, summary
+
+    with tempfile.TemporaryDirectory() as path:
+        done, failed, given_up, summary = asyncio.run(session(os.path.join(path, "queue.db")))
+    assert done["attempts"] == 2 and done["result"] == {"facts_extracted": 1} and done["last_error"] is None
+    assert failed["attempts"] == 3 and failed["last_error"] == "LLM unavailable"
+    assert given_up == ["broken"]
+    assert summary == {"pending": 0, "running": 0, "done": 1, "failed": 1}
+
+def test_jobs_interrupted_by_a_crash_are_replayed():
+    """Jobs left running by a process that died, and jobs it never started, run on the next start"""
+    async def session(path):
+        crashed = IngestionQueue(path)
+        interrupted = crashed.enqueue("conversation", {"conversation": "user: I live in Oslo"})
+        queued = crashed.enqueue("memory", {"text": "Likes tea"})
+        # Claimed by a worker that never finished
+        assert crashed._claim()[0] == interrupted
+        crashed._connection.close()
+
+        queue = IngestionQueue(path, workers=1)
+        handled = []
+
+        async def handler(kind, payload):
+            handled.append(kind)
+            return {}
+
+        await queue.start(handler)
+        jobs = [await wait_for_status(queue, job_id, "done") for job_id in (interrupted, queued)]
+        await queue.stop()
+        return jobs, handled
+
+    with tempfile.TemporaryDirectory() as path:
+        jobs, handled = asyncio.run(session(os.path.join(path, "queue.db")))
+    assert sorted(handled) == ["conversation", "memory"]
+    # The interrupted job counts the attempt it lost in the crash
+    assert [job["attempts"] for job in jobs] == [2, 1]
+
+def test_worker_survives_database_errors():
+    """A failing queue read is logged and retried instead of ending the worker"""
+    async def session(path):
+        queue = IngestionQueue(path, workers=1, retry_delay=0.01)
+        claim, errors = queue._claim, []
+
+        def locked_claim():
+            if len(errors) < 3:
+                errors.append("locked")
+                raise RuntimeError("database is locked")
+            return claim()
+
+        async def handler(kind, payload):
+            return {}
+
+        queue._claim = locked_claim
+        job_id = queue.enqueue("memory", {"text": "Likes tea"})
+        await queue.start(handler)
+        job = await wait_for_status(queue, job_id, "done")
+        await queue.stop()
+        return job, errors
+
+    with tempfile.TemporaryDirectory() as path:
+        job, errors = asyncio.run(session(os.path.join(path, "queue.db")))
+    assert job["attempts"] == 1 and len(errors) == 3
+
+def test_prune_drops_old_done_and_failed_jobs():
+    """Finished jobs past the retention window are deleted, whatever their outcome; pending ones are kept"""
+    with tempfile.TemporaryDirectory() as path:
+        queue = IngestionQueue(os.path.join(path, "queue.db"), max_attempts=1, retention_hours=1)
+        done, failed, pending = (queue.enqueue("memory", {"text": text}) for text in ("a", "b", "c"))
+        queue._complete(queue._claim()[0], {})
+        queue._fail(queue._claim()[0], 1, RuntimeError("LLM unavailable"))
+        assert queue.prune() == 0
+        queue._connection.execute("UPDATE ingestion_jobs SET updated_at = updated_at - 7200")
+        assert queue.prune() == 2
+        assert queue.status(done) is None and queue.status(failed) is None
+        assert queue.status(pending)["status"] == "pending"
+
+def test_stop_is_prompt_with_idle_workers():
+    """Stopping does not wait out the idle workers' 60 second sleep"""
+    async def session(path):
+        queue = IngestionQueue(path, workers=4)
+
+        async def handler(kind, payload):
+            return {}
+
+        for _ in range(20):
+            await queue.start(handler)
+            await asyncio.to_thread(queue.enqueue_many, "memory", [{"text": "Likes tea"}] * 4)
+            await asyncio.sleep(0.005)
+            started = time.perf_counter()
+            await asyncio.wait_for(queue.stop(), timeout=5)
+            assert time.perf_counter() - started < 1
+            queue = IngestionQueue(path, workers=4)
+        queue._connection.close()
+
+    with tempfile.TemporaryDirectory() as path:
+        asyncio.run(session(os.path.join(path, "queue.db")))
+
+if __name__ == "__main__":
+    print("📋 Ingestion Queue Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_failed_attempts_are_retried_then_given_up, test_jobs_interrupted_by_a_crash_are_replayed,
+                 test_worker_survives_database_errors, test_prune_drops_old_done_and_failed_jobs,
+                 test_stop_is_prompt_with_idle_workers):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for the BM25 lexical index and hybrid search
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import FakeEmbedder, InMemoryVectorStore, VectorRecord, build_fake_async_memory, build_fake_memory
+from lexical import (LexicalIndex, default_search_mode, install_lexical_index, looks_like_identifier, match_expression,
+                     reciprocal_rank_fusion, wait_for_backfill)
+
+FACTS = [
+    "Ticket JIRA-1234 tracks the login page timeout",
+    "The database host db-01.prod was restarted on Monday",
+    "Alice prefers dark roast coffee in the morning",
+    "The getUserProfile endpoint returns the user's settings",
+    "Ticket JIRA-987 is about the signup form",
+]
+
+def test_query_helpers():
+    assert match_expression("JIRA-1234 login") == '"jira 1234" OR "login"'
+    assert looks_like_identifier("JIRA-1234") and looks_like_identifier("db-01.prod") and looks_like_identifier("getUserProfile")
+    assert not looks_like_identifier("what coffee does Alice like")
+    fused = reciprocal_rank_fusion([[{"id": "a"}, {"id": "b"}], [{"id": "b"}, {"id": "c"}]], 3)
+    assert [memory["id"] for memory in fused] == ["b", "a", "c"]
+    # Hybrid and auto are opt-in; plain vector ranking stays the default
+    if "MEM0_SEARCH_MODE" not in os.environ:
+        assert default_search_mode() == "vector"
+
+def test_lexical_and_hybrid_search():
+    for build in (build_fake_memory, build_fake_async_memory):
+        with tempfile.TemporaryDirectory() as directory:
+            embedder = FakeEmbedder()
+            memory = build(embedder=embedder)
+            app = main.Mem0Context(mem0_client=memory, dispatcher=MemoryDispatcher(4))
+            ctx = SimpleNamespace(request_context=SimpleNamespace(
+                lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+            ))
+
+            async def session():
+                # Saved before the index existed: found through the backfill started by the first lexical search
+                await main.save_memories(ctx, FACTS[:3], "u1", infer=False)
+                app.lexical = LexicalIndex(os.path.join(directory, "lexical.db"))
+                install_lexical_index(memory, app.lexical)
+                await main.save_memories(ctx, FACTS[3:], "u1", infer=False)
+                await main.save_memory(ctx, "Ticket JIRA-1234 belongs to someone else", "u2", infer=False)
+
+                # Until the backfill finishes, the vector search answers
+                assert len(json.loads(await main.search_memories(ctx, "JIRA-1234", 3, "u1", mode="lexical"))) == 3
+                await wait_for_backfill(app.lexical, "u1")
+
+                calls = embedder.calls
+                assert json.loads(await main.search_memories(ctx, "JIRA-1234", 3, "u1", mode="auto")) == [FACTS[0]]
+                assert json.loads(await main.search_memories(ctx, "getUserProfile", 3, "u1", mode="lexical")) == [FACTS[3]]
+                assert embedder.calls == calls, "identifier searches should not embed the query"
+
+                hybrid = json.loads(await main.search_memories(ctx, "db-01.prod restarted host", 2, "u1", mode="hybrid"))
+                assert hybrid[0] == FACTS[1]
+
+                # Updates and deletes reach the index through the vector store
+                [found] = (await main.search_in_mode(app, "JIRA-987", main.Tenant(user_id="u1"), 3, "lexical"))["results"]
+                await main.update_memory(ctx, found["id"], "Ticket JIRA-555 is about the signup form", "u1")
+                assert json.loads(await main.search_memories(ctx, "JIRA-987", 3, "u1", mode="lexical")) == []
+                [found] = (await main.search_in_mode(app, "JIRA-555", main.Tenant(user_id="u1"), 3, "lexical"))["results"]
+                await main.delete_memory(ctx, found["id"], "u1")
+                assert json.loads(await main.search_memories(ctx, "JIRA-555", 3, "u1", mode="lexical")) == []
+                assert (await main.search_memories(ctx, "x", 3, "u1", mode="fuzzy")).startswith("Error")
+
+            asyncio.run(session())
+            app.lexical.close()
+            app.dispatcher.shutdown()
+
+def test_writes_made_elsewhere_are_caught_up():
+    """Memories deleted, updated or added behind the index's back are never served stale"""
+    for build in (build_fake_memory, build_fake_async_memory):
+        with tempfile.TemporaryDirectory() as directory:
+            store = InMemoryVectorStore()
+            memory = build(vector_store=store)
+            app = main.Mem0Context(mem0_client=memory, dispatcher=MemoryDispatcher(4),
+                                   lexical=LexicalIndex(os.path.join(directory, "lexical.db"), refresh=0))
+            install_lexical_index(memory, app.lexical)
+            tenant = main.Tenant(user_id="u1")
+
+            async def lexical(query):
+                return [found["memory"] for found in (await main.search_in_mode(app, query, tenant, 3, "lexical"))["results"]]
+
+            async def session():
+                await main.save_memories(SimpleNamespace(request_context=SimpleNamespace(
+                    lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+                )), FACTS[:2], infer=False)
+                await lexical("JIRA-1234")
+                await wait_for_backfill(app.lexical, "u1")
+                ticket = next(record for record in store.records.values() if "JIRA-1234" in record.payload["data"])
+                host = next(record for record in store.records.values() if "db-01.prod" in record.payload["data"])
+                # Another replica deletes one memory and rewrites another, straight in the shared store
+                del store.records[ticket.id]
+                host.payload = {**host.payload, "data": "The database host db-01.prod was retired"}
+                assert await lexical("JIRA-1234") == []
+                assert await lexical("db-01.prod") == ["The database host db-01.prod was retired"]
+                assert app.lexical.stats()["indexed_memories"] == 1
+                # ...and adds one, found once the user's memories are read again
+                await wait_for_backfill(app.lexical, "u1")
+                store.records["elsewhere"] = VectorRecord("elsewhere", {"data": FACTS[4], "user_id": "u1"}, vector=[0.0])
+                assert await lexical("JIRA-987") == []
+                await wait_for_backfill(app.lexical, "u1")
+                assert await lexical("JIRA-987") == [FACTS[4]]
+
+            asyncio.run(session())
+            app.lexical.close()
+            app.dispatcher.shutdown()
+
+def test_backfill_runs_once_per_user_in_batches():
+    """Concurrent first searches share one backfill, which writes each page in one transaction"""
+    with tempfile.TemporaryDirectory() as directory:
+        memory = build_fake_memory()
+        app = main.Mem0Context(mem0_client=memory, dispatcher=MemoryDispatcher(4),
+                               lexical=LexicalIndex(os.path.join(directory, "lexical.db")))
+        ctx = SimpleNamespace(request_context=SimpleNamespace(
+            lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+        ))
+        batches, upsert_many = [], app.lexical.upsert_many
+        app.lexical.upsert_many = lambda items: (batches.append(len(items)), upsert_many(items))
+
+        async def session():
+            await main.save_memories(ctx, FACTS, "u1", infer=False)
+            await asyncio.gather(*(main.search_in_mode(app, "JIRA-1234", main.Tenant(user_id="u1"), 3, "lexical")
+                                   for _ in range(5)))
+            await wait_for_backfill(app.lexical, "u1")
+            return (await main.search_in_mode(app, "JIRA-1234", main.Tenant(user_id="u1"), 3, "lexical"))["results"]
+
+        results = asyncio.run(session())
+        app.lexical.close()
+        app.dispatcher.shutdown()
+    assert batches == [len(FACTS)]
+    assert [found["memory"] for found in results] == [FACTS[0]]
+
+if __name__ == "__main__":
+    print("📋 Lexical Search Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_query_helpers, test_lexical_and_hybrid_search, test_writes_made_elsewhere_are_caught_up,
+                 test_backfill_runs_once_per_user_in_batches):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for session recording and the SSE load generator, against an in-process server
+"""
+import asyncio
+from contextlib import contextmanager
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+import loadgen
+import main
+from fakes import build_fake_memory
+
+@contextmanager
+def serving(**env):
+    """Serve main.mcp over SSE on a free port, with the fake Mem0 client in place of the real one.
+
+    The server runs with env set and its files in a temp MEM0_DIR; the real client and the
+    environment are restored, and the server thread joined, afterwards.
+    """
+    env = {"MEM0_DIR": tempfile.mkdtemp(), **env}
+    saved_client, saved_env = main.get_mem0_client, {name: os.environ.get(name) for name in env}
+    main.get_mem0_client = build_fake_memory
+    os.environ.update(env)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(main.mcp.sse_app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            assert thread.is_alive(), "the server did not start"
+            time.sleep(0.01)
+        yield f"http://127.0.0.1:{port}/sse"
+    finally:
+        server.should_exit = True
+        thread.join(10)
+        main.get_mem0_client = saved_client
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+async def agent_session(url: str, user: str):
+    async with sse_client(url, headers={"x-mem0-user-id": user}) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await session.call_tool("save_memory", {"text": f"{user} works at Acme."})
+            await asyncio.sleep(0.05)
+            await session.call_tool("search_memories", {"query": "Acme", "limit": 3})
+            await session.call_tool("delete_memory", {"memory_id": "missing"})
+
+def test_record_and_replay():
+    """Recorded sessions keep their order, gaps and tenant, and replaying them reports every tool"""
+    path = os.path.join(tempfile.mkdtemp(), "sessions.jsonl")
+    with serving(MEM0_RECORD_SESSIONS=path) as url:
+        async def record():
+            await asyncio.gather(agent_session(url, "alice"), agent_session(url, "bob"))
+
+        asyncio.run(record())
+        sessions = loadgen.load_sessions(path)
+        assert len(sessions) == 2
+        for calls in sessions:
+            assert [call["tool"] for call in calls] == ["save_memory", "search_memories", "delete_memory"]
+            assert calls[1]["offset"] - calls[0]["offset"] >= 0.05
+            assert calls[0]["headers"]["x-mem0-user-id"] in ("alice", "bob")
+            assert [call["error"] for call in calls] == [False, False, True]
+
+        level = asyncio.run(loadgen.run_level(url, sessions, agents=3, duration=1.0, speed=0, rate=0, isolate=True))
+        assert set(level["tools"]) == {"save_memory", "search_memories", "delete_memory"}
+        assert level["tools"]["search_memories"]["errors"] == 0
+        assert level["tools"]["delete_memory"]["errors"] == level["tools"]["delete_memory"]["calls"]
+    assert main.get_mem0_client is not build_fake_memory and "MEM0_RECORD_SESSIONS" not in os.environ
+
+def test_saturation_point():
+    def level(agents, throughput, p95):
+        return {"agents": agents, "throughput": throughput, "tools": {"search_memories": {"p95_ms": p95}}}
+
+    growing = [level(1, 10, 50), level(2, 20, 55), level(4, 39, 60)]
+    assert loadgen.find_saturation(growing, "search_memories", 500, 0.1)["agents"] is None
+    plateau = growing + [level(8, 40, 120)]
+    assert loadgen.find_saturation(plateau, "search_memories", 500, 0.1)["max_agents_within_slo"] == 4
+    slow = growing + [level(8, 70, 900)]
+    assert loadgen.find_saturation(slow, "search_memories", 500, 0.1) == {
+        "agents": 8, "reason": "search_memories p95 900 ms > 500 ms", "max_agents_within_slo": 4
+    }
+
+if __name__ == "__main__":
+    print("📋 Load Generator Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_record_and_replay, test_saturation_point):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
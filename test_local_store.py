@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process vector store used with VECTOR_STORE_PROVIDER=local
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from local_store import LocalVectorStore
+from quantization import QUANTIZERS, BinaryQuantizer, ScalarQuantizer
+
+def random_vectors(count: int, dims: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, dims)).astype(np.float32)
+
+def test_search_filters_and_persistence():
+    """Points survive reopening the files, and search only returns the requested user's points"""
+    path = tempfile.mkdtemp()
+    vectors = random_vectors(500, 16)
+    store = LocalVectorStore(path, "memories", 16)
+    store.insert(vectors, [{"data": f"fact {i}", "user_id": f"user-{i % 2}"} for i in range(500)],
+                 [f"id-{i}" for i in range(500)])
+    store.update("id-10", vectors[11].tolist(), {"data": "moved", "user_id": "user-0"})
+    store.delete_many(["id-3", "id-4"])
+
+    reopened = LocalVectorStore(path, "memories", 16)
+    assert reopened.col_info()["points"] == 498
+    assert reopened.get("id-3") is None
+    assert reopened.get("id-10").payload["data"] == "moved"
+
+    hits = reopened.search("query", vectors[11].tolist(), limit=5, filters={"user_id": "user-0"})
+    assert all(hit.payload["user_id"] == "user-0" for hit in hits)
+    assert hits[0].id == "id-10"
+    assert reopened.search("query", vectors[0].tolist(), filters={"user_id": "nobody"}) == []
+
+def test_scroll_visits_every_point_once():
+    """Paging with the returned offset covers the filtered points exactly once"""
+    store = LocalVectorStore(tempfile.mkdtemp(), "memories", 8)
+    store.insert(random_vectors(230, 8), [{"user_id": "user" if i % 3 else "other"} for i in range(230)],
+                 [f"id-{i}" for i in range(230)])
+    seen, offset = [], None
+    while True:
+        records, offset = store.scroll({"user_id": "user"}, limit=50, offset=offset)
+        seen.extend(record.id for record in records)
+        if offset is None:
+            break
+    assert sorted(seen) == sorted(f"id-{i}" for i in range(230) if i % 3)
+
+def test_ivf_index_keeps_recall():
+    """Once the IVF index is trained, near-duplicate queries still find their source point"""
+    vectors = random_vectors(5000, 32)
+    store = LocalVectorStore(tempfile.mkdtemp(), "memories", 32, ivf_min_points=2000)
+    store.insert(vectors, [{"user_id": "user"}] * 5000, [str(i) for i in range(5000)])
+    # Training crosses ivf_min_points inside insert, so it runs in the background
+    store.wait_for_index()
+    assert store.col_info()["index"] == "ivf"
+
+    queries = vectors[:100] + np.random.default_rng(1).normal(scale=0.2, size=(100, 32)).astype(np.float32)
+    found = sum(store.search("query", query, limit=1, filters={"user_id": "user"})[0].id == str(i)
+                for i, query in enumerate(queries))
+    assert found >= 90
+
+def test_quantized_search_reranks_with_full_vectors():
+    """Each quantization mode finds near-duplicates through its codes, and keeps them after reopening"""
+    vectors = random_vectors(3000, 64)
+    queries = vectors[:50] + np.random.default_rng(1).normal(scale=0.2, size=(50, 64)).astype(np.float32)
+    for mode in ("int8", "binary", "pq"):
+        path = tempfile.mkdtemp()
+        store = LocalVectorStore(path, "memories", 64, index="flat", quantization=mode, quantize_min_points=1000)
+        store.insert(vectors, [{"user_id": "user"}] * 3000, [str(i) for i in range(3000)])
+        store.wait_for_index()
+        reopened = LocalVectorStore(path, "memories", 64, index="flat", quantization=mode, quantize_min_points=1000)
+        assert reopened.col_info()["quantization"] == mode
+
+        hits = [reopened.search("query", query, limit=1, filters={"user_id": "user"})[0] for query in queries]
+        assert sum(hit.id == str(i) for i, hit in enumerate(hits)) >= 48, mode
+        # Re-ranked scores are exact cosine similarities, not code distances
+        expected = float(vectors[int(hits[0].id)] @ queries[0] / np.linalg.norm(vectors[int(hits[0].id)])
+                         / np.linalg.norm(queries[0]))
+        assert abs(hits[0].score - expected) < 1e-4, mode
+
+def test_writes_during_quantizer_training_are_encoded():
+    """Points inserted, updated or deleted while the quantizer trains in the background get codes from it"""
+    vectors = random_vectors(1400, 32)
+    store = LocalVectorStore(tempfile.mkdtemp(), "memories", 32, index="flat", quantization="int8",
+                             quantize_min_points=1000)
+
+    def train_while_writing(sample):
+        # Runs on the training thread, without the store lock; the writes land before the codes are swapped in
+        store.insert(vectors[1000:1300], [{"user_id": "user"}] * 300, [str(i) for i in range(1000, 1300)])
+        store.update("5", vectors[1300].tolist())
+        store.delete("6")
+        return ScalarQuantizer.train(sample)
+
+    QUANTIZERS["int8"] = type("TrainWhileWriting", (ScalarQuantizer,), {"train": staticmethod(train_while_writing)})
+    try:
+        store.insert(vectors[:1000], [{"user_id": "user"}] * 1000, [str(i) for i in range(1000)])
+        store.wait_for_index()
+    finally:
+        QUANTIZERS["int8"] = ScalarQuantizer
+    assert store.col_info()["quantization"] == "int8" and store.col_info()["points"] == 1299
+    live = np.flatnonzero(store._live[:store._high])
+    expected = store._quantizer.encode(np.asarray(store._vectors[live], dtype=np.float32))
+    assert (np.asarray(store._quantized[live]) == expected).all()
+    assert store.search("query", vectors[1300], limit=1)[0].id == "5"
+
+def test_search_during_deletes_scores_the_points_it_returns():
+    """A slot freed and reused while a search scores it is dropped, never reported with another point's score"""
+    vectors = random_vectors(200, 16)
+    store = LocalVectorStore(tempfile.mkdtemp(), "memories", 16, index="flat")
+    store.insert(vectors[:100], [{"row": i} for i in range(100)], [str(i) for i in range(100)])
+    score = store._score
+
+    def score_then_replace(*args):
+        # Another thread deletes the best match and its slot is reused before the search reads it back
+        scores = score(*args)
+        store.delete("0")
+        store.insert(vectors[100:101], [{"row": 100}], ["new"])
+        return scores
+
+    store._score = score_then_replace
+    hits = store.search("query", vectors[0], limit=3)
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    assert hits and all(hit.id != "new" for hit in hits)
+    assert all(abs(hit.score - float(unit[hit.payload["row"]] @ unit[0])) < 1e-4 for hit in hits)
+
+def test_binary_distances_without_bitwise_count():
+    """Binary codes score the same through the byte table numpy before 2.0 falls back to"""
+    quantizer = BinaryQuantizer(100)
+    codes, query = quantizer.encode(random_vectors(500, 100)), random_vectors(1, 100)[0]
+    expected = quantizer.scores(codes, query)
+    bitwise_count = np.__dict__.pop("bitwise_count", None)
+    try:
+        assert (quantizer.scores(codes, query) == expected).all()
+    finally:
+        if bitwise_count is not None:
+            np.bitwise_count = bitwise_count
+
+if __name__ == "__main__":
+    print("📋 Local Vector Store Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_search_filters_and_persistence, test_scroll_visits_every_point_once, test_ivf_index_keeps_recall,
+                 test_quantized_search_reranks_with_full_vectors, test_writes_during_quantizer_training_are_encoded,
+                 test_search_during_deletes_scores_the_points_it_returns,
+                 test_binary_distances_without_bitwise_count):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
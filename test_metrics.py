@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus metrics of tools and Memory stages
+"""
+import asyncio
+import os
+import re
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from starlette.testclient import TestClient
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import build_fake_async_memory, build_fake_memory
+from metrics import REGISTRY, MetricsRegistry, install_metrics
+
+def sample(text: str, name: str, **labels) -> float:
+    """The value of one sample in a Prometheus text exposition, or 0 when absent"""
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{{{re.escape(label_text)}}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+def test_histogram_exposition():
+    """Buckets are cumulative and end with +Inf, and collectors are rendered after the registered metrics"""
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("op",), buckets=(0.1, 1.0))
+    series = latency.labels("search")
+    for seconds in (0.05, 0.5, 5.0):
+        latency.observe(series, seconds)
+    registry.add_collector("queue", lambda: [("queue_depth", "gauge", "Queue depth.", [({}, 3)])])
+    text = registry.render()
+
+    assert sample(text, "latency_seconds_bucket", op="search", le="0.1") == 1
+    assert sample(text, "latency_seconds_bucket", op="search", le="1.0") == 2
+    assert sample(text, "latency_seconds_bucket", op="search", le="+Inf") == 3
+    assert sample(text, "latency_seconds_count", op="search") == 3
+    assert sample(text, "latency_seconds_sum", op="search") == 5.55
+    assert "# TYPE latency_seconds histogram" in text
+    assert re.search(r"^queue_depth 3$", text, re.MULTILINE)
+
+def test_tools_and_stages_are_measured():
+    """Tool calls, their outcomes and the LLM, embedding and vector store calls behind them are all counted"""
+    async def session(mem0_client):
+        app = main.Mem0Context(mem0_client=install_metrics(mem0_client), dispatcher=MemoryDispatcher(4))
+        ctx = SimpleNamespace(request_context=SimpleNamespace(lifespan_context=app, request=None, session=None))
+        await main.save_memory(ctx, "Alice works at Acme.")
+        await main.search_memories(ctx, "Acme")
+        await main.delete_memory(ctx, "no-such-memory")
+        app.dispatcher.shutdown()
+
+    for mem0_client in (build_fake_memory(), build_fake_async_memory()):
+        before = REGISTRY.render()
+        asyncio.run(session(mem0_client))
+        after = REGISTRY.render()
+
+        def delta(name, **labels):
+            return sample(after, name, **labels) - sample(before, name, **labels)
+
+        assert delta("mem0_tool_calls_total", tool="save_memory", status="ok") == 1
+        assert delta("mem0_tool_calls_total", tool="delete_memory", status="error") == 1
+        assert delta("mem0_tool_duration_seconds_count", tool="search_memories") == 1
+        assert delta("mem0_stage_duration_seconds_count", stage="llm", method="generate_response") >= 1
+        assert delta("mem0_stage_duration_seconds_count", stage="embedding", method="embed") >= 1
+        assert delta("mem0_stage_duration_seconds_count", stage="vector_store", method="search") >= 1
+        assert delta("mem0_stage_duration_seconds_count", stage="serialize", method="format_response") == 1
+        assert sample(after, "mem0_tool_in_flight", tool="save_memory") == 0
+
+def test_metrics_endpoint():
+    """/metrics is served by the SSE app in the Prometheus text format"""
+    response = TestClient(main.mcp.sse_app()).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE mem0_tool_duration_seconds histogram" in response.text
+
+if __name__ == "__main__":
+    print("📋 Metrics Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_histogram_exposition, test_tools_and_stages_are_measured, test_metrics_endpoint):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
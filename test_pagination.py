@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for paging through memories on vector stores without a native cursor
+"""
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from sqlalchemy import JSON, Column, MetaData, String, Table, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from dispatch import MemoryDispatcher
+from fakes import InMemoryVectorStore, VectorRecord
+from pagination import fetch_page
+
+def vecs_collection(count: int):
+    """A stand-in for a vecs collection: its table, in SQLite, and the client's session factory"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    table = Table("memories", MetaData(), Column("id", String, primary_key=True), Column("metadata", JSON))
+    table.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(table.insert(), [{"id": f"id-{i:02d}", "metadata": {"data": f"Fact number {i}"}}
+                                            for i in range(count)])
+    return SimpleNamespace(table=table, client=SimpleNamespace(Session=sessionmaker(engine)))
+
+async def walk(vector_store, page_size: int) -> tuple[list[str], int]:
+    dispatcher = MemoryDispatcher(4)
+    memories, cursor, pages = [], "", 0
+    while cursor is not None:
+        page, cursor = await fetch_page(SimpleNamespace(vector_store=vector_store), dispatcher, {}, cursor, page_size)
+        memories.extend(memory["memory"] for memory in page)
+        pages += 1
+    dispatcher.shutdown()
+    return memories, pages
+
+def test_vecs_tables_are_paged_by_id():
+    """A vecs collection is read a page at a time, each page starting after the last id of the one before"""
+    memories, pages = asyncio.run(walk(SimpleNamespace(collection=vecs_collection(7)), 3))
+    assert memories == [f"Fact number {i}" for i in range(7)] and pages == 3
+
+def test_stores_without_a_cursor_list_everything_at_once():
+    """Any other store without a cursor returns every memory in one page, whatever the page size"""
+    store = InMemoryVectorStore()
+    for i in range(7):
+        store.records[str(i)] = VectorRecord(str(i), {"data": f"Fact number {i}"})
+    memories, pages = asyncio.run(walk(SimpleNamespace(list=store.list), 3))
+    assert sorted(memories) == [f"Fact number {i}" for i in range(7)] and pages == 1
+
+if __name__ == "__main__":
+    print("📋 Pagination Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_vecs_tables_are_paged_by_id, test_stores_without_a_cursor_list_everything_at_once):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared connection pools of the LLM, embedder, Qdrant and Neo4j clients
+"""
+from http.server import ThreadingHTTPServer
+import os
+import sys
+import threading
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import openai
+
+from benchmark import KeepAliveHandler
+from pooling import ConnectionPools, PoolSettings, get_pool_settings
+
+def test_connections_are_reused_and_counted():
+    """Sequential calls share one kept-alive connection, and turning keep-alive off opens one per call"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/embeddings"
+    try:
+        for settings, expected in ((PoolSettings(), 1), (PoolSettings(max_keepalive=0), 5)):
+            pools = ConnectionPools(settings)
+            client = pools.http_client("embedder")
+            for _ in range(5):
+                assert client.post(url, json={"input": "hello"}).status_code == 200
+            stats = pools.snapshot()["backends"]["embedder"]
+            assert stats["requests"] == 5
+            assert stats["connections_opened"] == expected
+            assert stats["open_connections"] == (1 if expected == 1 else 0)
+            pools.close()
+    finally:
+        server.shutdown()
+
+def test_clients_share_the_backend_pool():
+    """SDK clients of one backend use the same transport, and Qdrant gets explicit keep-alive limits or gRPC"""
+    pools = ConnectionPools(PoolSettings(max_keepalive=7))
+    llm = pools.pool_client(openai.OpenAI(api_key="test"), "llm")
+    graph_llm = pools.pool_client(openai.OpenAI(api_key="test"), "llm")
+    assert llm._client._transport is graph_llm._client._transport is pools.transport("llm")
+    assert pools.transport("llm") is not pools.transport("embedder")
+
+    rest = pools.qdrant_kwargs()
+    assert rest["transport"] is pools.transport("qdrant")
+    assert rest["limits"].max_keepalive_connections == 7
+    grpc = ConnectionPools(PoolSettings(qdrant_grpc=True)).qdrant_kwargs()
+    assert grpc["prefer_grpc"] and "transport" not in grpc
+    assert pools.neo4j_driver_config()["max_connection_pool_size"] == 50
+
+def test_settings_from_environment():
+    os.environ.update({"MEM0_HTTP_MAX_CONNECTIONS": "12", "MEM0_HTTP2": "true", "NEO4J_MAX_POOL_SIZE": "5"})
+    try:
+        settings = get_pool_settings()
+    finally:
+        for key in ("MEM0_HTTP_MAX_CONNECTIONS", "MEM0_HTTP2", "NEO4J_MAX_POOL_SIZE"):
+            os.environ.pop(key)
+    assert (settings.max_connections, settings.http2, settings.neo4j_pool_size) == (12, True, 5)
+    assert settings.max_keepalive == PoolSettings().max_keepalive
+
+if __name__ == "__main__":
+    print("📋 Connection Pooling Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_connections_are_reused_and_counted, test_clients_share_the_backend_pool,
+                 test_settings_from_environment):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
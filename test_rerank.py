@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for reranking over-fetched search candidates
+"""
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import build_fake_memory
+from rerank import OverlapScorer, Reranker
+
+class RecordingScorer(OverlapScorer):
+    """OverlapScorer that remembers how many searches each scoring call covered"""
+
+    def __init__(self):
+        self.calls = []
+
+    def score_many(self, requests):
+        self.calls.append(len(requests))
+        return super().score_many(requests)
+
+def test_overlap_scorer_prefers_the_answer():
+    texts = ["Alice lives in Oslo", "Bob works at Initech", "Alice works at Acme", "Alice enjoys hiking"]
+    scores = OverlapScorer().score("Where does Alice work?", texts)
+    assert max(range(len(texts)), key=scores.__getitem__) == 2
+    assert OverlapScorer().score("the", texts) == [0.0] * 4
+
+def test_concurrent_searches_share_scoring_calls():
+    memory = build_fake_memory()
+    dispatcher = MemoryDispatcher(4)
+    scorer = RecordingScorer()
+    app = main.Mem0Context(mem0_client=memory, dispatcher=dispatcher, search_mode="vector",
+                           reranker=Reranker(scorer, dispatcher, candidates=40, window=0.02))
+    ctx = SimpleNamespace(request_context=SimpleNamespace(
+        lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+    ))
+    texts = [f"Person{i} works at Org{i} as an engineer" for i in range(20)]
+    texts += [f"Person{i} lives in City{i} near the river" for i in range(20)]
+
+    async def session():
+        await main.save_memories(ctx, texts, "u1", infer=False)
+        answers = await asyncio.gather(*(main.search_memories(ctx, f"Where does Person{i} live?", 1, "u1")
+                                         for i in range(8)))
+        for i, answer in enumerate(answers):
+            [found] = json.loads(answer)
+            assert found.startswith(f"Person{i} ") and "lives" in found, found
+        assert sum(scorer.calls) == 8 and len(scorer.calls) < 8
+        # Turned off per call, and refused when the server has no reranker
+        await main.search_memories(ctx, "Where does Person1 live?", 1, "u1", rerank=False)
+        assert sum(scorer.calls) == 8
+        app.reranker = None
+        assert (await main.search_memories(ctx, "Person1", 1, "u1", rerank=True)).startswith("Error")
+
+    asyncio.run(session())
+    dispatcher.shutdown()
+
+if __name__ == "__main__":
+    print("📋 Rerank Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_overlap_scorer_prefers_the_answer, test_concurrent_searches_share_scoring_calls):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the search result cache in front of search_memories
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from embeddings import CachingEmbedder, EmbeddingCache
+from fakes import FakeEmbedder, build_fake_memory
+from result_cache import SearchResultCache
+
+def make_context(app):
+    return SimpleNamespace(request_context=SimpleNamespace(
+        lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+    ))
+
+def test_near_matches_keep_numbers_and_identifiers_apart():
+    """A similar query with other numbers, or an identifier query, is never answered from another's result"""
+    cache = SearchResultCache(threshold=0.9)
+    embedder = FakeEmbedder()
+    for query in ("status of ticket 1234", "JIRA-1234"):
+        cache.put("u1", 3, query, embedder.embed(query), [query], cache.generation("u1"))
+
+    assert cache.get_similar("u1", 3, "Status of ticket 1234?", embedder.embed("Status of ticket 1234?")) == [
+        "status of ticket 1234"]
+    assert cache.get_similar("u1", 3, "status of ticket 1235", embedder.embed("status of ticket 1235")) is None
+    assert cache.get_similar("u1", 3, "JIRA-1234", embedder.embed("JIRA-1234")) is None
+    assert cache.get_exact("u1", 3, "JIRA-1234") == ["JIRA-1234"]
+
+def test_searches_embed_once_per_query():
+    """Without an embedding cache each search embeds its query once; with one, a reworded repeat is served from cache"""
+    async def session(embedder):
+        app = main.Mem0Context(mem0_client=build_fake_memory(embedder=embedder), dispatcher=MemoryDispatcher(4),
+                               search_cache=SearchResultCache(threshold=0.9))
+        ctx = make_context(app)
+        await main.save_memories(ctx, ["Alice works at Acme.", "Bob lives in Oslo."], infer=False)
+        before = counting.calls
+        first = json.loads(await main.search_memories(ctx, "Where does Alice work", mode="vector"))
+        second = json.loads(await main.search_memories(ctx, "where does alice work?", mode="vector"))
+        app.dispatcher.shutdown()
+        return first, second, counting.calls - before, app.search_cache.stats()["hits"]
+
+    counting = FakeEmbedder()
+    first, second, calls, hits = asyncio.run(session(counting))
+    assert first == second and calls == 2 and hits == 0
+
+    with tempfile.TemporaryDirectory() as path:
+        counting = FakeEmbedder()
+        cache = EmbeddingCache(os.path.join(path, "embeddings.db"), max_entries=100, model="fake", dims=64)
+        first, second, calls, hits = asyncio.run(session(CachingEmbedder(counting, cache)))
+    # The probe and the search share one provider call, and the reworded query is answered by the near match
+    assert first == second and calls == 2 and hits == 1
+
+def test_writes_invalidate_cached_searches():
+    """A save, update or delete for the user makes the next search run again and see the change"""
+    async def session():
+        app = main.Mem0Context(mem0_client=build_fake_memory(), dispatcher=MemoryDispatcher(4),
+                               search_cache=SearchResultCache(threshold=0.9))
+        ctx = make_context(app)
+
+        async def search():
+            return json.loads(await main.search_memories(ctx, "Where does Alice work", limit=5, mode="vector"))
+
+        await main.save_memory(ctx, "Alice works at Acme.", infer=False)
+        seen = [await search(), await search()]
+        await main.save_memory(ctx, "Alice works at Initech now.", infer=False)
+        seen.append(await search())
+        memories = json.loads(await main.get_all_memories(ctx))["memories"]
+        ids = {memory["memory"]: memory["id"] for memory in memories}
+        await main.update_memory(ctx, ids["Alice works at Acme."], "Alice worked at Acme.")
+        seen.append(await search())
+        await main.delete_memory(ctx, ids["Alice works at Initech now."])
+        seen.append(await search())
+        stats = app.search_cache.stats()
+        app.dispatcher.shutdown()
+        return seen, stats
+
+    seen, stats = asyncio.run(session())
+    assert seen[0] == seen[1] == ["Alice works at Acme."]
+    assert sorted(seen[2]) == ["Alice works at Acme.", "Alice works at Initech now."]
+    assert sorted(seen[3]) == ["Alice worked at Acme.", "Alice works at Initech now."]
+    assert seen[4] == ["Alice worked at Acme."]
+    assert stats["hits"] == 1 and stats["misses"] == 4
+
+def test_invalidation_is_per_user_and_catches_racing_searches():
+    """A write drops only its user's results, and a result computed across a write is never cached"""
+    cache = SearchResultCache()
+    for user_id in ("u1", "u2"):
+        cache.put(user_id, 5, "where does alice work", None, [user_id], cache.generation(user_id))
+
+    started = cache.generation("u1")
+    cache.invalidate("u1")
+    # A search that began before the write finishes after it
+    cache.put("u1", 5, "who is bob", None, ["stale"], started)
+    assert cache.get_exact("u1", 5, "where does alice work") is None
+    assert cache.get_exact("u1", 5, "who is bob") is None
+    assert cache.get_exact("u2", 5, "where does  alice work") == ["u2"]
+
+def test_entries_expire_after_ttl():
+    """Results older than the TTL are searched again even without a write"""
+    cache = SearchResultCache(ttl=0.05)
+    cache.put("u1", 5, "where does alice work", None, ["Acme"], cache.generation("u1"))
+    assert cache.get_exact("u1", 5, "where does alice work") == ["Acme"]
+    time.sleep(0.06)
+    assert cache.get_exact("u1", 5, "where does alice work") is None
+
+if __name__ == "__main__":
+    print("📋 Search Result Cache Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_near_matches_keep_numbers_and_identifiers_apart, test_searches_embed_once_per_query,
+                 test_writes_invalidate_cached_searches, test_invalidation_is_per_user_and_catches_racing_searches,
+                 test_entries_expire_after_ttl):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
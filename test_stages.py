@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for running the vector and graph stages of searches and saves under their own timeouts
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import FakeGraph, build_fake_async_memory, build_fake_memory
+from stages import StageTimeouts
+
+class BrokenGraph(FakeGraph):
+    """A graph store whose database is down"""
+
+    def search(self, query, filters, limit=100):
+        raise ConnectionError("Neo4j unavailable")
+
+def make_context(build, graph, timeouts):
+    app = main.Mem0Context(mem0_client=build(graph=graph), dispatcher=MemoryDispatcher(8), stages=timeouts)
+    return app, SimpleNamespace(request_context=SimpleNamespace(
+        lifespan_context=app, request=SimpleNamespace(headers={"x-mem0-user-id": "u1"}), session=None
+    ))
+
+def test_slow_graph_returns_partial_results():
+    for build in (build_fake_memory, build_fake_async_memory):
+        graph = FakeGraph(latency=0.5)
+        app, ctx = make_context(build, graph, StageTimeouts(graph=0.05))
+        tenant = main.Tenant(user_id="u1")
+
+        async def session():
+            started = time.perf_counter()
+            saved = await main.save_memory(ctx, "Alice works at Acme.", "u1")
+            assert saved == "Successfully saved memory: Alice works at Acme. (graph stage timed out after 0.05s)"
+            result = await main.search_memory(app, "Where does Alice work?", tenant, 5)
+            assert time.perf_counter() - started < 0.4
+            assert [memory["memory"] for memory in result["results"]] == ["Alice works at Acme"]
+            assert result["partial"] and result["stage_errors"] == {"graph": "timed out after 0.05s"}
+            # The graph write was left running rather than dropped
+            await asyncio.sleep(0.6)
+            assert ("alice", "works_at", "acme") in graph.relations["u1"]
+
+        asyncio.run(session())
+        app.dispatcher.shutdown()
+
+def test_results_merge_when_both_stages_finish():
+    for build in (build_fake_memory, build_fake_async_memory):
+        app, ctx = make_context(build, FakeGraph(latency=0.01), StageTimeouts(graph=5.0))
+        tenant = main.Tenant(user_id="u1")
+
+        async def session():
+            summary = json.loads(await main.save_conversation(ctx, "user: Bob manages Carol.", "u1"))
+            assert summary["relationships_created"] == 1 and "partial" not in summary
+            result = await main.search_memory(app, "Bob", tenant, 5)
+            assert result["relations"] == [{"source": "bob", "relationship": "manages", "destination": "carol"}]
+            assert "partial" not in result
+
+        asyncio.run(session())
+        app.dispatcher.shutdown()
+
+def test_graph_failure_degrades_to_vector_results():
+    app, ctx = make_context(build_fake_memory, BrokenGraph(), StageTimeouts())
+
+    async def session():
+        await main.save_memory(ctx, "Dave knows Erin.", "u1")
+        response = json.loads(await main.find_relationships(ctx, "Zed", "u1"))
+        assert response["partial"] and response["stage_errors"]["graph"] == "failed: Neo4j unavailable"
+        assert json.loads(await main.search_memories(ctx, "Dave", 3, "u1")) == ["Dave knows Erin"]
+
+    asyncio.run(session())
+    app.dispatcher.shutdown()
+
+if __name__ == "__main__":
+    print("📋 Stage Timeouts Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_slow_graph_returns_partial_results, test_results_merge_when_both_stages_finish,
+                 test_graph_failure_degrades_to_vector_results):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for per-tenant identity, isolation and concurrency limits in one server process
+"""
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+from dispatch import MemoryDispatcher
+from fakes import StubMemory, build_fake_async_memory, build_fake_memory
+from tenancy import Tenant, TenantRegistry
+
+class Session:
+    """Stands in for the MCP session object the registry binds identities to"""
+
+def make_context(lifespan_context, headers=None, session=None):
+    request = SimpleNamespace(headers=headers) if headers is not None else None
+    return SimpleNamespace(request_context=SimpleNamespace(
+        lifespan_context=lifespan_context, request=request, session=session
+    ))
+
+def refused(registry, ctx, user_id, error=PermissionError):
+    try:
+        registry.resolve(ctx, user_id=user_id)
+    except error:
+        return True
+    return False
+
+def test_identity_sources_in_priority_order():
+    """Headers win over the session binding and the default comes last; the argument is refused unless trusted"""
+    registry = TenantRegistry(default_user_id="default")
+    session = Session()
+    headers = {"x-mem0-user-id": "alice", "x-mem0-agent-id": "planner"}
+
+    assert registry.resolve(make_context(None)).user_id == "default"
+    assert registry.resolve(make_context(None, headers, session)) == Tenant("alice", "planner")
+    assert registry.resolve(make_context(None, headers, session), user_id="alice") == Tenant("alice", "planner")
+    assert refused(registry, make_context(None, headers, session), "bob")
+    # The session remembers the last identity it sent, so later calls without a header keep it
+    assert registry.resolve(make_context(None, {}, session)) == Tenant("alice", "planner")
+    assert refused(registry, make_context(None, {}, session), "bob")
+    assert refused(registry, make_context(None), "bob")
+
+    # Trusting the argument lets callers without a header pick their user, but never override a header
+    trusting = TenantRegistry(sources=["header", "argument", "session"])
+    assert trusting.resolve(make_context(None, {}, session), user_id="bob") == Tenant("bob")
+    assert trusting.resolve(make_context(None, {}, session)) == Tenant("bob")
+    assert refused(trusting, make_context(None, headers), "mallory")
+    assert refused(trusting, make_context(None), "../etc", ValueError)
+
+def test_tenants_cannot_see_or_change_each_other():
+    """Reads are scoped to the caller, and writes to another tenant's memory IDs are refused"""
+    async def session(mem0_client):
+        app = main.Mem0Context(mem0_client=mem0_client, dispatcher=MemoryDispatcher(4))
+        alice, bob = make_context(app, {"x-mem0-user-id": "alice"}), make_context(app, {"x-mem0-user-id": "bob"})
+        await main.save_memory(alice, "Alice works at Acme.")
+        await main.save_memory(bob, "Bob works at Globex.")
+        alice_memories = json.loads(await main.get_all_memories(alice))["memories"]
+        bob_memories = json.loads(await main.get_all_memories(bob))["memories"]
+        bob_search = json.loads(await main.search_memories(bob, "Acme", limit=5))
+        bob_delete = await main.delete_memory(bob, alice_memories[0]["id"])
+        bob_update = await main.update_memory(bob, alice_memories[0]["id"], "Alice works at Initech")
+        bob_batch = json.loads(await main.delete_memories(bob, [alice_memories[0]["id"]]))
+        still_there = json.loads(await main.get_all_memories(alice))["memories"]
+        app.dispatcher.shutdown()
+        return alice_memories, bob_memories, bob_search, bob_delete, bob_update, bob_batch, still_there
+
+    for mem0_client in (build_fake_memory(), build_fake_async_memory()):
+        alice_memories, bob_memories, bob_search, bob_delete, bob_update, bob_batch, still_there = asyncio.run(
+            session(mem0_client)
+        )
+        assert [memory["memory"] for memory in alice_memories] == ["Alice works at Acme"]
+        assert [memory["memory"] for memory in bob_memories] == ["Bob works at Globex"]
+        assert all("Acme" not in memory for memory in bob_search)
+        assert bob_delete.startswith("Error deleting memory")
+        assert bob_update.startswith("Error updating memory")
+        assert bob_batch[0]["status"] == "error"
+        assert [memory["memory"] for memory in still_there] == ["Alice works at Acme"]
+
+def test_concurrency_limit_is_per_tenant():
+    """One busy tenant is held to its own limit while another tenant's calls still run"""
+    async def session():
+        memory = StubMemory(add_latency=0.02)
+        app = main.Mem0Context(mem0_client=memory, dispatcher=MemoryDispatcher(32, {"add": 32}),
+                               tenants=TenantRegistry(max_concurrency=2))
+        busy, quiet = make_context(app, {"x-mem0-user-id": "busy"}), make_context(app, {"x-mem0-user-id": "quiet"})
+        await asyncio.gather(*(main.save_memory(busy, f"Fact {i}") for i in range(10)), main.save_memory(quiet, "Hello"))
+        snapshot = app.tenants.snapshot()
+        app.dispatcher.shutdown()
+        return snapshot, memory
+
+    snapshot, memory = asyncio.run(session())
+    assert snapshot["peak_calls_running"] == 3
+    assert snapshot["throttled_calls"] == 8
+    assert snapshot["tenants_active"] == 0
+    assert sum(m["user_id"] == "busy" for m in memory.memories.values()) == 10
+
+if __name__ == "__main__":
+    print("📋 Multi-Tenant Routing Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_identity_sources_in_priority_order, test_tenants_cannot_see_or_change_each_other,
+                 test_concurrency_limit_is_per_tenant):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for OpenTelemetry spans of tool calls and the backend calls beneath them
+"""
+import asyncio
+import contextvars
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+os.environ.setdefault("MEM0_TELEMETRY", "False")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import main
+import tracing
+from dispatch import MemoryDispatcher
+from fakes import build_fake_async_memory, build_fake_memory
+from metrics import install_metrics
+
+def run_tools(mem0_client):
+    async def session():
+        app = main.Mem0Context(mem0_client=install_metrics(mem0_client), dispatcher=MemoryDispatcher(4))
+        ctx = SimpleNamespace(request_context=SimpleNamespace(lifespan_context=app, request=None, session=None))
+        await main.save_memory(ctx, "Alice works at Acme.")
+        await main.search_memories(ctx, "Acme")
+        await main.delete_memory(ctx, "no-such-memory")
+        app.dispatcher.shutdown()
+
+    asyncio.run(session())
+
+def test_spans_nest_under_the_tool_call():
+    """Every LLM, embedding and vector store span belongs to the trace of the tool call that caused it"""
+    if tracing.trace is None:
+        print("   opentelemetry-sdk is not installed, skipping")
+        return
+    path = os.path.join(tempfile.mkdtemp(), "traces.jsonl")
+    os.environ.update({"MEM0_TRACING": "file", "MEM0_TRACING_FILE": path})
+    try:
+        assert tracing.configure_tracing()
+        tracing.propagate_context_into_mem0()
+        for mem0_client in (build_fake_memory(), build_fake_async_memory()):
+            run_tools(mem0_client)
+    finally:
+        tracing.shutdown_tracing()
+        for key in ("MEM0_TRACING", "MEM0_TRACING_FILE"):
+            os.environ.pop(key)
+
+    with open(path) as file:
+        spans = [json.loads(line) for line in file]
+    roots = {span["context"]["trace_id"]: span for span in spans if span["parent_id"] is None}
+    assert sorted(span["name"] for span in roots.values()) == sorted(
+        ["mcp.tool save_memory", "mcp.tool search_memories", "mcp.tool delete_memory"] * 2
+    )
+    # No backend span was cut off from its tool call, including those mem0 runs on its own threads
+    assert all(span["context"]["trace_id"] in roots for span in spans)
+    saves = [trace_id for trace_id, span in roots.items() if span["name"] == "mcp.tool save_memory"]
+    for trace_id in saves:
+        names = {span["name"] for span in spans if span["context"]["trace_id"] == trace_id}
+        assert {"mem0.llm generate_response", "mem0.embedding embed", "mem0.vector_store insert"} <= names
+    failed = [span for span in roots.values() if span["name"] == "mcp.tool delete_memory"]
+    assert all(span["status"]["status_code"] == "ERROR" for span in failed)
+
+def test_tracing_off_is_a_no_op():
+    """Without MEM0_TRACING the tools run unchanged and no spans are opened"""
+    os.environ.pop("MEM0_TRACING", None)
+    assert not tracing.configure_tracing()
+    assert tracing.span("anything") is tracing.span("anything else")
+    run_tools(build_fake_memory())
+
+def test_context_reaches_executor_threads():
+    variable = contextvars.ContextVar("variable", default="unset")
+    variable.set("caller")
+    with tracing.ContextThreadPoolExecutor() as executor:
+        assert executor.submit(variable.get).result() == "caller"
+
+if __name__ == "__main__":
+    print("📋 Tracing Test")
+    print("=" * 40)
+
+    failed = False
+    for test in (test_spans_nest_under_the_tool_call, test_tracing_off_is_a_no_op, test_context_reaches_executor_threads):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)